@@ -0,0 +1,177 @@
+"""Lexer throughput benchmark for the TinyAda scanners.
+
+Generates seeded synthetic corpora with tinyada_gen and measures tokens/sec
+and bytes/sec of the semantic_analyzer and syntax_analyzer scanners. Both
+packages use the same module names (chario, scanner, token), so every
+measurement runs in a fresh worker process importing only one of them.
+
+Typical usage example:
+    python bench/bench_scanner.py
+    python bench/bench_scanner.py --sizes 1K,1M,100M --repeat 5 -o bench_output.txt
+"""
+
+
+from typing import Dict, List, Tuple
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tinyada_gen
+
+
+SRC_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+SCANNERS = ("semantic_analyzer", "syntax_analyzer")
+SIZE_UNITS: Dict[str, int] = {"K": 1 << 10, "M": 1 << 20}
+
+
+def parse_size(text: str) -> int:
+    """Convert size such as 512, 1K or 100M into bytes."""
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in SIZE_UNITS:
+        return int(text[:-1]) * SIZE_UNITS[text[-1]]
+    return int(text)
+
+
+def _scan_semantic(module, path: str) -> Tuple[int, float]:
+    """Count tokens of file with semantic_analyzer scanner."""
+    cio = module["chario"].Chario(path, False)
+    start: float = time.perf_counter()
+    scn = module["scanner"].Scanner(cio)
+    count: int = 0
+    while scn.next_token().tok_id != "eof":
+        count += 1
+    return count, time.perf_counter() - start
+
+
+def _scan_syntax(module, path: str) -> Tuple[int, float]:
+    """Count tokens of file with syntax_analyzer scanner.
+
+    This scanner has no end-of-file token and fails on the None character
+    returned by its chario at end of input, which marks the end of stream.
+    """
+    with open(path) as in_file:
+        cio = module["chario"].Chario(in_file)
+    start: float = time.perf_counter()
+    scn = module["scanner"].Scanner(cio)
+    count: int = 0
+    try:
+        while scn.next_token():
+            count += 1
+    except (AttributeError, TypeError):
+        if scn.char is not None:
+            raise
+    return count, time.perf_counter() - start
+
+
+SCAN_FUNCS = {"semantic_analyzer": _scan_semantic, "syntax_analyzer": _scan_syntax}
+
+
+def run_worker(name: str, path: str, repeat: int) -> None:
+    """Measure a single scanner on a single corpus and print JSON result."""
+    sys.path.insert(0, os.path.join(SRC_DIR, name))
+    sys.modules.pop("token", None)  # Shadowed by the analyzer token module
+    module = {m: __import__(m) for m in ("chario", "scanner")}
+    best: float = None
+    tokens: int = 0
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:
+        for _ in range(repeat):
+            sys.stdout = devnull  # Scanners may echo source lines
+            try:
+                tokens, seconds = SCAN_FUNCS[name](module, path)
+            finally:
+                sys.stdout = stdout
+            best = seconds if best is None else min(best, seconds)
+    print(json.dumps({"tokens": tokens, "seconds": best}))
+
+
+def measure(name: str, path: str, repeat: int) -> Dict:
+    """Run worker process for scanner and corpus and collect its result."""
+    out: str = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", name, path, "--repeat", str(repeat)],
+        check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def receive_args():
+    """Receive command line arguments."""
+    arg_parser = argparse.ArgumentParser(
+        description="Benchmark TinyAda scanners on synthetic corpora and report JSON.")
+    arg_parser.add_argument(
+        "--sizes", default="1K,10K,100K,1M",
+        help="comma separated corpus sizes, e.g. 1K,10M,100M (default: %(default)s)")
+    arg_parser.add_argument(
+        "--kinds", default=",".join(tinyada_gen.CORPUS_KINDS),
+        help="comma separated corpus kinds (default: %(default)s)")
+    arg_parser.add_argument(
+        "--scanners", default=",".join(SCANNERS),
+        help="comma separated scanners to measure (default: %(default)s)")
+    arg_parser.add_argument("--seed", type=int, default=5, help="generator seed")
+    arg_parser.add_argument(
+        "--repeat", type=int, default=3, help="runs per measurement, best is kept")
+    arg_parser.add_argument(
+        "--corpus-dir", help="directory to keep generated corpora (default: temporary)")
+    arg_parser.add_argument("-o", "--output", help="file to save JSON report")
+    arg_parser.add_argument("--worker", nargs=2, metavar=("SCANNER", "FILE"), help=argparse.SUPPRESS)
+    return arg_parser.parse_args()
+
+
+def main() -> None:
+    """Generate corpora, measure every scanner and emit JSON report."""
+    args = receive_args()
+    if args.worker:
+        run_worker(args.worker[0], args.worker[1], args.repeat)
+        return
+    sizes: List[int] = [parse_size(s) for s in args.sizes.split(",")]
+    kinds: List[str] = args.kinds.split(",")
+    scanners: List[str] = args.scanners.split(",")
+    for name in scanners:
+        if name not in SCAN_FUNCS:
+            sys.exit("E: Unknown scanner: {}".format(name))
+    tmp_dir = None
+    corpus_dir: str = args.corpus_dir
+    if not corpus_dir:
+        tmp_dir = tempfile.TemporaryDirectory(prefix="tinyada-bench-")
+        corpus_dir = tmp_dir.name
+    os.makedirs(corpus_dir, exist_ok=True)
+    results: List[Dict] = list()
+    for kind in kinds:
+        for size in sizes:
+            path: str = tinyada_gen.write_corpus(corpus_dir, kind, size, args.seed)
+            n_bytes: int = os.path.getsize(path)
+            for name in scanners:
+                res: Dict = measure(name, path, args.repeat)
+                seconds: float = max(res["seconds"], 1e-9)
+                results.append({
+                    "scanner": name, "kind": kind, "size": size, "bytes": n_bytes,
+                    "tokens": res["tokens"], "seconds": round(seconds, 6),
+                    "tokens_per_sec": round(res["tokens"] / seconds, 1),
+                    "bytes_per_sec": round(n_bytes / seconds, 1)})
+                print("{:<18} {:<11} {:>10} B {:>12.0f} tok/s {:>12.0f} B/s".format(
+                    name, kind, n_bytes, results[-1]["tokens_per_sec"],
+                    results[-1]["bytes_per_sec"]), file=sys.stderr)
+    if tmp_dir:
+        tmp_dir.cleanup()
+    report: Dict = {
+        "benchmark": "scanner",
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results}
+    text: str = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as out_file:
+            out_file.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""Seeded synthetic TinyAda program generator for scanner benchmarks.
+
+Every corpus is a TinyAda procedure whose body is padded with statements
+until the requested size is reached. The same kind, size and seed always
+produce byte-identical output. All kinds but "comment" are syntactically
+valid; comment corpora use Ada "--" comments, which the scanners do not
+recognize yet, so they only serve to measure scanning and fail to parse.
+
+Typical usage example:
+    src = generate("identifier", 1024, 5)
+    path = write_corpus("/tmp/corpus", "operator", 1 << 20, 5)
+"""
+
+
+from typing import Dict, List
+import os
+import random
+
+
+# CORPUS_KINDS lists the supported synthetic corpus flavours.
+CORPUS_KINDS = ("identifier", "operator", "whitespace", "comment")
+
+REL_OPS: List[str] = ["=", "/=", "<", "<=", ">", ">="]
+ADD_OPS: List[str] = ["+", "-"]
+MUL_OPS: List[str] = ["*", "/", "mod"]
+LETTERS: str = "abcdefghijklmnopqrstuvwxyz"
+SPACES: str = "  \t\t\n"
+
+HEADER: str = "procedure BENCH is\n"
+FOOTER: str = "end BENCH;\n"
+
+
+def _make_names(rng: random.Random, count: int, min_len: int, max_len: int) -> List[str]:
+    """Create distinct identifier names starting with a letter."""
+    names: List[str] = list()
+    for i in range(count):
+        length: int = rng.randint(min_len, max_len)
+        body: str = "".join(rng.choice(LETTERS + "_") for _ in range(length - 1))
+        names.append("{}{}_{}".format(rng.choice(LETTERS), body.strip("_"), i).upper())
+    return names
+
+
+def _declarations(names: List[str]) -> str:
+    """Declare every name as an INTEGER variable, eight per line."""
+    lines: List[str] = list()
+    for i in range(0, len(names), 8):
+        lines.append("   {} : INTEGER;\n".format(", ".join(names[i:i + 8])))
+    return "".join(lines)
+
+
+def _operand(rng: random.Random, names: List[str]) -> str:
+    """Return a random variable name or integer literal."""
+    if rng.random() < 0.6:
+        return rng.choice(names)
+    return str(rng.randint(0, 9999))
+
+
+def _identifier_statement(rng: random.Random, names: List[str]) -> str:
+    """Assignment between long identifiers."""
+    return "   {} := {};\n".format(rng.choice(names), rng.choice(names))
+
+
+def _operator_statement(rng: random.Random, names: List[str]) -> str:
+    """Assignment or if statement built from dense operator chains."""
+    terms: List[str] = list()
+    for _ in range(rng.randint(3, 8)):
+        factor: str = _operand(rng, names)
+        if rng.random() < 0.2:
+            factor = "({} ** {})".format(factor, rng.randint(0, 3))
+        terms.append("{} {} {}".format(factor, rng.choice(MUL_OPS), _operand(rng, names)))
+    expr: str = terms[0]
+    for term in terms[1:]:
+        expr = "{} {} {}".format(expr, rng.choice(ADD_OPS), term)
+    if rng.random() < 0.3:
+        cond: str = "{} {} {} and not {}".format(
+            _operand(rng, names), rng.choice(REL_OPS), _operand(rng, names), rng.choice(names))
+        return "   if {} then {} := -{}; end if;\n".format(cond, rng.choice(names), expr)
+    return "   {} := {};\n".format(rng.choice(names), expr)
+
+
+def _whitespace_statement(rng: random.Random, names: List[str]) -> str:
+    """Assignment whose tokens are separated by long whitespace runs."""
+    def gap() -> str:
+        return "".join(rng.choice(SPACES) for _ in range(rng.randint(8, 40)))
+    return "{g}{}{g}:={g}{}{g}+{g}{}{g};\n".format(
+        rng.choice(names), _operand(rng, names), _operand(rng, names), g=gap())
+
+
+def _comment_statement(rng: random.Random, names: List[str]) -> str:
+    """Short statement preceded by a block of comment lines."""
+    lines: List[str] = list()
+    for _ in range(rng.randint(2, 5)):
+        words: List[str] = list()
+        for _ in range(rng.randint(4, 12)):
+            words.append("".join(rng.choice(LETTERS) for _ in range(rng.randint(2, 9))))
+        lines.append("   -- {}\n".format(" ".join(words)))
+    lines.append("   null;\n")
+    return "".join(lines)
+
+
+# STATEMENT_GENERATORS maps corpus kind to (name count, name lengths, statement maker).
+STATEMENT_GENERATORS: Dict[str, tuple] = {
+    "identifier": (64, 12, 30, _identifier_statement),
+    "operator": (8, 1, 2, _operator_statement),
+    "whitespace": (16, 3, 8, _whitespace_statement),
+    "comment": (4, 3, 6, _comment_statement),
+}
+
+
+def generate(kind: str, size: int, seed: int) -> str:
+    """Generate a TinyAda program of roughly the requested size.
+
+    The result is never smaller than the minimal program and exceeds size
+    by at most one statement.
+
+    Args:
+        kind: One of CORPUS_KINDS.
+        size: An int of target program size in bytes.
+        seed: An int seed making output reproducible.
+
+    Returns:
+        A string of TinyAda source program.
+    """
+    if kind not in STATEMENT_GENERATORS:
+        raise ValueError("Unknown corpus kind: {}".format(kind))
+    rng: random.Random = random.Random("{}:{}:{}".format(seed, kind, size))
+    count, min_len, max_len, make_statement = STATEMENT_GENERATORS[kind]
+    names: List[str] = _make_names(rng, count, min_len, max_len)
+    chunks: List[str] = [HEADER, _declarations(names), "begin\n"]
+    length: int = sum(len(c) for c in chunks) + len(FOOTER)
+    statement: str = "   null;\n"
+    chunks.append(statement)
+    length += len(statement)
+    while length < size:
+        statement = make_statement(rng, names)
+        chunks.append(statement)
+        length += len(statement)
+    chunks.append(FOOTER)
+    return "".join(chunks)
+
+
+def write_corpus(directory: str, kind: str, size: int, seed: int) -> str:
+    """Generate a corpus file, reusing a previously written identical one.
+
+    Args:
+        directory: A string of directory to store corpus files in.
+        kind: One of CORPUS_KINDS.
+        size: An int of target program size in bytes.
+        seed: An int seed making output reproducible.
+
+    Returns:
+        A string of filepath to the corpus file.
+    """
+    path: str = os.path.join(directory, "{}-{}-{}.ada".format(kind, size, seed))
+    if not os.path.isfile(path):
+        with open(path + ".tmp", "w") as out_file:
+            out_file.write(generate(kind, size, seed))
+        os.replace(path + ".tmp", path)
+    return path
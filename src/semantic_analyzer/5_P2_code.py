@@ -6,6 +6,15 @@ import sys
 import chario
 import scanner
 import parser7
+import ll1
+from ast_node import AstBuilder, dump_lines
+from ast_arena import ArenaBuilder
+from parse_events import EventBuilder
+from rule_profiler import RuleProfiler
+from analysis_stats import AnalysisStats
+from xref import XrefIndex
+from scope_tree import ScopeTree
+from snapshot import SnapshotStore
 
 
 class Logger(object):
@@ -48,16 +57,15 @@ class Logger(object):
         sys.stdout = sys.stdout.terminal
 
 
-def receive_args():
+def receive_args() -> argparse.Namespace:
     """Receive command line arguments.
 
     Args:
         None
 
     Returns:
-        A bool indicating if output should be verbose.
-        A string representing filepath to optional output log file.
-        A string representing filepath to input source program file.
+        An argparse.Namespace of option values, visible being a tuple of
+        line and column, or None.
     """
     arg_parser = argparse.ArgumentParser(
         description="""Simple syntax and static semantic analyzer for TinyAda.
@@ -71,22 +79,157 @@ Programming Language Structures (CSI3103)""",
     arg_parser.add_argument(
         "-o", "--output",
         help="file to save output")
+    arg_parser.add_argument(
+        "--max-errors", type=int, default=100, metavar="N",
+        help="stop after N errors, 0 for no limit (default: 100)")
+    arg_parser.add_argument(
+        "--max-const-bits", type=int, default=parser7.MAX_CONST_BITS, metavar="N",
+        help="report constants over N signed bits (default: %(default)s)")
+    arg_parser.add_argument(
+        "--fold-budget", type=float, default=parser7.FOLD_BUDGET, metavar="SEC",
+        help="seconds allowed for folding large constants (default: %(default)s)")
+    arg_parser.add_argument(
+        "--ast", action="store_const", const="ast", dest="tree",
+        help="print abstract syntax tree after analysis")
+    arg_parser.add_argument(
+        "--arena", action="store_const", const="arena", dest="tree",
+        help="print syntax tree stored in array arena after analysis")
+    arg_parser.add_argument(
+        "--events", action="store_const", const="events", dest="tree",
+        help="print parse events as constructs are recognized, building no tree;\n"
+             "implies --no-flow")
+    arg_parser.add_argument(
+        "--engine", choices=("rd", "ll1"), default="rd",
+        help="rd: recursive descent analysis (default)\n"
+             "ll1: syntax check with parser generated from grammar")
+    arg_parser.add_argument(
+        "--outline", action="store_true",
+        help="skip bodies of nested procedures and list them")
+    arg_parser.add_argument(
+        "--profile", action="store_true",
+        help="print calls and time of each grammar rule")
+    arg_parser.add_argument(
+        "--flamegraph", metavar="FILE",
+        help="save grammar rule call stacks in collapsed format to FILE")
+    arg_parser.add_argument(
+        "--stats", action="store_true",
+        help="report time per phase, tokens per second, memory peaks and scopes")
+    arg_parser.add_argument(
+        "--stats-json", metavar="FILE",
+        help="save statistics of --stats as JSON to FILE")
+    arg_parser.add_argument(
+        "--xref", metavar="FILE",
+        help="save definitions and uses of identifiers as JSON to FILE")
+    arg_parser.add_argument(
+        "--visible", metavar="LINE:COL",
+        help="list symbols visible at LINE:COL after analysis")
+    arg_parser.add_argument(
+        "--snapshots", metavar="FILE",
+        help="restore leading declarations shared with earlier programs from FILE,\n"
+             "and save those of this program there")
+    arg_parser.add_argument(
+        "--cfg", action="store_true",
+        help="print control-flow graph of each procedure analyzed")
+    arg_parser.add_argument(
+        "--no-flow", action="store_false", dest="flow_analysis",
+        help="fold named constants only, building no control-flow graphs (faster);\n"
+             "prints of variables are errors")
     arg_parser.add_argument(
         "input", help="filepath to source program file")
     args = arg_parser.parse_args()
-    return args.input, args.output, args.verbose
+    if args.engine == "ll1":
+        ignored = [flag for flag, value in (
+            ("--ast/--arena/--events", args.tree), ("--outline", args.outline), ("--profile", args.profile),
+            ("--flamegraph", args.flamegraph), ("--stats", args.stats), ("--stats-json", args.stats_json),
+            ("--xref", args.xref), ("--visible", args.visible), ("--snapshots", args.snapshots),
+            ("--cfg", args.cfg), ("--no-flow", not args.flow_analysis)) if value]
+        if ignored:
+            arg_parser.error("--engine ll1 only checks syntax, not allowed with {}".format(", ".join(ignored)))
+    if args.tree == "events":
+        if args.cfg:
+            arg_parser.error("--cfg not allowed with --events")
+        args.flow_analysis = False  # Keep memory independent of body length
+    if args.cfg and not args.flow_analysis:
+        arg_parser.error("--cfg not allowed with --no-flow")
+    if not 1 <= args.max_const_bits <= parser7.MAX_CONST_BITS_LIMIT:
+        arg_parser.error("--max-const-bits must be between 1 and {}".format(parser7.MAX_CONST_BITS_LIMIT))
+    if args.visible:
+        try:
+            args.visible = tuple(int(part) for part in args.visible.split(":"))
+        except ValueError:
+            args.visible = ()
+        if len(args.visible) != 2:
+            arg_parser.error("--visible must be LINE:COL")
+    return args
 
 
 if __name__ == '__main__':
-    in_file, out_file, is_verbose = receive_args()
-    if out_file:
-        Logger.start(out_file)
-    cur_chario = chario.Chario(in_file, is_verbose)
+    args = receive_args()
+    if args.output:
+        Logger.start(args.output)
+    stats = AnalysisStats() if args.stats or args.stats_json else None
+    if stats:
+        stats.enter("read")
+    cur_chario = chario.Chario(args.input, args.verbose)
+    if stats:
+        stats.leave()
     cur_scanner = scanner.Scanner(cur_chario)
-    cur_parser = parser7.Parser(cur_chario, cur_scanner)
+    if args.engine == "ll1":
+        try:
+            ll1.Ll1Parser(ll1.Grammar.from_file()).parse(cur_scanner)
+        except ll1.Ll1Error as err:
+            cur_chario.put_error(err.message())
+        cur_chario.report_errors()
+        if args.output:
+            Logger.stop()
+        sys.exit()
+    builder = {"ast": AstBuilder, "arena": ArenaBuilder, "events": lambda: EventBuilder(print)}.get(args.tree)
+    xref = XrefIndex() if args.xref else None
+    snapshots = SnapshotStore(args.snapshots) if args.snapshots else None
+    if stats:
+        stats.enter("parse")
+    cur_parser = parser7.Parser(
+        cur_chario, cur_scanner, args.max_errors, builder() if builder else None,
+        args.max_const_bits, args.fold_budget, args.outline, xref, snapshots, stats, args.cfg,
+        args.flow_analysis)
+    profiler = RuleProfiler(cur_parser) if args.profile or args.flamegraph else None
+    scope_tree = ScopeTree() if args.visible else None
+    if scope_tree:
+        scope_tree.attach(cur_parser)
     try:
         cur_parser.compilation()
-    except Exception:
+    except (parser7.ParseError, parser7.ErrorLimitError):
         cur_chario.report_errors()
-    if out_file:
+    if stats:
+        stats.leave()
+    for body in cur_parser.lazy_bodies:
+        print("procedure {}({}) lines {}-{}".format(
+            body.sym_ent.name if body.sym_ent else "?", ", ".join(body.param_scope),
+            body.first_line, body.last_line))
+    if args.tree == "ast" and cur_parser.tree:
+        for line in dump_lines(cur_parser.tree):
+            print(line)
+    elif args.tree == "arena" and cur_parser.tree:
+        for line in cur_parser.tree.dump_lines():
+            print(line)
+        print("{} nodes, {} bytes".format(len(cur_parser.tree), cur_parser.tree.nbytes()))
+    if args.cfg:
+        for sym_ent, graph in cur_parser.graphs.items():
+            print(graph.dump(sym_ent.name))
+    if args.profile:
+        print(profiler.report())
+    if args.flamegraph:
+        profiler.write_collapsed(args.flamegraph)
+    if args.stats:
+        print(stats.report(cur_scanner))
+    if args.stats_json:
+        stats.write(args.stats_json, cur_scanner)
+    if xref:
+        xref.write(args.xref)
+    if snapshots:
+        snapshots.save()
+    if scope_tree:
+        for sym_ent in scope_tree.visible_at(*args.visible).values():
+            print(sym_ent)
+    if args.output:
         Logger.stop()
@@ -0,0 +1,193 @@
+"""AnalysisStats class measuring phases and memory of an analyzer run.
+
+Scanning and semantic analysis run interleaved with parsing, so their
+time is measured by wrapping Scanner.next_token and the SymbolTable
+methods of the given instances, and each moment is charged to the
+innermost phase running. Parsing gets the rest of compilation time.
+
+Memory is reported as peak resident set size, where the resource module
+is available, and as tracemalloc peak. Tracing allocations slows the
+run down, which the times include.
+
+Typical usage example:
+    stats = AnalysisStats()
+    with stats.phase("read"):
+        new_cio = Chario(in_file, False)
+    new_scn = Scanner(new_cio)
+    with stats.phase("parse"):
+        new_parser = Parser(new_cio, new_scn, stats=stats)
+        new_parser.compilation()
+    print(stats.report(new_scn))
+"""
+
+
+from typing import Callable, Dict, List, Tuple
+import contextlib
+import json
+import time
+import scanner
+from symbol_table import SymbolTable as SymTab
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+try:
+    import tracemalloc
+except ImportError:  # Its tokenize import finds token.py of this package
+    import _tracemalloc as tracemalloc
+
+
+# Phases in report order
+PHASES: Tuple[str, ...] = ("read", "scan", "parse", "semantic")
+
+# SymbolTable methods charged to semantic analysis
+SEMANTIC_METHODS: Tuple[str, ...] = ("enter_scope", "exit_scope", "enter_symbol", "find_symbol")
+
+
+class AnalysisStats(object):
+    """Wall and CPU time per phase, memory peaks and scope statistics.
+
+    Attributes:
+        wall: A dict mapping phase name to seconds of wall time.
+        cpu: A dict mapping phase name to seconds of CPU time.
+        scopes: A list of (level, symbol count, line number) tuples of
+            scopes in the order they were exited.
+        max_depth: An int of deepest scope level entered.
+    """
+
+    def __init__(self, trace_memory: bool = True) -> None:
+        """Init with zero counters and start tracing allocations if told."""
+        self.wall: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.cpu: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.scopes: List[Tuple[int, int, int]] = list()
+        self.max_depth: int = 0
+        self.__stack: List[str] = list()
+        self.__mark: Tuple[float, float] = (time.perf_counter(), time.process_time())
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def __switch(self) -> None:
+        """Charge time since last switch to the innermost running phase."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        if self.__stack:
+            current: str = self.__stack[-1]
+            self.wall[current] += wall - self.__mark[0]
+            self.cpu[current] += cpu - self.__mark[1]
+        self.__mark = (wall, cpu)
+
+    def enter(self, name: str) -> None:
+        """Start phase, suspending the running one."""
+        self.__switch()
+        self.__stack.append(name)
+
+    def leave(self) -> None:
+        """End innermost phase, resuming the one it suspended."""
+        self.__switch()
+        self.__stack.pop()
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Charge time spent in with block to phase."""
+        self.enter(name)
+        try:
+            yield self
+        finally:
+            self.leave()
+
+    def wrap(self, obj: object, attr: str, name: str) -> None:
+        """Shadow method of obj by one charging its time to phase."""
+        method: Callable = getattr(obj, attr)
+        enter: Callable[[str], None] = self.enter
+        leave: Callable[[], None] = self.leave
+
+        def wrapper(*args, **kwargs):
+            enter(name)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                leave()
+
+        setattr(obj, attr, wrapper)
+
+    def attach(self, scn: scanner.Scanner, table: SymTab) -> None:
+        """Measure scanner and symbol table, and record their scopes."""
+        self.wrap(scn, "next_token", "scan")
+        for attr in SEMANTIC_METHODS:
+            self.wrap(table, attr, "semantic")
+        enter_scope: Callable[[], None] = table.enter_scope
+        exit_scope: Callable[[], None] = table.exit_scope
+
+        def enter_wrapper() -> None:
+            enter_scope()
+            self.max_depth = max(self.max_depth, table.level)
+
+        def exit_wrapper() -> None:
+            self.scopes.append((table.level, table.scope_size(), table.chario.line_count))
+            exit_scope()
+
+        table.enter_scope = enter_wrapper
+        table.exit_scope = exit_wrapper
+
+    def as_dict(self, scn: scanner.Scanner = None) -> Dict[str, object]:
+        """Collect statistics into dict of plain values, for JSON output.
+
+        Args:
+            scn: A Scanner instance to count tokens of.
+        """
+        total_wall: float = sum(self.wall.values())
+        tokens: int = scn.tok_count if scn else 0
+        peak_rss: int = None
+        if resource:
+            peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        traced_peak: int = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+        return {
+            "wall": dict(self.wall, total=total_wall),
+            "cpu": dict(self.cpu, total=sum(self.cpu.values())),
+            "tokens": tokens,
+            "tokens_per_sec": tokens / total_wall if total_wall else 0.0,
+            "peak_rss_kb": peak_rss,
+            "tracemalloc_peak_kb": traced_peak // 1024 if traced_peak is not None else None,
+            "max_depth": self.max_depth,
+            "scopes": [{"level": level, "symbols": count, "line": line} for level, count, line in self.scopes]}
+
+    def report(self, scn: scanner.Scanner = None, fmt: str = "text") -> str:
+        """Convert statistics into human readable text or JSON.
+
+        Args:
+            scn: A Scanner instance to count tokens of.
+            fmt: A string of format, "text" or "json".
+
+        Returns:
+            A string of report.
+        """
+        stats: Dict[str, object] = self.as_dict(scn)
+        if fmt == "json":
+            return json.dumps(stats, indent=2)
+        lines: List[str] = ["*** Statistics", "{:<12}{:>12}{:>12}".format("phase", "wall ms", "cpu ms")]
+        for name in PHASES + ("total",):
+            lines.append("{:<12}{:>12.3f}{:>12.3f}".format(name, stats["wall"][name] * 1e3, stats["cpu"][name] * 1e3))
+        lines.append("tokens: {}, {:.0f} tokens/s".format(stats["tokens"], stats["tokens_per_sec"]))
+        lines.append("peak RSS: {} KB, tracemalloc peak: {} KB".format(
+            stats["peak_rss_kb"] if stats["peak_rss_kb"] is not None else "n/a",
+            stats["tracemalloc_peak_kb"] if stats["tracemalloc_peak_kb"] is not None else "n/a"))
+        lines.append("scopes: {}, max depth: {}".format(len(self.scopes), self.max_depth))
+        per_level: Dict[int, List[int]] = dict()
+        for level, count, _ in self.scopes:
+            per_level.setdefault(level, list()).append(count)
+        for level in sorted(per_level):
+            counts: List[int] = per_level[level]
+            lines.append("  level {}: {} scopes, {} symbols, at most {} in one".format(
+                level, len(counts), sum(counts), max(counts)))
+        return "\n".join(lines)
+
+    def write(self, out_file: str, scn: scanner.Scanner = None) -> None:
+        """Save statistics as JSON.
+
+        Args:
+            out_file: A string of filepath to write.
+            scn: A Scanner instance to count tokens of.
+        """
+        with open(out_file, "w") as out:
+            out.write(self.report(scn, "json"))
@@ -0,0 +1,324 @@
+"""AstArena and ArenaBuilder storing TinyAda parse trees as arrays.
+
+Nodes are rows of parallel array('i') columns instead of Python objects, so
+a tree costs 20 bytes per node however large the input grows. A node is
+referred to by its int row index; -1 stands for no node.
+
+    kind: Index into KIND_NAMES.
+    first_child: Row of the first child, children follow by next_sibling.
+    next_sibling: Row of the next child of the same parent.
+    token: Index of the first token of the node in the token stream.
+    sym: Index into symbols for named nodes, into literals for int_lit,
+        into OP_NAMES for unary and binary, into MODE_NAMES for param_spec.
+
+Children keep fixed positions; an absent optional part, such as the while
+condition of a loop, is an "empty" node. Lists of statements, declarations,
+parameters, indexes, arguments and identifiers are "list" or "ident" rows.
+
+Typical usage example:
+    new_parser = Parser(cio_instance, scn_instance, builder=ArenaBuilder())
+    new_parser.compilation()
+    arena = new_parser.tree
+    print(arena.dump())
+    calls = [i for i in arena.walk() if arena.kind_name(i) == "call_stmt"]
+"""
+
+
+from array import array
+from typing import Dict, Iterator, List, Tuple
+from symbol_entry import SymbolEntry as SymEnt, SymbolGroup
+from tree_builder import TreeBuilder, dump_indent
+
+
+# Node kinds in the order of their ids
+KIND_NAMES: Tuple[str, ...] = (
+    "empty", "list", "ident", "subprogram_body", "param_spec", "object_decl",
+    "number_decl", "type_decl", "enum_def", "array_def", "range_def", "type_name",
+    "null_stmt", "assign_stmt", "call_stmt", "if_stmt", "branch", "loop_stmt",
+    "exit_stmt", "print_stmt", "int_lit", "name", "unary", "binary")
+KIND_IDS: Dict[str, int] = {name: i for i, name in enumerate(KIND_NAMES)}
+
+# Operators of unary and binary nodes
+OP_NAMES: Tuple[str, ...] = (
+    "neg", "pos", "not", "and", "or", "eq", "ne", "lt", "le", "gt", "ge",
+    "plus", "minus", "mul", "div", "mod", "exp")
+OP_IDS: Dict[str, int] = {name: i for i, name in enumerate(OP_NAMES)}
+
+# Parameter modes of param_spec nodes
+MODE_NAMES: Tuple[str, ...] = ("in", "out", "in out")
+MODE_IDS: Dict[str, int] = {name: i for i, name in enumerate(MODE_NAMES)}
+
+# Kinds whose sym column refers to symbols
+SYM_KINDS = {KIND_IDS[k] for k in ("ident", "subprogram_body", "type_decl", "type_name", "call_stmt", "name")}
+
+
+class AstArena(object):
+    """Parse tree stored as struct of arrays.
+
+    Attributes:
+        kind: An array of node kind ids.
+        first_child: An array of first child rows.
+        next_sibling: An array of next sibling rows.
+        token: An array of token indexes.
+        sym: An array of symbol, literal, operator or mode indexes.
+        symbols: A list of SymbolEntry instances referred to by nodes.
+        literals: A list of strings of integer literals.
+        root: An int of row of the root node.
+    """
+
+    def __init__(self) -> None:
+        """Init with empty columns."""
+        self.kind: array = array("i")
+        self.first_child: array = array("i")
+        self.next_sibling: array = array("i")
+        self.token: array = array("i")
+        self.sym: array = array("i")
+        self.symbols: List[SymEnt] = list()
+        self.literals: List[str] = list()
+        self.root: int = -1
+        self.__sym_ids: Dict[SymEnt, int] = dict()
+        self.__lit_ids: Dict[str, int] = dict()
+
+    def __len__(self) -> int:
+        """Number of nodes."""
+        return len(self.kind)
+
+    def add(self, kind: str, tok: int = -1, sym: int = -1, children: List[int] = ()) -> int:
+        """Append node and link its children.
+
+        Args:
+            kind: A string of node kind name.
+            tok: An int of token index.
+            sym: An int of kind specific index for sym column.
+            children: Rows of children in order, None for an absent one.
+
+        Returns:
+            An int of row of new node.
+        """
+        first: int = -1
+        prev: int = -1
+        for child in children:
+            if child is None:
+                child = self.add("empty")
+            if prev < 0:
+                first = child
+            else:
+                self.next_sibling[prev] = child
+            prev = child
+        self.kind.append(KIND_IDS[kind])
+        self.first_child.append(first)
+        self.next_sibling.append(-1)
+        self.token.append(tok)
+        self.sym.append(sym)
+        return len(self.kind) - 1
+
+    def sym_id(self, sym_ent: SymEnt) -> int:
+        """Convert SymbolEntry instance into symbol index, -1 for None."""
+        if sym_ent is None:
+            return -1
+        idx: int = self.__sym_ids.get(sym_ent, -1)
+        if idx < 0:
+            idx = self.__sym_ids[sym_ent] = len(self.symbols)
+            self.symbols.append(sym_ent)
+        return idx
+
+    def lit_id(self, lit: str) -> int:
+        """Convert integer literal into literal index."""
+        idx: int = self.__lit_ids.get(lit, -1)
+        if idx < 0:
+            idx = self.__lit_ids[lit] = len(self.literals)
+            self.literals.append(lit)
+        return idx
+
+    def kind_name(self, node: int) -> str:
+        """Kind name of node."""
+        return KIND_NAMES[self.kind[node]]
+
+    def symbol(self, node: int) -> SymEnt:
+        """SymbolEntry instance of named node, None if not resolved."""
+        idx: int = self.sym[node]
+        return self.symbols[idx] if idx >= 0 and self.kind[node] in SYM_KINDS else None
+
+    def attr(self, node: int) -> str:
+        """Readable value of sym column: name, literal, operator or mode."""
+        idx: int = self.sym[node]
+        kind: str = KIND_NAMES[self.kind[node]]
+        if idx < 0:
+            return None
+        if self.kind[node] in SYM_KINDS:
+            return self.symbols[idx].name
+        if kind == "int_lit":
+            return self.literals[idx]
+        if kind in ("unary", "binary"):
+            return OP_NAMES[idx]
+        if kind == "param_spec":
+            return MODE_NAMES[idx]
+        return None
+
+    def children(self, node: int) -> Iterator[int]:
+        """Yield rows of children of node in order."""
+        child: int = self.first_child[node]
+        next_sibling: array = self.next_sibling
+        while child >= 0:
+            yield child
+            child = next_sibling[child]
+
+    def walk(self, root: int = None) -> Iterator[int]:
+        """Yield rows in pre-order without recursion.
+
+        Args:
+            root: An int of row to start from, root of tree by default.
+        """
+        for node, _ in self.walk_depth(root):
+            yield node
+
+    def walk_depth(self, root: int = None) -> Iterator[Tuple[int, int]]:
+        """Yield (row, depth) pairs in pre-order without recursion."""
+        root = self.root if root is None else root
+        if root < 0:
+            return
+        first_child: array = self.first_child
+        next_sibling: array = self.next_sibling
+        stack: List[Tuple[int, int]] = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            yield node, depth
+            if next_sibling[node] >= 0 and depth:
+                stack.append((next_sibling[node], depth))
+            if first_child[node] >= 0:
+                stack.append((first_child[node], depth + 1))
+
+    def visit(self, visitor, root: int = None) -> None:
+        """Call visit_<kind>(arena, row) methods of visitor in pre-order.
+
+        Nodes of kinds without a method are passed through. Children of a
+        node are skipped if its method returns False.
+
+        Args:
+            visitor: An object with visit_<kind> methods, e.g. visit_call_stmt.
+            root: An int of row to start from, root of tree by default.
+        """
+        root = self.root if root is None else root
+        if root < 0:
+            return
+        handlers: List = [getattr(visitor, "visit_" + name, None) for name in KIND_NAMES]
+        kind: array = self.kind
+        first_child: array = self.first_child
+        next_sibling: array = self.next_sibling
+        stack: List[int] = [root]
+        while stack:
+            node: int = stack.pop()
+            if node != root and next_sibling[node] >= 0:
+                stack.append(next_sibling[node])
+            handler = handlers[kind[node]]
+            if (handler is None or handler(self, node) is not False) and first_child[node] >= 0:
+                stack.append(first_child[node])
+
+    def nbytes(self) -> int:
+        """Bytes used by node columns."""
+        return sum(col.itemsize * len(col) for col in (
+            self.kind, self.first_child, self.next_sibling, self.token, self.sym))
+
+    def dump_lines(self, root: int = None) -> Iterator[str]:
+        """Yield indented lines of tree one by one, depth bounded as in ast_node."""
+        for node, depth in self.walk_depth(root):
+            attr: str = self.attr(node)
+            yield "{}{}@{}{}".format(
+                dump_indent(depth), self.kind_name(node), self.token[node],
+                " " + attr if attr is not None else "")
+
+    def dump(self, root: int = None) -> str:
+        """Convert tree into indented multi-line string."""
+        return "\n".join(self.dump_lines(root))
+
+
+class ArenaBuilder(TreeBuilder):
+    """Builder producing an AstArena, node handles are its rows.
+
+    Attributes:
+        arena: An AstArena instance being filled.
+    """
+
+    def __init__(self) -> None:
+        """Init with empty arena."""
+        self.arena: AstArena = AstArena()
+
+    def __list(self, nodes: List[int]) -> int:
+        return self.arena.add("list", children=nodes or ())
+
+    def __idents(self, group: SymbolGroup) -> int:
+        arena: AstArena = self.arena
+        return self.__list([arena.add("ident", sym=arena.sym_id(sym_ent)) for sym_ent in group])
+
+    def compilation(self, body):
+        self.arena.root = body if body is not None else -1
+        return self.arena
+
+    def subprogram_body(self, start, end, sym_ent, params, decls, stmts):
+        return self.arena.add("subprogram_body", start.index, self.arena.sym_id(sym_ent), (
+            self.__list(params), self.__list(decls), self.__list(stmts)))
+
+    def param_spec(self, start, end, group, mode, type_node):
+        return self.arena.add("param_spec", start.index, MODE_IDS[mode], (self.__idents(group), type_node))
+
+    def object_decl(self, start, end, group, type_node):
+        return self.arena.add("object_decl", start.index, children=(self.__idents(group), type_node))
+
+    def number_decl(self, start, end, group, value):
+        return self.arena.add("number_decl", start.index, children=(self.__idents(group), value))
+
+    def type_decl(self, start, end, sym_ent, type_node):
+        return self.arena.add("type_decl", start.index, self.arena.sym_id(sym_ent), (type_node,))
+
+    def enum_def(self, start, end, group):
+        return self.arena.add("enum_def", start.index, children=(self.__idents(group),))
+
+    def array_def(self, start, end, indexes, elem_type):
+        return self.arena.add("array_def", start.index, children=(self.__list(indexes), elem_type))
+
+    def range_def(self, start, end, low, high):
+        return self.arena.add("range_def", start.index, children=(low, high))
+
+    def type_name(self, start, sym_ent):
+        return self.arena.add("type_name", start.index, self.arena.sym_id(sym_ent))
+
+    def null_stmt(self, start, end):
+        return self.arena.add("null_stmt", start.index)
+
+    def assign_stmt(self, start, end, target, value):
+        return self.arena.add("assign_stmt", start.index, children=(target, value))
+
+    def call_stmt(self, start, end, sym_ent, args):
+        return self.arena.add("call_stmt", start.index, self.arena.sym_id(sym_ent), (
+            self.__list(args) if args is not None else None,))
+
+    def if_stmt(self, start, end, branches, else_stmts):
+        arena: AstArena = self.arena
+        children: List[int] = [
+            arena.add("branch", arena.token[cond] if cond is not None else -1, children=(cond, self.__list(stmts)))
+            for cond, stmts in branches]
+        if else_stmts is not None:
+            children.append(self.__list(else_stmts))
+        return arena.add("if_stmt", start.index, children=children)
+
+    def loop_stmt(self, start, end, cond, stmts):
+        return self.arena.add("loop_stmt", start.index, children=(cond, self.__list(stmts)))
+
+    def exit_stmt(self, start, end, cond):
+        return self.arena.add("exit_stmt", start.index, children=(cond,))
+
+    def print_stmt(self, start, end, value):
+        return self.arena.add("print_stmt", start.index, children=(value,))
+
+    def int_lit(self, start, val):
+        return self.arena.add("int_lit", start.index, self.arena.lit_id(val))
+
+    def name(self, start, end, sym_ent, args):
+        return self.arena.add("name", start.index, self.arena.sym_id(sym_ent), args or ())
+
+    def unary(self, start, op, operand):
+        return self.arena.add("unary", start.index, OP_IDS[op], (operand,))
+
+    def binary(self, op, left, right):
+        tok: int = self.arena.token[left] if left is not None else -1
+        return self.arena.add("binary", tok, OP_IDS[op], (left, right))
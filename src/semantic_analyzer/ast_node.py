@@ -0,0 +1,288 @@
+"""AST node classes and AstBuilder for TinyAda.
+
+Nodes use __slots__ and carry a source span of (line, column, end line,
+end column), with columns of the first and last character. Identifiers
+are kept as resolved SymbolEntry instances, not as names.
+
+Typical usage example:
+    new_parser = Parser(cio_instance, scn_instance, builder=AstBuilder())
+    new_parser.compilation()
+    print(dump(new_parser.tree))
+    assigns = [n for n in walk(new_parser.tree) if isinstance(n, AssignStmt)]
+"""
+
+
+from typing import Iterator, List, Tuple
+import token
+from symbol_entry import SymbolEntry as SymEnt, SymbolGroup
+from tree_builder import TreeBuilder, dump_indent
+
+
+class Node(object):
+    """Base of AST nodes.
+
+    Attributes:
+        fields: A tuple of strings naming the node specific attributes.
+        line: An int of line number where node starts.
+        column: An int of column number where node starts.
+        end_line: An int of line number where node ends.
+        end_column: An int of column number where node ends.
+    """
+
+    __slots__ = ("line", "column", "end_line", "end_column")
+    fields: Tuple[str, ...] = ()
+
+    def __init__(self, span: Tuple[int, int, int, int], *args) -> None:
+        """Init with span followed by values of fields in order."""
+        self.line, self.column, self.end_line, self.end_column = span
+        for field, arg in zip(self.fields, args):
+            setattr(self, field, arg)
+
+    @property
+    def span(self) -> Tuple[int, int, int, int]:
+        """Source span as (line, column, end line, end column)."""
+        return self.line, self.column, self.end_line, self.end_column
+
+    def children(self) -> Iterator["Node"]:
+        """Yield child nodes in source order."""
+        for field in self.fields:
+            yield from _nodes_in(getattr(self, field))
+
+    def __repr__(self) -> str:
+        """Convert node type, span and non-node fields into string."""
+        attrs: List[str] = list()
+        for field in self.fields:
+            val = getattr(self, field)
+            if isinstance(val, SymEnt):
+                attrs.append("{}={}".format(field, val.name))
+            elif isinstance(val, list) and val and isinstance(val[0], SymEnt):
+                attrs.append("{}={}".format(field, ",".join(s.name for s in val)))
+            elif isinstance(val, str):
+                attrs.append("{}={}".format(field, val))
+        return "{}({}:{}-{}:{}{})".format(
+            type(self).__name__, self.line, self.column, self.end_line, self.end_column,
+            "".join(" " + a for a in attrs))
+
+
+def _nodes_in(val) -> Iterator[Node]:
+    """Yield nodes contained in field value, flattening lists and tuples."""
+    if isinstance(val, Node):
+        yield val
+    elif isinstance(val, (list, tuple)):
+        for item in val:
+            yield from _nodes_in(item)
+
+
+class SubprogramBody(Node):
+    """Procedure with its parameters, declarations and statements."""
+    __slots__ = fields = ("sym_ent", "params", "decls", "stmts")
+
+
+class ParamSpec(Node):
+    """Parameter specification; mode is "in", "out" or "in out"."""
+    __slots__ = fields = ("sym_ents", "mode", "type_node")
+
+
+class ObjectDecl(Node):
+    """Variable declaration."""
+    __slots__ = fields = ("sym_ents", "type_node")
+
+
+class NumberDecl(Node):
+    """Named constant declaration."""
+    __slots__ = fields = ("sym_ents", "value")
+
+
+class TypeDecl(Node):
+    """Type declaration."""
+    __slots__ = fields = ("sym_ent", "type_node")
+
+
+class EnumTypeDef(Node):
+    """Enumeration type definition."""
+    __slots__ = fields = ("sym_ents",)
+
+
+class ArrayTypeDef(Node):
+    """Array type definition."""
+    __slots__ = fields = ("indexes", "elem_type")
+
+
+class RangeDef(Node):
+    """Range of two simple expressions."""
+    __slots__ = fields = ("low", "high")
+
+
+class TypeName(Node):
+    """Reference to named type."""
+    __slots__ = fields = ("sym_ent",)
+
+
+class NullStmt(Node):
+    """Null statement."""
+    __slots__ = fields = ()
+
+
+class AssignStmt(Node):
+    """Assignment statement."""
+    __slots__ = fields = ("target", "value")
+
+
+class CallStmt(Node):
+    """Procedure call statement, args is None without argument list."""
+    __slots__ = fields = ("sym_ent", "args")
+
+
+class IfStmt(Node):
+    """If statement; branches is a list of (condition, statements)."""
+    __slots__ = fields = ("branches", "else_stmts")
+
+
+class LoopStmt(Node):
+    """Loop statement, cond is None without while scheme."""
+    __slots__ = fields = ("cond", "stmts")
+
+
+class ExitStmt(Node):
+    """Exit statement, cond is None without when condition."""
+    __slots__ = fields = ("cond",)
+
+
+class PrintStmt(Node):
+    """Print statement."""
+    __slots__ = fields = ("value",)
+
+
+class IntLiteral(Node):
+    """Integer literal."""
+    __slots__ = fields = ("value",)
+
+
+class Name(Node):
+    """Name, indexed component if args is not None."""
+    __slots__ = fields = ("sym_ent", "args")
+
+
+class UnaryOp(Node):
+    """Unary operation; op is "neg", "pos" or "not"."""
+    __slots__ = fields = ("op", "operand")
+
+
+class BinaryOp(Node):
+    """Binary operation; op is operator token id such as "plus"."""
+    __slots__ = fields = ("op", "left", "right")
+
+
+def walk(root: Node) -> Iterator[Node]:
+    """Yield nodes of tree in pre-order without recursion.
+
+    Args:
+        root: A Node instance to start from.
+    """
+    stack: List[Node] = [root]
+    while stack:
+        node: Node = stack.pop()
+        yield node
+        stack.extend(reversed(list(node.children())))
+
+
+def dump_lines(root: Node) -> Iterator[str]:
+    """Yield indented lines of tree one by one.
+
+    Nodes deeper than MAX_DUMP_INDENT show their depth instead of being
+    indented further, so that lines stay short on deep trees.
+
+    Args:
+        root: A Node instance to start from.
+    """
+    stack: List[Tuple[Node, int]] = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        yield "{}{!r}".format(dump_indent(depth), node)
+        stack.extend((c, depth + 1) for c in reversed(list(node.children())))
+
+
+def dump(root: Node) -> str:
+    """Convert tree into indented multi-line string, as by dump_lines.
+
+    Args:
+        root: A Node instance to start from.
+    """
+    return "\n".join(dump_lines(root))
+
+
+def _span(start: token.Token, end: token.Token) -> Tuple[int, int, int, int]:
+    """Span from first character of start to last character of end."""
+    return start.line, start.column, end.line, end.column + len(end.lit) - 1
+
+
+def _entries(group: SymbolGroup) -> List[SymEnt]:
+    """Convert identifier group into list of entries owned by node."""
+    return list(group.entries)
+
+
+class AstBuilder(TreeBuilder):
+    """Builder producing a tree of Node instances."""
+
+    def compilation(self, body):
+        return body
+
+    def subprogram_body(self, start, end, sym_ent, params, decls, stmts):
+        return SubprogramBody(_span(start, end), sym_ent, params, decls, stmts)
+
+    def param_spec(self, start, end, group, mode, type_node):
+        return ParamSpec(_span(start, end), _entries(group), mode, type_node)
+
+    def object_decl(self, start, end, group, type_node):
+        return ObjectDecl(_span(start, end), _entries(group), type_node)
+
+    def number_decl(self, start, end, group, value):
+        return NumberDecl(_span(start, end), _entries(group), value)
+
+    def type_decl(self, start, end, sym_ent, type_node):
+        return TypeDecl(_span(start, end), sym_ent, type_node)
+
+    def enum_def(self, start, end, group):
+        return EnumTypeDef(_span(start, end), _entries(group))
+
+    def array_def(self, start, end, indexes, elem_type):
+        return ArrayTypeDef(_span(start, end), indexes, elem_type)
+
+    def range_def(self, start, end, low, high):
+        return RangeDef(_span(start, end), low, high)
+
+    def type_name(self, start, sym_ent):
+        return TypeName(_span(start, start), sym_ent)
+
+    def null_stmt(self, start, end):
+        return NullStmt(_span(start, end))
+
+    def assign_stmt(self, start, end, target, value):
+        return AssignStmt(_span(start, end), target, value)
+
+    def call_stmt(self, start, end, sym_ent, args):
+        return CallStmt(_span(start, end), sym_ent, args)
+
+    def if_stmt(self, start, end, branches, else_stmts):
+        return IfStmt(_span(start, end), branches, else_stmts)
+
+    def loop_stmt(self, start, end, cond, stmts):
+        return LoopStmt(_span(start, end), cond, stmts)
+
+    def exit_stmt(self, start, end, cond):
+        return ExitStmt(_span(start, end), cond)
+
+    def print_stmt(self, start, end, value):
+        return PrintStmt(_span(start, end), value)
+
+    def int_lit(self, start, val):
+        return IntLiteral(_span(start, start), val)
+
+    def name(self, start, end, sym_ent, args):
+        return Name(_span(start, end), sym_ent, args)
+
+    def unary(self, start, op, operand):
+        return UnaryOp((start.line, start.column, operand.end_line, operand.end_column), op, operand)
+
+    def binary(self, op, left, right):
+        return BinaryOp((left.line, left.column, right.end_line, right.end_column), op, left, right)
@@ -0,0 +1,320 @@
+"""ControlFlowGraph class built while a procedure body is parsed.
+
+Statements are recorded as instructions in source order, and each basic
+block is the run of instructions from its start to the start of the next
+block, so blocks only ever grow at the end of the graph. Structured
+statements open a context, and edges to blocks not yet made are patched
+when the context is closed. A block ending with a BRANCH instruction has
+the successor taken on true first and the one taken on false second,
+"exit when" taking the loop exit on true.
+
+Once the body is parsed, close packs block starts and successors into
+int arrays, successors of all blocks being one array indexed by a start
+array, so that passes over the retained graph share it without walking
+the syntax again. Once it is solved too, drop_code leaves instructions
+with their kind and variables only.
+
+    ASSIGN: (ASSIGN, SymbolEntry, code) sets a variable or parameter.
+    KILL: (KILL, SymbolEntry tuple) makes their values unknown, all
+        values if None; for indexed assignments and calls.
+    PRINT: (PRINT, code) prints a value.
+    BRANCH: (BRANCH, code) ends a block with a condition.
+
+Expression code is a postfix list of operator strings, SymbolEntry
+instances of variables and parameters, and 1-tuples of constant values.
+
+Typical usage example:
+    graph = ControlFlowGraph()
+    loop = graph.open_loop(cond_code)
+    graph.add((ASSIGN, sym_ent, code))
+    graph.close_loop(loop)
+    graph.close()
+    print(graph.dump("main"))
+"""
+
+
+from array import array
+from typing import List, Sequence, Tuple
+
+
+# Instruction kinds
+ASSIGN: int = 0
+KILL: int = 1
+PRINT: int = 2
+BRANCH: int = 3
+
+KIND_NAMES: Tuple[str, ...] = ("assign", "kill", "print", "branch")
+
+# Items of each instruction kind kept by drop_code
+KEPT_ITEMS: Tuple[int, ...] = (2, 2, 1, 1)
+
+# Successor of an edge still to be patched, or abandoned after an error
+NO_BLOCK: int = -1
+
+# Successor slot to patch as (block, index in its successor list)
+Slot = Tuple[int, int]
+
+
+class LoopContext(object):
+    """Open loop statement.
+
+    Attributes:
+        top: An int of block testing the condition or starting the body.
+        exits: A list of Slot pairs jumping past the loop.
+    """
+
+    def __init__(self, top: int) -> None:
+        """Init with first block of loop."""
+        self.top: int = top
+        self.exits: List[Slot] = list()
+
+
+class IfContext(object):
+    """Open if statement.
+
+    Attributes:
+        ends: A list of Slot pairs jumping past the statement.
+        false_slot: A Slot of the last condition's false successor, None
+            once an else part has taken it.
+    """
+
+    def __init__(self) -> None:
+        """Init with no branches."""
+        self.ends: List[Slot] = list()
+        self.false_slot: Slot = None
+
+
+class ControlFlowGraph(object):
+    """Basic blocks and edges of one procedure body.
+
+    Attributes:
+        instrs: A list of instruction tuples in source order.
+        lines: An int array of source line of each instruction.
+        line: An int of source line of instructions added next.
+        starts: A list of int of first instruction of each block, an int
+            array once closed.
+        succs: A list of lists of successor blocks of each block, NO_BLOCK
+            where an edge is still to be patched or was abandoned, None
+            once closed.
+        succ_starts: An int array of index of first successor of each
+            block in succ_blocks, and of their end, once closed.
+        succ_blocks: An int array of successors of all blocks, once closed.
+        loops: A list of LoopContext instances of loops open.
+        changed: A list of int of blocks whose successors changed, in
+            order, for a solver to take up.
+    """
+
+    def __init__(self) -> None:
+        """Init with entry block."""
+        self.instrs: List[Tuple] = list()
+        self.lines: array = array("l")
+        self.line: int = 0
+        self.starts: Sequence[int] = [0]
+        self.succs: List[List[int]] = [list()]
+        self.succ_starts: array = None
+        self.succ_blocks: array = None
+        self.loops: List[LoopContext] = list()
+        self.changed: List[int] = list()
+        self.__preds: Tuple[array, array] = None
+
+    def __len__(self) -> int:
+        """Number of blocks."""
+        return len(self.starts)
+
+    @property
+    def current(self) -> int:
+        """Block receiving instructions."""
+        return len(self.starts) - 1
+
+    def block_range(self, block: int) -> Tuple[int, int]:
+        """First and past-last instruction index of block."""
+        end: int = self.starts[block + 1] if block + 1 < len(self.starts) else len(self.instrs)
+        return self.starts[block], end
+
+    @property
+    def closed(self) -> bool:
+        """Test if graph has been packed by close."""
+        return self.succs is None
+
+    def successors(self, block: int) -> Sequence[int]:
+        """Successor blocks of block, NO_BLOCK where an edge is missing."""
+        if self.succs is not None:
+            return self.succs[block]
+        return self.succ_blocks[self.succ_starts[block]:self.succ_starts[block + 1]]
+
+    def add(self, instr: Tuple) -> int:
+        """Append instruction to current block and return its index."""
+        self.instrs.append(instr)
+        self.lines.append(self.line)
+        return len(self.instrs) - 1
+
+    def new_block(self, fall: bool = True) -> int:
+        """Start next block, reached from current one if fall is set."""
+        if fall:
+            self.__link(self.current, self.current + 1)
+        self.starts.append(len(self.instrs))
+        self.succs.append(list())
+        return self.current
+
+    def __link(self, block: int, target: int) -> None:
+        self.succs[block].append(target)
+        self.changed.append(block)
+
+    def __jump(self) -> Slot:
+        """End current block by a jump to be patched, start the next one."""
+        block: int = self.current
+        self.succs[block].append(NO_BLOCK)
+        self.new_block(False)
+        return block, 0
+
+    def __branch(self, code: List) -> Slot:
+        """End current block by condition, start block taken on true."""
+        block: int = self.current
+        self.add((BRANCH, code))
+        self.succs[block].extend((block + 1, NO_BLOCK))
+        self.changed.append(block)
+        self.new_block(False)
+        return block, 1
+
+    def patch(self, slots: List[Slot], target: int) -> None:
+        """Direct pending successors to target block."""
+        for block, index in slots:
+            self.succs[block][index] = target
+            self.changed.append(block)
+
+    def open_loop(self, code: List = None) -> LoopContext:
+        """Start loop, testing condition code first if given."""
+        loop: LoopContext = LoopContext(self.new_block())
+        if code is not None:
+            loop.exits.append(self.__branch(code))
+        self.loops.append(loop)
+        return loop
+
+    def exit_loop(self, code: List = None) -> None:
+        """Leave innermost loop, if condition code holds when given."""
+        if not self.loops:
+            return
+        if code is None:
+            self.loops[-1].exits.append(self.__jump())
+            return
+        block: int = self.current
+        self.add((BRANCH, code))
+        self.succs[block].extend((NO_BLOCK, block + 1))
+        self.loops[-1].exits.append((block, 0))
+        self.new_block(False)
+
+    def close_loop(self, loop: LoopContext) -> None:
+        """Jump back to top of loop and start block after it.
+
+        Loops left open inside it, such as after a syntax error, are
+        closed first.
+        """
+        while self.loops and self.loops[-1] is not loop:
+            self.close_loop(self.loops[-1])
+        if self.loops:
+            self.loops.pop()
+        self.__link(self.current, loop.top)
+        self.new_block(False)
+        self.patch(loop.exits, self.current)
+
+    def open_if(self) -> IfContext:
+        """Start if statement."""
+        return IfContext()
+
+    def if_branch(self, if_ctx: IfContext, code: List) -> None:
+        """Test condition code, continuing with statements taken on true."""
+        if_ctx.false_slot = self.__branch(code)
+
+    def else_branch(self, if_ctx: IfContext) -> None:
+        """End statements of a branch, continuing with those taken on false."""
+        if_ctx.ends.append(self.__jump())
+        if if_ctx.false_slot:
+            self.patch([if_ctx.false_slot], self.current)
+            if_ctx.false_slot = None
+
+    def close_if(self, if_ctx: IfContext) -> None:
+        """End last branch and start block after statement."""
+        self.new_block()
+        slots: List[Slot] = if_ctx.ends + ([if_ctx.false_slot] if if_ctx.false_slot else [])
+        self.patch(slots, self.current)
+
+    def close(self) -> None:
+        """Pack block starts and successors into arrays.
+
+        Loops left open are closed first. The graph takes no more
+        instructions afterwards.
+        """
+        while self.loops:
+            self.close_loop(self.loops[-1])
+        self.succ_starts = array("l", [0])
+        self.succ_blocks = array("l")
+        for succs in self.succs:
+            self.succ_blocks.extend(succs)
+            self.succ_starts.append(len(self.succ_blocks))
+        self.starts = array("l", self.starts)
+        self.succs = None
+
+    def drop_code(self) -> None:
+        """Drop expression code of instructions, and changes taken up.
+
+        Instructions keep their kind and variables, as dump shows them,
+        so a graph kept after it is solved holds no expressions.
+        """
+        self.instrs = [instr[:KEPT_ITEMS[instr[0]]] for instr in self.instrs]
+        self.changed = list()
+
+    def predecessors(self, block: int) -> Sequence[int]:
+        """Blocks having block as successor, once closed."""
+        if self.__preds is None:
+            counts: array = array("l", [0]) * (len(self) + 1)
+            for succ in self.succ_blocks:
+                if succ != NO_BLOCK:
+                    counts[succ + 1] += 1
+            for i in range(len(self)):
+                counts[i + 1] += counts[i]
+            preds: array = array("l", [0]) * counts[-1]
+            fill: array = array("l", counts)
+            for pred in range(len(self)):
+                for succ in self.successors(pred):
+                    if succ != NO_BLOCK:
+                        preds[fill[succ]] = pred
+                        fill[succ] += 1
+            self.__preds = counts, preds
+        counts, preds = self.__preds
+        return preds[counts[block]:counts[block + 1]]
+
+    def reachable(self) -> bytearray:
+        """Flags of blocks reachable from entry, taking both ways of branches."""
+        seen: bytearray = bytearray(len(self))
+        seen[0] = 1
+        stack: List[int] = [0]
+        while stack:
+            for succ in self.successors(stack.pop()):
+                if succ != NO_BLOCK and not seen[succ]:
+                    seen[succ] = 1
+                    stack.append(succ)
+        return seen
+
+    def dump(self, name: str) -> str:
+        """Convert graph into text of its blocks, instructions and edges.
+
+        Args:
+            name: A string of procedure name.
+        """
+        seen: bytearray = self.reachable()
+        out: List[str] = ["procedure {}: {} blocks, {} instructions".format(name, len(self), len(self.instrs))]
+        for block in range(len(self)):
+            first, last = self.block_range(block)
+            succs: str = " ".join("B{}".format(succ) if succ != NO_BLOCK else "-" for succ in self.successors(block))
+            out.append("  B{} [{}, {}) -> {}{}".format(
+                block, first, last, succs or "end", "" if seen[block] else " (unreachable)"))
+            for index in range(first, last):
+                instr: Tuple = self.instrs[index]
+                text: str = KIND_NAMES[instr[0]]
+                if instr[0] == ASSIGN:
+                    text += " " + instr[1].name
+                elif instr[0] == KILL:
+                    names: str = ", ".join(sym_ent.name for sym_ent in instr[1]) if instr[1] is not None else "all"
+                    text += " " + (names or "nothing")
+                out.append("    {:>3} line {:>3}: {}".format(index, self.lines[index], text))
+        return "\n".join(out)
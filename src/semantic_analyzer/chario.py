@@ -2,7 +2,9 @@
 
 Typical usage example:
     new_cio = Chario("C:/pl_project/test.txt", False)
+    new_cio = Chario(None, False, ["procedure P is\n", "begin null; end;\n"])
     cio_instance.put_error("';' expected")
+    cio_instance.put_note("Undeclared identifier x used 2 times")
     cio_instance.report_errors()
     new_char = cio_instance.get_char()
 """
@@ -12,6 +14,10 @@ from typing import List
 import os.path
 
 
+class ErrorLimitError(Exception):
+    """Error limit has been reached and compilation is abandoned."""
+
+
 class Chario(object):
     """Read raw source program and provide text stream for scanner.
 
@@ -19,22 +25,26 @@ class Chario(object):
         src: A list of strings with source program lines as elements.
         line: A string of current source program line.
         err_count: An int of error count caught while parsing.
+        max_errors: An int of error count to abandon compilation at, None
+            for no limit.
         column: An int of index of current character in source program line.
         line_number: An int of index for current line in source program.
     """
 
-    def __init__(self, in_file: str, is_verbose: bool) -> None:
-        """Init with input source program filepath and verbose option."""
-        self.src: List[str] = None
-        if os.path.isfile(in_file):
-            in_file_obj = open(in_file)
-            self.src = in_file_obj.readlines()
-            in_file_obj.close()
-        else:
-            print("E: Invalid filepath or faulty file: {}".format(in_file))
+    def __init__(self, in_file: str, is_verbose: bool, src: List[str] = None) -> None:
+        """Init with input source program filepath or lines, and verbose option."""
+        self.src: List[str] = src
+        if src is None:
+            if os.path.isfile(in_file):
+                in_file_obj = open(in_file)
+                self.src = in_file_obj.readlines()
+                in_file_obj.close()
+            else:
+                print("E: Invalid filepath or faulty file: {}".format(in_file))
         self.is_verbose: bool = is_verbose
         self.line: str = ""
         self.err_count: int = 0
+        self.max_errors: int = None
         self.column: int = 0
         self.line_count: int = 0
 
@@ -46,11 +56,29 @@ class Chario(object):
 
         Args:
             message: A string of error message caught during compilation.
+
+        Raises:
+            ErrorLimitError: Error count reached max_errors.
         """
         self.err_count += 1
         if not self.is_verbose and self.line:
             self.__print_line()
         print("{}E: {}".format((" " * (3 + self.column)), message))
+        self.check_error_limit()
+
+    def check_error_limit(self) -> None:
+        """Abandon compilation if error count reached max_errors."""
+        if self.max_errors and self.err_count >= self.max_errors:
+            print("Error limit of {} reached, compilation stopped".format(self.max_errors))
+            raise ErrorLimitError()
+
+    def put_note(self, message: str) -> None:
+        """Print note on compilation, not counted as error.
+
+        Args:
+            message: A string of note.
+        """
+        print("   N: {}".format(message))
 
     def report_errors(self):
         """Print number of errors caught during compilation."""
@@ -0,0 +1,222 @@
+"""ConstantPropagator class finding constant values over a ControlFlowGraph.
+
+Each block gets the state its predecessors reach it with. A state is a
+bitset of variables known to hold a constant, indexed in order of first
+appearance, with their values. A block no reached state has been
+propagated to is unknown, a variable out of the bitset is varying, so
+that joining states keeps the constants two paths agree on. Each
+variable can only turn from constant to varying, so the worklist empties
+after a few passes over any loop.
+
+A branch whose condition is constant passes its state only to the
+successor taken, so code behind it is never reached. Blocks are solved
+as far as the graph has been built, and solving again takes up only the
+blocks made or changed since.
+
+Typical usage example:
+    propagator = ConstantPropagator(graph, fold)
+    propagator.solve()
+    print(propagator.value_at(index, code))
+"""
+
+
+from bisect import bisect_right
+from collections import deque
+from typing import Callable, Deque, Dict, List, Sequence, Tuple
+from cfg import ASSIGN, BRANCH, KILL, NO_BLOCK, ControlFlowGraph
+from symbol_entry import SymbolEntry as SymEnt, Value
+
+
+def _same(val1: Value, val2: Value) -> bool:
+    """Test if values are equal and of the same type."""
+    return type(val1) is type(val2) and val1 == val2
+
+
+class State(object):
+    """Variables holding a constant at a program point.
+
+    Attributes:
+        mask: An int bitset of indexes of variables holding a constant.
+        vals: A dict mapping index of each such variable to its value.
+    """
+
+    __slots__ = ("mask", "vals")
+
+    def __init__(self, mask: int = 0, vals: Dict[int, Value] = None) -> None:
+        """Init with bitset and values, every variable varying by default."""
+        self.mask: int = mask
+        self.vals: Dict[int, Value] = vals if vals is not None else dict()
+
+    def __eq__(self, other: "State") -> bool:
+        """Test if same variables hold same constants."""
+        return self.mask == other.mask and all(_same(val, other.vals[i]) for i, val in self.vals.items())
+
+    def join(self, other: "State") -> "State":
+        """State keeping constants on which both agree."""
+        mask: int = self.mask & other.mask
+        vals: Dict[int, Value] = dict()
+        bits: int = mask
+        while bits:
+            low: int = bits & -bits
+            bits ^= low
+            i: int = low.bit_length() - 1
+            if _same(self.vals[i], other.vals[i]):
+                vals[i] = self.vals[i]
+            else:
+                mask ^= low
+        return State(mask, vals)
+
+
+class ConstantPropagator(object):
+    """Worklist solver of constant propagation over a growing graph.
+
+    Attributes:
+        graph: A ControlFlowGraph instance analyzed.
+        fold: A callable folding operator over values, taking operator,
+            left value, None for unary operators, and right value.
+        index: A dict mapping SymbolEntry of variable to its bit index.
+        states: A list of State reaching each block, None if unknown.
+    """
+
+    def __init__(self, graph: ControlFlowGraph, fold: Callable[[str, Value, Value], Value]) -> None:
+        """Init with graph and folding callable, entry reached with no constants."""
+        self.graph: ControlFlowGraph = graph
+        self.fold: Callable[[str, Value, Value], Value] = fold
+        self.index: Dict[SymEnt, int] = dict()
+        self.states: List[State] = [State()]
+        self.__work: Deque[int] = deque()
+        self.__queued: List[bool] = [False]
+        self.__seen_changes: int = 0
+        self.__closed: int = 0
+        self.__cursor: Tuple[int, int, State, State] = None
+
+    def __bit(self, sym_ent: SymEnt) -> int:
+        i: int = self.index.get(sym_ent)
+        if i is None:
+            i = self.index[sym_ent] = len(self.index)
+        return 1 << i
+
+    def evaluate(self, code: List, state: State) -> Value:
+        """Value of postfix expression code in state, None if not constant."""
+        stack: List[Value] = list()
+        try:
+            for item in code:
+                if type(item) is str:
+                    val2: Value = stack.pop()
+                    val1: Value = stack.pop() if item not in ("neg", "pos", "not") else None
+                    stack.append(self.fold(item, val1, val2))
+                elif type(item) is tuple:
+                    stack.append(item[0])
+                else:
+                    i: int = self.index.get(item)
+                    stack.append(state.vals.get(i) if i is not None and state.mask >> i & 1 else None)
+            return stack.pop() if len(stack) == 1 else None
+        except IndexError:  # Code of an expression cut short by a syntax error
+            return None
+
+    def transfer(self, state: State, first: int, last: int) -> State:
+        """State after instructions first up to last, past-last, of graph."""
+        mask: int = state.mask
+        vals: Dict[int, Value] = state.vals
+        copied: bool = False
+        for instr in self.graph.instrs[first:last]:
+            kind: int = instr[0]
+            if kind == ASSIGN:
+                if not copied:
+                    vals, copied = dict(vals), True
+                bit: int = self.__bit(instr[1])
+                val: Value = self.evaluate(instr[2], State(mask, vals))
+                if val is None:
+                    mask &= ~bit
+                    vals.pop(bit.bit_length() - 1, None)
+                else:
+                    mask |= bit
+                    vals[bit.bit_length() - 1] = val
+            elif kind == KILL:
+                if not copied:
+                    vals, copied = dict(vals), True
+                if instr[1] is None:
+                    mask = 0
+                    vals.clear()
+                for sym_ent in instr[1] or ():
+                    i: int = self.index.get(sym_ent)
+                    if i is not None:
+                        mask &= ~(1 << i)
+                        vals.pop(i, None)
+        return State(mask, vals) if copied else state
+
+    def __enqueue(self, block: int) -> None:
+        if block < self.__closed and not self.__queued[block]:
+            self.__queued[block] = True
+            self.__work.append(block)
+
+    def solve(self, final: bool = False) -> None:
+        """Propagate over blocks made or changed since last solved.
+
+        Args:
+            final: A bool indicating if the current block is complete too.
+        """
+        graph: ControlFlowGraph = self.graph
+        blocks: int = len(graph)
+        self.states.extend([None] * (blocks - len(self.states)))
+        self.__queued.extend([False] * (blocks - len(self.__queued)))
+        first_new: int = self.__closed
+        self.__closed = blocks if final else graph.current
+        for block in range(first_new, self.__closed):
+            self.__enqueue(block)
+        changes: List[int] = graph.changed
+        for block in changes[self.__seen_changes:]:
+            self.__enqueue(block)
+        self.__seen_changes = len(changes)
+        work: Deque[int] = self.__work
+        while work:
+            block = work.popleft()
+            self.__queued[block] = False
+            state: State = self.states[block]
+            if state is None:
+                continue
+            first, last = graph.block_range(block)
+            out: State = self.transfer(state, first, last)
+            succs: Sequence[int] = graph.successors(block)
+            if last > first and graph.instrs[last - 1][0] == BRANCH and len(succs) == 2:
+                cond: Value = self.evaluate(graph.instrs[last - 1][1], out)
+                if type(cond) is bool:
+                    succs = [succs[0] if cond else succs[1]]
+            for succ in succs:
+                if succ == NO_BLOCK:
+                    continue
+                old: State = self.states[succ]
+                new: State = out if old is None else old.join(out)
+                if old is None or not new == old:
+                    self.states[succ] = new
+                    if succ < self.__closed:
+                        self.__enqueue(succ)
+
+    def reached(self, index: int) -> bool:
+        """Test if instruction of graph is reached by any path, after solve."""
+        block: int = max(bisect_right(self.graph.starts, index) - 1, 0)
+        return block < len(self.states) and self.states[block] is not None
+
+    def state_at(self, index: int) -> State:
+        """State before instruction of graph, after solve.
+
+        Consecutive queries within one block continue from the last one.
+        """
+        graph: ControlFlowGraph = self.graph
+        block: int = max(bisect_right(graph.starts, index) - 1, 0)
+        entry: State = self.states[block] if block < len(self.states) else None
+        if entry is None:
+            entry = State()
+        first: int = graph.starts[block]
+        if self.__cursor and self.__cursor[0] == block and self.__cursor[2] is entry \
+                and self.__cursor[1] <= index:
+            first, state = self.__cursor[1], self.__cursor[3]
+        else:
+            state = entry
+        state = self.transfer(state, first, index)
+        self.__cursor = (block, index, entry, state)
+        return state
+
+    def value_at(self, index: int, code: List) -> Value:
+        """Value of expression code before instruction index, None if not constant."""
+        return self.evaluate(code, self.state_at(index))
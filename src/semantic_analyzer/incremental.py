@@ -0,0 +1,286 @@
+"""IncrementalAnalyzer class re-analyzing only edited procedures.
+
+The program is analyzed in lazy mode and every deferred procedure body is
+expanded on its own, so each procedure keeps its tokens, the scopes
+visible at its place, a digest of its token stream, and the diagnostics
+and print output of its own statements.
+
+An edit strictly inside the body of a nested procedure re-scans only the
+edited lines, and splices the new tokens into that body and its
+enclosing bodies. Line numbers after the edit are shifted, and only the
+innermost enclosing procedure is analyzed again, together with the
+procedures nested in it. Its digest skips even that if neither tokens
+nor their lines changed, as for edits of blanks outside reported
+errors. Any other edit, or one breaking the body structure, falls back
+to full analysis.
+
+Constants flowing through calls depend on the variables a procedure may
+change, judged from the names a deferred body mentions and then from its
+analysis, so an edit changing either falls back to full analysis too.
+
+Typical usage example:
+    analyzer = IncrementalAnalyzer(lines)
+    analyzer.edit(12, 12, ["      X := X + 2;\\n"])
+    for line, column, message in analyzer.diagnostics():
+        print(line, column, message)
+"""
+
+
+from typing import List, Set, Tuple
+import contextlib
+import io
+import chario
+import parser7
+import scanner
+import token
+from lazy_body import LazyBody, is_body, outer_names
+from symbol_entry import SymbolEntry as SymEnt
+
+
+# Diagnostic as (line, column, message)
+Diagnostic = Tuple[int, int, str]
+
+
+class RecordingChario(chario.Chario):
+    """Chario collecting errors into the list of the unit being analyzed.
+
+    Attributes:
+        sink: A list of Diagnostic tuples receiving errors.
+    """
+
+    def __init__(self, src: List[str]) -> None:
+        """Init with source lines."""
+        super().__init__(None, False, src)
+        self.sink: List[Diagnostic] = list()
+
+    def put_error(self, message: str) -> None:
+        """Increment error count and record error with its position."""
+        self.err_count += 1
+        self.sink.append((self.line_count, self.column, message))
+        self.check_error_limit()
+
+    def report_errors(self) -> None:
+        """Print nothing, as a total would be stale after edits."""
+
+
+class ProcUnit(object):
+    """Analysis results of one nested procedure body.
+
+    Attributes:
+        body: A LazyBody instance of the procedure.
+        parent: A ProcUnit instance of the enclosing procedure, None at top.
+        children: A list of ProcUnit instances of nested procedures.
+        digest: An int of hash of token ids and literals of the body.
+        diagnostics: A list of Diagnostic tuples of the body itself.
+        output: A list of strings printed by the body itself.
+    """
+
+    def __init__(self, body: LazyBody, parent: "ProcUnit") -> None:
+        """Init with deferred body and enclosing unit."""
+        self.body: LazyBody = body
+        self.parent: ProcUnit = parent
+        self.children: List[ProcUnit] = list()
+        self.digest: int = 0
+        self.diagnostics: List[Diagnostic] = list()
+        self.output: List[str] = list()
+
+    def walk(self):
+        """Yield this unit and units nested in it."""
+        stack: List[ProcUnit] = [self]
+        while stack:
+            unit: ProcUnit = stack.pop()
+            yield unit
+            stack.extend(reversed(unit.children))
+
+
+def _digest(tokens: List[token.Token]) -> int:
+    """Hash of token ids and literals, independent of positions."""
+    return hash(tuple((tok.tok_id, tok.lit) for tok in tokens))
+
+
+def _first_after(tokens: List[token.Token], line: int) -> int:
+    """Index of first token beyond line, tokens being in source order."""
+    low, high = 0, len(tokens)
+    while low < high:
+        mid: int = (low + high) // 2
+        if tokens[mid].line > line:
+            high = mid
+        else:
+            low = mid + 1
+    return low
+
+
+class IncrementalAnalyzer(object):
+    """Keeps analysis of a program up to date over line edits.
+
+    Attributes:
+        lines: A list of strings of current source lines.
+        chario: A RecordingChario instance of the last full analysis.
+        parser: A Parser instance in lazy mode expanding the units.
+        units: A list of ProcUnit instances of procedures nested in the
+            outermost one.
+        root_diagnostics: A list of Diagnostic tuples of the outermost
+            procedure, including lexical errors of skipped bodies.
+        root_output: A list of strings printed by the outermost procedure.
+        lex_diagnostics: A list of Diagnostic tuples of lexical errors in
+            lines scanned by edits.
+        full_runs: An int of full analyses done.
+    """
+
+    def __init__(self, lines: List[str]) -> None:
+        """Init with source lines and analyze them."""
+        self.lines: List[str] = list(lines)
+        self.chario: RecordingChario = None
+        self.parser: parser7.Parser = None
+        self.units: List[ProcUnit] = list()
+        self.root_diagnostics: List[Diagnostic] = list()
+        self.root_output: List[str] = list()
+        self.lex_diagnostics: List[Diagnostic] = list()
+        self.full_runs: int = 0
+        self.analyze()
+
+    def analyze(self) -> None:
+        """Analyze whole program from scratch."""
+        self.full_runs += 1
+        self.lex_diagnostics = list()
+        self.chario = RecordingChario(self.lines)
+        self.root_diagnostics = self.chario.sink = list()
+        self.parser = parser7.Parser(self.chario, scanner.Scanner(self.chario), lazy=True)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.parser.compilation()
+        self.root_output = out.getvalue().splitlines()
+        bodies: List[LazyBody] = list(self.parser.lazy_bodies)
+        self.parser.lazy_bodies.clear()
+        self.units = [self.__expand(ProcUnit(body, None)) for body in bodies]
+
+    def __expand(self, unit: ProcUnit) -> ProcUnit:
+        """Analyze body of unit and, in turn, the bodies nested in it."""
+        unit.diagnostics = self.chario.sink = list()
+        unit.body.expanded = False
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.parser.expand(unit.body)
+        unit.output = out.getvalue().splitlines()
+        unit.digest = _digest(unit.body.tokens)
+        bodies: List[LazyBody] = list(self.parser.lazy_bodies)
+        self.parser.lazy_bodies.clear()
+        unit.children = [self.__expand(ProcUnit(body, unit)) for body in bodies]
+        return unit
+
+    def all_units(self):
+        """Yield every unit in source order."""
+        for unit in self.units:
+            yield from unit.walk()
+
+    def diagnostics(self) -> List[Diagnostic]:
+        """Diagnostics of whole program in source order."""
+        result: List[Diagnostic] = self.root_diagnostics + self.lex_diagnostics
+        for unit in self.all_units():
+            result.extend(unit.diagnostics)
+        return sorted(result)
+
+    def __innermost(self, first: int, last: int) -> ProcUnit:
+        """Innermost unit whose body lines strictly enclose lines first to last."""
+        found: ProcUnit = None
+        units: List[ProcUnit] = self.units
+        while units:
+            for unit in units:
+                tokens: List[token.Token] = unit.body.tokens
+                if tokens and tokens[0].line < first and last < tokens[-1].line:
+                    found = unit
+                    units = unit.children
+                    break
+            else:
+                break
+        return found
+
+    def edit(self, first: int, last: int, new_lines: List[str]) -> ProcUnit:
+        """Replace lines and re-analyze what the edit may have changed.
+
+        Args:
+            first: An int of first line number replaced, starting at 1.
+            last: An int of last line number replaced, first - 1 to insert.
+            new_lines: A list of strings of replacing lines, with newlines.
+
+        Returns:
+            A ProcUnit instance re-analyzed, None if whole program was.
+        """
+        self.lines[first - 1:last] = new_lines
+        delta: int = len(new_lines) - (last - first + 1)
+        unit: ProcUnit = self.__innermost(first, last)
+        if unit is None:
+            self.analyze()
+            return None
+        old_tokens: List[token.Token] = unit.body.tokens
+        low: int = _first_after(old_tokens, first - 1)
+        high: int = _first_after(old_tokens, last)
+        chunk_cio: RecordingChario = RecordingChario(new_lines)
+        chunk_scn: scanner.Scanner = scanner.Scanner(chunk_cio)
+        chunk: List[token.Token] = list()
+        tok: token.Token = chunk_scn.next_token()
+        while tok.tok_id != "eof":
+            tok.line += first - 1
+            chunk.append(tok)
+            tok = chunk_scn.next_token()
+        new_tokens: List[token.Token] = old_tokens[:low] + chunk + old_tokens[high:]
+        if not is_body(new_tokens):
+            self.analyze()
+            return None
+        # Errors of outer bodies within a nested one are lexical ones
+        for diags in [self.root_diagnostics, self.lex_diagnostics] + [
+                u.diagnostics for u in self.__ancestors(unit)]:
+            diags[:] = [d for d in diags if not first <= d[0] <= last]
+        removed: List[token.Token] = old_tokens[low:high]
+        same: bool = (
+            _digest(new_tokens) == unit.digest
+            and [t.line for t in chunk] == [t.line for t in removed]
+            and not any(first <= d[0] <= last for d in self.diagnostics()))
+        if same:  # Keep token objects shared with nested units
+            for old_tok, new_tok in zip(removed, chunk):
+                old_tok.column = new_tok.column
+        self.__shift(last, delta)
+        self.lex_diagnostics.extend((line + first - 1, column, message) for line, column, message in chunk_cio.sink)
+        if same:
+            return unit
+        chain: List[ProcUnit] = [unit] + self.__ancestors(unit)
+        old_names: List[Set[str]] = [outer_names(u.body.tokens) for u in chain]
+        old_writes: Set[SymEnt] = self.parser.writes.get(unit.body.sym_ent)
+        outer: ProcUnit = unit.parent
+        while outer:  # Splice into enclosing bodies sharing the tokens
+            tokens: List[token.Token] = outer.body.tokens
+            start: int = _first_after(tokens, first - 1)
+            tokens[start:start + len(removed)] = chunk
+            outer = outer.parent
+        unit.body.tokens = new_tokens
+        if [outer_names(u.body.tokens) for u in chain] != old_names:
+            self.analyze()
+            return None
+        self.__expand(unit)
+        if self.parser.writes.get(unit.body.sym_ent) != old_writes:
+            self.analyze()
+            return None
+        return unit
+
+    @staticmethod
+    def __ancestors(unit: ProcUnit) -> List[ProcUnit]:
+        """Units enclosing unit, innermost first."""
+        result: List[ProcUnit] = list()
+        while unit.parent:
+            unit = unit.parent
+            result.append(unit)
+        return result
+
+    def __shift(self, last: int, delta: int) -> None:
+        """Move tokens and diagnostics beyond line last by delta lines."""
+        if not delta:
+            return
+        for unit in self.units:
+            if unit.body.start.line > last:
+                unit.body.start.line += delta
+            tokens: List[token.Token] = unit.body.tokens
+            for i in range(_first_after(tokens, last), len(tokens)):
+                tokens[i].line += delta
+        for diags in [self.root_diagnostics, self.lex_diagnostics] + [u.diagnostics for u in self.all_units()]:
+            diags[:] = [(line + delta if line > last else line, column, message)
+                        for line, column, message in diags]
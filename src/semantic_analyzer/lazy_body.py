@@ -0,0 +1,170 @@
+"""LazyBody and TokenReplay classes for deferred procedure body analysis.
+
+In lazy mode the parser analyzes a nested procedure only up to its
+specification and skips the rest by counting begin, if and loop against
+end. The skipped tokens and the scopes visible at that point are kept in
+a LazyBody, which Parser.expand later analyzes from a TokenReplay.
+
+Typical usage example:
+    new_parser = Parser(cio_instance, scn_instance, lazy=True)
+    new_parser.compilation()
+    for body in new_parser.lazy_bodies:
+        print(body.sym_ent.name, body.first_line, body.last_line)
+    new_parser.expand(new_parser.lazy_bodies[0])
+"""
+
+
+from typing import Dict, List, Set, Tuple
+import chario
+import token
+from symbol_entry import SymbolEntry as SymEnt
+
+
+# Tokens opening a construct closed by "end"
+END_OPEN_SET: Set[str] = {"proc", "if", "loop"}
+
+
+class BodySkipper(object):
+    """Finds the end of a procedure body without parsing it.
+
+    The body ends with the semicolon after its own "end", found by counting
+    nested procedures, and "if" and "loop" which are not part of "end if"
+    and "end loop", against "end".
+
+    Attributes:
+        depth: An int of constructs open, the body itself included.
+        after_end: A bool indicating if previous token was "end".
+    """
+
+    def __init__(self) -> None:
+        """Init at first token after "is" of the procedure."""
+        self.depth: int = 1
+        self.after_end: bool = False
+
+    def feed(self, tok: token.Token) -> bool:
+        """Take next token of body and test if it is the last one."""
+        tok_id: str = tok.tok_id
+        if tok_id == "end":
+            self.depth -= 1
+        elif tok_id in END_OPEN_SET and not self.after_end:
+            self.depth += 1
+        elif tok_id == "semi" and self.depth <= 0:
+            return True
+        self.after_end = tok_id == "end"
+        return False
+
+
+def is_body(tokens: List[token.Token]) -> bool:
+    """Test if tokens form exactly one procedure body after its "is"."""
+    skipper: BodySkipper = BodySkipper()
+    for i, tok in enumerate(tokens):
+        if skipper.feed(tok):
+            return i == len(tokens) - 1
+    return False
+
+
+def outer_names(tokens: List[token.Token]) -> Set[str]:
+    """Names a procedure body may take from enclosing scopes.
+
+    Every identifier of the body counts, except those it declares itself,
+    in its own declarations, before mentioning them.
+
+    Args:
+        tokens: A list of Token instances following the body's "is".
+
+    Returns:
+        A set of strings of identifier names.
+    """
+    declared: Set[str] = set()
+    mentioned: Set[str] = set()
+    skipper: BodySkipper = BodySkipper()
+    in_decls: bool = True
+    listing: bool = True  # Next identifier is declared, if at body level
+    proc_name: bool = False
+    for tok in tokens:
+        outer: bool = in_decls and skipper.depth == 1
+        if tok.tok_id == "id":
+            if (outer and listing or proc_name) and tok.lit not in mentioned:
+                declared.add(tok.lit)
+            mentioned.add(tok.lit)
+        if outer:
+            in_decls = tok.tok_id != "begin"
+            listing = tok.tok_id in ("semi", "comma", "type") or listing and tok.tok_id == "id"
+        proc_name = outer and tok.tok_id == "proc"
+        if skipper.feed(tok):
+            break
+    return mentioned - declared
+
+
+class LazyBody(object):
+    """Nested procedure body recorded for later analysis.
+
+    Attributes:
+        start: A Token instance of the procedure keyword.
+        sym_ent: A SymbolEntry instance of the procedure.
+        params: A list of nodes of parameter specifications.
+        tokens: A list of Token instances following the specification's
+            "is", through the closing semicolon.
+        scopes: A list of (symbol table, entry count) pairs of enclosing
+            scopes, the visible entries being the first count ones.
+        param_scope: A dict of the procedure's own scope holding parameters.
+        node: Node built for the complete body once expanded.
+        expanded: A bool indicating if body has been analyzed.
+    """
+
+    def __init__(self, start: token.Token, sym_ent: SymEnt, params: List, tokens: List[token.Token],
+                 scopes: List[Tuple[Dict[str, SymEnt], int]], param_scope: Dict[str, SymEnt]) -> None:
+        """Init with specification, skipped tokens and visible scopes."""
+        self.start: token.Token = start
+        self.sym_ent: SymEnt = sym_ent
+        self.params: List = params
+        self.tokens: List[token.Token] = tokens
+        self.scopes: List[Tuple[Dict[str, SymEnt], int]] = scopes
+        self.param_scope: Dict[str, SymEnt] = param_scope
+        self.node = None
+        self.expanded: bool = False
+
+    @property
+    def first_line(self) -> int:
+        """Line number of the procedure keyword."""
+        return self.start.line
+
+    @property
+    def last_line(self) -> int:
+        """Line number of the last skipped token."""
+        return self.tokens[-1].line if self.tokens else self.start.line
+
+
+class TokenReplay(object):
+    """Scanner replaying recorded tokens, followed by end of file.
+
+    Chario position follows the replayed tokens, so that errors found on
+    them are reported on their own source line.
+
+    Attributes:
+        chario: A Chario object to report errors through.
+        tokens: A list of Token instances to replay.
+        pos: An int of index of next token to deliver.
+    """
+
+    def __init__(self, tokens: List[token.Token], cio: chario.Chario) -> None:
+        """Init with tokens and Chario instance."""
+        self.chario: chario.Chario = cio
+        self.tokens: List[token.Token] = tokens
+        self.pos: int = 0
+
+    def next_token(self) -> token.Token:
+        """Deliver next recorded token, or end of file token after the last."""
+        if self.pos >= len(self.tokens):
+            eof_tok: token.Token = token.Token("eof", "eof")
+            if self.tokens:
+                last: token.Token = self.tokens[-1]
+                eof_tok.line, eof_tok.column = last.line, last.column + len(last.lit)
+            return eof_tok
+        tok: token.Token = self.tokens[self.pos]
+        self.pos += 1
+        if tok.line > 0 and self.chario.src:
+            self.chario.line = self.chario.src[tok.line - 1]
+            self.chario.line_count = tok.line
+            self.chario.column = tok.column + len(tok.lit)
+        return tok
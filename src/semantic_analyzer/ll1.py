@@ -0,0 +1,516 @@
+"""Table-driven LL(1) parser generated from the TinyAda EBNF grammar.
+
+The grammar is read from the reference document, converted into BNF,
+left-factored until no two alternatives of a nonterminal share a FIRST
+token, and compiled into a parse table. Ll1Parser runs the table with an
+explicit stack, so parsing makes one table lookup per decision and has no
+recursion depth limit.
+
+Every alternative of a rule of the reference grammar is wrapped in a pair
+of action symbols: MARK records where the rule starts and an exit symbol
+"#rule" ends it. These consume no input, so they are transparent to
+FIRST sets and survive left-factoring. At an exit symbol the parser calls
+the semantic action registered for the rule with the values collected
+since its start, which are matched Token instances and results of inner
+actions, and keeps the action result in their place.
+
+Terminals are written as token ids in double quotes, e.g. '"semi"'.
+
+Typical usage example:
+    grammar = Grammar.from_file()
+    ll1_parser = Ll1Parser(grammar, {"assignmentStatement": build_assign})
+    result = ll1_parser.parse(scn_instance)
+"""
+
+
+from typing import Callable, Dict, List, Set, Tuple
+import html
+import os
+import re
+import token
+
+
+# Reference grammar, identical in every chapter of team/ref
+GRAMMAR_FILE: str = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "team", "ref", "7.semantic", "doc",
+    "tinyada.html")
+
+# Rules replacing or added to those of the reference grammar. The second
+# alternative of expression lacks its leading relation in the reference,
+# and the print statement is an extension of this analyzer.
+AMENDMENTS: str = """
+expression = relation { "and" relation } | relation { "or" relation }
+simpleStatement = nullStatement | assignmentStatement
+        | procedureCallStatement | exitStatement | printStatement
+printStatement = "print" "(" expression ")" ";"
+"""
+
+# Grammar names of terminals which are not literals
+NAMED_TERMINALS: Dict[str, str] = {"identifier": "id", "numericLiteral": "int"}
+
+START_RULE: str = "compilation"
+MARK: str = "^"
+EXIT_PREFIX: str = "#"
+
+EBNF_TOKEN_RE = re.compile(r'"[^"]*"|<[^>]*>|[A-Za-z_]\w*|[=\[\]{}()|]')
+
+
+class GrammarError(Exception):
+    """Grammar text cannot be read or refers to unknown symbols."""
+
+
+class Ll1Error(Exception):
+    """Input token is not expected by the parse table.
+
+    Attributes:
+        token: A Token instance which was not expected.
+        rule: A string of reference grammar rule being parsed.
+        expected: A sorted list of strings of expected token ids.
+    """
+
+    def __init__(self, tok: token.Token, rule: str, expected: List[str]) -> None:
+        """Init with offending token, rule and expected token ids."""
+        super().__init__("{} unexpected in {}".format(tok, rule))
+        self.token: token.Token = tok
+        self.rule: str = rule
+        self.expected: List[str] = expected
+
+    def message(self) -> str:
+        """Error message in the style of the recursive descent parser."""
+        if len(self.expected) == 1:
+            return "'{}' expected".format(token.TOK_ID_DICT.get(self.expected[0], self.expected[0]))
+        return "Error for [{}]".format(self.rule)
+
+
+def is_terminal(sym: str) -> bool:
+    """Test if grammar symbol is a terminal."""
+    return sym[0] == '"'
+
+
+def is_action(sym: str) -> bool:
+    """Test if grammar symbol is an action symbol consuming no input."""
+    return sym == MARK or sym[0] == EXIT_PREFIX
+
+
+def read_ebnf(path: str = GRAMMAR_FILE) -> str:
+    """Extract grammar rules from reference HTML document.
+
+    Args:
+        path: A string of filepath to the document.
+
+    Returns:
+        A string of rules, starting with the compilation rule.
+    """
+    with open(path) as in_file:
+        text: str = html.unescape(re.sub(r"<[^>]*>", " ", in_file.read()))
+    found = re.search(r"\b{}\s*=".format(START_RULE), text)
+    if not found:
+        raise GrammarError("No {} rule in {}".format(START_RULE, path))
+    return text[found.start():]
+
+
+def parse_ebnf(text: str) -> Dict[str, List]:
+    """Convert EBNF rules into alternatives of items.
+
+    An item is a symbol string or a pair of bracket and alternatives for
+    "[", "{" and "(" groups. Semantic qualifications in angle brackets
+    are dropped and literals become quoted token ids.
+
+    Args:
+        text: A string of rules in the notation of the reference grammar.
+
+    Returns:
+        A dict mapping rule name to list of alternatives, each a list of items.
+    """
+    toks: List[str] = [t for t in EBNF_TOKEN_RE.findall(text) if t[0] != "<"]
+    starts: List[int] = [
+        i for i in range(len(toks) - 1) if toks[i + 1] == "=" and toks[i][0].isalpha()]
+    rules: Dict[str, List] = dict()
+    for n, i in enumerate(starts):
+        body: List[str] = toks[i + 2:starts[n + 1] if n + 1 < len(starts) else len(toks)]
+        body.reverse()  # Consumed from the end
+        rules[toks[i]] = _ebnf_alternatives(body, None)
+        if body:
+            raise GrammarError("Unbalanced brackets in rule {}".format(toks[i]))
+    return rules
+
+
+CLOSING: Dict[str, str] = {"[": "]", "{": "}", "(": ")"}
+
+
+def _ebnf_alternatives(body: List[str], closing: str) -> List:
+    """Read alternatives from reversed token list up to closing bracket."""
+    alts: List = [[]]
+    while body and body[-1] != closing:
+        tok: str = body.pop()
+        if tok == "|":
+            alts.append([])
+        elif tok in CLOSING:
+            alts[-1].append((tok, _ebnf_alternatives(body, CLOSING[tok])))
+            if not body:
+                raise GrammarError("'{}' expected".format(CLOSING[tok]))
+            body.pop()
+        elif tok in CLOSING.values() or tok == "=":
+            raise GrammarError("Unexpected '{}'".format(tok))
+        elif tok[0] == '"':
+            lit: str = tok[1:-1].strip()
+            if lit not in token.LIT_DICT:
+                raise GrammarError("Unknown literal {}".format(tok))
+            alts[-1].append('"{}"'.format(token.LIT_DICT[lit]))
+        elif tok in NAMED_TERMINALS:
+            alts[-1].append('"{}"'.format(NAMED_TERMINALS[tok]))
+        else:
+            alts[-1].append(tok)
+    return alts
+
+
+class Grammar(object):
+    """BNF grammar with FIRST and FOLLOW sets and LL(1) table construction.
+
+    Attributes:
+        rules: A dict mapping nonterminal to list of alternatives, each a
+            tuple of symbols.
+        origin: A dict mapping nonterminal to reference grammar rule it
+            was derived from.
+        start: A string of start nonterminal.
+        nullable: A set of nullable nonterminals.
+        first: A dict mapping nonterminal to set of FIRST terminals.
+        follow: A dict mapping nonterminal to set of FOLLOW terminals.
+        conflicts: A list of (nonterminal, terminal) pairs which left
+            factoring could not resolve, decided for the earliest
+            alternative with the terminal in its FIRST set.
+    """
+
+    def __init__(self, ebnf: Dict[str, List], start: str = START_RULE) -> None:
+        """Init with EBNF rules from parse_ebnf and start rule name."""
+        self.rules: Dict[str, List[Tuple[str, ...]]] = dict()
+        self.origin: Dict[str, str] = dict()
+        self.start: str = start
+        self.nullable: Set[str] = set()
+        self.first: Dict[str, Set[str]] = dict()
+        self.follow: Dict[str, Set[str]] = dict()
+        self.conflicts: List[Tuple[str, str]] = list()
+        self.__counts: Dict[str, int] = dict()
+        self.__stuck: Set[Tuple] = set()
+        for name, alts in ebnf.items():
+            self.origin[name] = name
+            self.rules[name] = [
+                (MARK,) + self.__bnf_seq(name, alt) + (EXIT_PREFIX + name,) for alt in alts]
+        for name, alts in self.rules.items():
+            for alt in alts:
+                for sym in alt:
+                    if not (is_terminal(sym) or is_action(sym) or sym in self.rules):
+                        raise GrammarError("Undefined rule {} in {}".format(sym, name))
+        if start not in self.rules:
+            raise GrammarError("Undefined start rule {}".format(start))
+        self.left_factor()
+
+    @classmethod
+    def from_file(cls, path: str = GRAMMAR_FILE, amendments: str = AMENDMENTS) -> "Grammar":
+        """Read reference grammar and apply amendments.
+
+        Args:
+            path: A string of filepath to the reference document.
+            amendments: A string of rules replacing or adding to those read.
+        """
+        ebnf: Dict[str, List] = parse_ebnf(read_ebnf(path))
+        ebnf.update(parse_ebnf(amendments))
+        return cls(ebnf)
+
+    def __new_name(self, base: str) -> str:
+        """Create nonterminal name derived from rule base."""
+        base = self.origin.get(base, base)
+        self.__counts[base] = self.__counts.get(base, 0) + 1
+        name: str = "{}_{}".format(base, self.__counts[base])
+        self.origin[name] = base
+        return name
+
+    def __bnf_seq(self, owner: str, seq: List) -> Tuple[str, ...]:
+        """Convert EBNF sequence into symbols, adding helper nonterminals."""
+        syms: List[str] = list()
+        for item in seq:
+            if isinstance(item, str):
+                syms.append(item)
+                continue
+            bracket, alts = item
+            helper: str = self.__new_name(owner)
+            bodies: List[Tuple[str, ...]] = [self.__bnf_seq(owner, alt) for alt in alts]
+            if bracket == "{":
+                bodies = [body + (helper,) for body in bodies]
+            if bracket != "(":
+                bodies.append(())
+            self.rules[helper] = bodies
+            syms.append(helper)
+        return tuple(syms)
+
+    def first_of(self, seq: Tuple[str, ...]) -> Tuple[Set[str], bool]:
+        """FIRST set of symbol sequence and whether it is nullable."""
+        result: Set[str] = set()
+        for sym in seq:
+            if is_terminal(sym):
+                result.add(sym)
+                return result, False
+            if is_action(sym):
+                continue
+            result |= self.first[sym]
+            if sym not in self.nullable:
+                return result, False
+        return result, True
+
+    def compute_sets(self) -> None:
+        """Compute nullable, FIRST and FOLLOW sets by fixed-point iteration."""
+        self.nullable = set()
+        self.first = {name: set() for name in self.rules}
+        self.follow = {name: set() for name in self.rules}
+        self.follow[self.start].add('"eof"')
+        changed: bool = True
+        while changed:
+            changed = False
+            for name, alts in self.rules.items():
+                for alt in alts:
+                    first, nullable = self.first_of(alt)
+                    if not first <= self.first[name]:
+                        self.first[name] |= first
+                        changed = True
+                    if nullable and name not in self.nullable:
+                        self.nullable.add(name)
+                        changed = True
+        changed = True
+        while changed:
+            changed = False
+            for name, alts in self.rules.items():
+                for alt in alts:
+                    for i, sym in enumerate(alt):
+                        if is_terminal(sym) or is_action(sym):
+                            continue
+                        first, nullable = self.first_of(alt[i + 1:])
+                        if nullable:
+                            first = first | self.follow[name]
+                        if not first <= self.follow[sym]:
+                            self.follow[sym] |= first
+                            changed = True
+
+    def predict(self, name: str, alt: Tuple[str, ...]) -> Set[str]:
+        """Terminals selecting alternative of nonterminal."""
+        first, nullable = self.first_of(alt)
+        return first | self.follow[name] if nullable else first
+
+    def left_factor(self, max_rounds: int = 200) -> None:
+        """Remove FIRST/FIRST conflicts by inlining and left factoring.
+
+        Alternatives sharing a FIRST terminal, or both nullable, are
+        factored on their common prefix. If they start with different
+        symbols, leading nonterminals are inlined first, which also lifts
+        common prefixes out of rules such as objectDeclaration and
+        numberDeclaration. Unreachable nonterminals are dropped at the end.
+
+        Args:
+            max_rounds: An int of transformations to try before giving up.
+        """
+        for _ in range(max_rounds):
+            self.compute_sets()
+            found = self.__first_conflict()
+            if not found:
+                break
+            name, i, j = found
+            alts: List[Tuple[str, ...]] = self.rules[name]
+            if alts[i] and alts[j] and alts[i][0] == alts[j][0]:
+                self.__factor(name, alts[i][0])
+            else:
+                self.__inline(name, i, j)
+        reachable: Set[str] = {self.start}
+        pending: List[str] = [self.start]
+        while pending:
+            for alt in self.rules[pending.pop()]:
+                for sym in alt:
+                    if sym in self.rules and sym not in reachable:
+                        reachable.add(sym)
+                        pending.append(sym)
+        self.rules = {name: alts for name, alts in self.rules.items() if name in reachable}
+        self.compute_sets()
+
+    def __first_conflict(self) -> Tuple[str, int, int]:
+        """Find alternatives of one nonterminal with common FIRST terminals or both nullable."""
+        for name, alts in self.rules.items():
+            firsts: List[Tuple[Set[str], bool]] = [self.first_of(alt) for alt in alts]
+            for i in range(len(alts)):
+                for j in range(i + 1, len(alts)):
+                    clash: bool = bool(firsts[i][0] & firsts[j][0]) or firsts[i][1] and firsts[j][1]
+                    if clash and (name, alts[i], alts[j]) not in self.__stuck:
+                        return name, i, j
+        return None
+
+    def __inline(self, name: str, i: int, j: int) -> None:
+        """Replace leading nonterminals of alternatives i and j by their bodies."""
+        alts: List[Tuple[str, ...]] = self.rules[name]
+        new_alts: List[Tuple[str, ...]] = list()
+        inlined: bool = False
+        for k, alt in enumerate(alts):
+            if k in (i, j) and alt and alt[0] in self.rules and alt[0] != name:
+                new_alts.extend(body + alt[1:] for body in self.rules[alt[0]])
+                inlined = True
+            else:
+                new_alts.append(alt)
+        if inlined:
+            self.rules[name] = _unique(new_alts)
+        else:  # Left to build_table
+            self.__stuck.add((name, alts[i], alts[j]))
+
+    def __factor(self, name: str, head: str) -> None:
+        """Factor longest common prefix of alternatives starting with head."""
+        alts: List[Tuple[str, ...]] = self.rules[name]
+        group: List[Tuple[str, ...]] = [alt for alt in alts if alt and alt[0] == head]
+        size: int = 1
+        while all(len(alt) > size and alt[size] == group[0][size] for alt in group):
+            size += 1
+        tail: str = self.__new_name(name)
+        self.rules[tail] = _unique([alt[size:] for alt in group])
+        pos: int = alts.index(group[0])
+        rest: List[Tuple[str, ...]] = [alt for alt in alts if not (alt and alt[0] == head)]
+        rest.insert(pos, group[0][:size] + (tail,))
+        self.rules[name] = rest
+
+    def build_table(self) -> Dict[str, Dict[str, Tuple[str, ...]]]:
+        """Build parse table mapping nonterminal and terminal to alternative.
+
+        Remaining conflicts are decided for the alternative having the
+        terminal in its FIRST set, the earliest one among equals, which
+        binds optional parts greedily, e.g. an indexed component to the
+        name before it rather than to a following parameter list.
+
+        Returns:
+            A dict mapping nonterminal to dict mapping terminal to alternative.
+        """
+        self.compute_sets()
+        self.conflicts = list()
+        table: Dict[str, Dict[str, Tuple[str, ...]]] = dict()
+        for name, alts in self.rules.items():
+            row: Dict[str, Tuple[str, ...]] = dict()
+            owner: Dict[str, bool] = dict()  # Terminal to whether decided by FIRST
+            for alt in alts:
+                first, nullable = self.first_of(alt)
+                for term in self.predict(name, alt):
+                    by_first: bool = term in first
+                    if term in row:
+                        if row[term] != alt:
+                            self.conflicts.append((name, term))
+                        if owner[term] or not by_first:
+                            continue
+                    row[term] = alt
+                    owner[term] = by_first
+            table[name] = row
+        return table
+
+    def __str__(self) -> str:
+        """Convert rules into BNF text."""
+        return "\n".join(
+            "{} = {}".format(name, " | ".join(" ".join(alt) if alt else "()" for alt in alts))
+            for name, alts in self.rules.items())
+
+
+def _unique(alts: List[Tuple[str, ...]]) -> List[Tuple[str, ...]]:
+    """Remove duplicate alternatives keeping order."""
+    return list(dict.fromkeys(alts))
+
+
+class Ll1Parser(object):
+    """Non-recursive LL(1) parser driven by a compiled parse table.
+
+    Grammar symbols are compiled once: terminals to token id strings,
+    nonterminals to non-negative row indexes, MARK to -1 and exit symbols
+    to -2 - rule index. Alternatives are kept reversed, ready to be pushed.
+
+    Attributes:
+        grammar: A Grammar instance compiled.
+        actions: A dict mapping rule name to callable receiving the list
+            of values of the rule and returning its value.
+        rows: A list of dicts mapping token id to reversed alternative.
+        row_names: A list of strings of nonterminal names of rows.
+        exit_names: A list of strings of rule names of exit symbols.
+    """
+
+    def __init__(self, grammar: Grammar, actions: Dict[str, Callable[[List], object]] = None) -> None:
+        """Init with grammar and optional semantic actions."""
+        self.grammar: Grammar = grammar
+        self.actions: Dict[str, Callable[[List], object]] = actions if actions else dict()
+        table: Dict[str, Dict[str, Tuple[str, ...]]] = grammar.build_table()
+        self.row_names: List[str] = list(table)
+        self.exit_names: List[str] = sorted(set(grammar.origin.values()))
+        row_ids: Dict[str, int] = {name: i for i, name in enumerate(self.row_names)}
+        exit_ids: Dict[str, int] = {EXIT_PREFIX + name: -2 - i for i, name in enumerate(self.exit_names)}
+
+        def compile_sym(sym: str):
+            if is_terminal(sym):
+                return sym[1:-1]
+            if sym == MARK:
+                return -1
+            return exit_ids[sym] if sym[0] == EXIT_PREFIX else row_ids[sym]
+
+        self.rows: List[Dict[str, Tuple]] = [
+            {term[1:-1]: tuple(compile_sym(s) for s in reversed(alt)) for term, alt in table[name].items()}
+            for name in self.row_names]
+        self.__start: int = row_ids[grammar.start]
+
+    def parse(self, scn) -> object:
+        """Parse token stream up to end of file.
+
+        Values are collected only if actions are registered.
+
+        Args:
+            scn: A Scanner instance, or any object with next_token method.
+
+        Returns:
+            Value of the start rule action, or None.
+
+        Raises:
+            Ll1Error: A token is not expected.
+        """
+        rows: List[Dict[str, Tuple]] = self.rows
+        collect: bool = bool(self.actions)
+        actions: List[Callable] = [self.actions.get(name) for name in self.exit_names]
+        values: List = list()
+        marks: List[int] = list()
+        stack: List = [self.__start]
+        tok: token.Token = scn.next_token()
+        while stack:
+            sym = stack.pop()
+            if type(sym) is str:
+                if tok.tok_id != sym:
+                    raise Ll1Error(tok, self.__rule_of(stack), [sym])
+                if collect:
+                    values.append(tok)
+                tok = scn.next_token()
+            elif sym >= 0:
+                alt: Tuple = rows[sym].get(tok.tok_id)
+                if alt is None:
+                    raise Ll1Error(tok, self.grammar.origin[self.row_names[sym]], sorted(rows[sym]))
+                stack.extend(alt)
+            elif not collect:
+                continue
+            elif sym == -1:
+                marks.append(len(values))
+            else:
+                start: int = marks.pop()
+                action: Callable = actions[-2 - sym]
+                if action:
+                    args: List = values[start:]
+                    del values[start:]
+                    values.append(action(args))
+        if tok.tok_id != "eof":
+            raise Ll1Error(tok, START_RULE, ["eof"])
+        return values[-1] if collect and values else None
+
+    def __rule_of(self, stack: List) -> str:
+        """Rule name of innermost pending exit symbol."""
+        for sym in reversed(stack):
+            if type(sym) is int and sym <= -2:
+                return self.exit_names[-2 - sym]
+        return START_RULE
+
+
+if __name__ == '__main__':
+    cur_grammar: Grammar = Grammar.from_file()
+    cur_grammar.build_table()
+    print(cur_grammar)
+    print("{} nonterminals, conflicts: {}".format(
+        len(cur_grammar.rules), ", ".join("{} on {}".format(*c) for c in cur_grammar.conflicts) or "none"))
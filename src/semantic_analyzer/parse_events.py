@@ -0,0 +1,167 @@
+"""EventBuilder delivering a stream of parse events instead of a tree.
+
+Events are reported the moment the parser recognizes a construct, and
+nothing is kept once delivered, so a consumer such as an indexer runs in
+memory independent of program size, apart from the source lines held by
+Chario and the symbols of open scopes.
+
+    enter_proc: Procedure name declared, its parameters and body follow.
+    declare: Identifier declared, role is param, var, const or type.
+    assign: Assignment to a name, None if undeclared.
+    call: Procedure call.
+    exit_scope: End of procedure body.
+
+Events arrive through a callback, or are pulled from parse_events, which
+runs the parser in a thread feeding a bounded queue. Deferred bodies of
+lazy mode report their contents only when expanded.
+
+The parser should run without flow analysis, since the control-flow
+graph of a procedure grows with its body until the body ends. Variables
+are then never constant, so prints of variables are reported as errors.
+
+Typical usage example:
+    new_parser = Parser(cio_instance, scn_instance, builder=EventBuilder(print), flow_analysis=False)
+    new_parser.compilation()
+    for event in parse_events(cio_instance, scn_instance):
+        if event.kind == "declare":
+            print(event.name, event.role, event.line)
+"""
+
+
+from typing import Callable, Iterator, NamedTuple
+import queue
+import threading
+import chario
+import parser7
+import scanner
+from tree_builder import TreeBuilder
+
+
+class ParseEvent(NamedTuple):
+    """Structural event of the source program.
+
+    Attributes:
+        kind: A string of event kind, such as enter_proc or declare.
+        name: A string of identifier name, None if not known.
+        role: A string of identifier role for declare and enter_proc events.
+        line: An int of line number of the construct.
+    """
+
+    kind: str
+    name: str
+    role: str
+    line: int
+
+    def __str__(self) -> str:
+        """Convert event into single line of kind, name, role and line."""
+        return "{} {}{} line {}".format(
+            self.kind, self.name or "?", " " + self.role if self.role else "", self.line)
+
+
+class EventBuilder(TreeBuilder):
+    """Builder emitting ParseEvent tuples and building nothing.
+
+    Names are returned as their SymbolEntry, so that assignments can tell
+    their target; any other construct yields None.
+
+    Attributes:
+        emit: A callable receiving each ParseEvent.
+    """
+
+    def __init__(self, emit: Callable[[ParseEvent], None]) -> None:
+        """Init with callable receiving events."""
+        self.emit: Callable[[ParseEvent], None] = emit
+
+    def __declare(self, start, group, role: str) -> None:
+        for sym_ent in group:
+            self.emit(ParseEvent("declare", sym_ent.name, role, start.line))
+
+    def enter_subprogram(self, start, sym_ent):
+        self.emit(ParseEvent("enter_proc", sym_ent.name if sym_ent else None, "proc", start.line))
+
+    def subprogram_body(self, start, end, sym_ent, params, decls, stmts):
+        self.emit(ParseEvent("exit_scope", sym_ent.name if sym_ent else None, None, end.line))
+
+    def param_spec(self, start, end, group, mode, type_node):
+        self.__declare(start, group, "param")
+
+    def object_decl(self, start, end, group, type_node):
+        self.__declare(start, group, "var")
+
+    def number_decl(self, start, end, group, value):
+        self.__declare(start, group, "const")
+
+    def type_decl(self, start, end, sym_ent, type_node):
+        if sym_ent:
+            self.emit(ParseEvent("declare", sym_ent.name, "type", start.line))
+
+    def enum_def(self, start, end, group):
+        self.__declare(start, group, "const")
+
+    def assign_stmt(self, start, end, target, value):
+        self.emit(ParseEvent("assign", target.name if target else None, None, start.line))
+
+    def call_stmt(self, start, end, sym_ent, args):
+        self.emit(ParseEvent("call", sym_ent.name if sym_ent else None, None, start.line))
+
+    def name(self, start, end, sym_ent, args):
+        return sym_ent
+
+
+class _Stopped(Exception):
+    """Consumer of parse_events has gone, parsing is abandoned."""
+
+
+def parse_events(cio: chario.Chario, scn: scanner.Scanner, max_errors: int = None,
+                 queue_size: int = 1024) -> Iterator[ParseEvent]:
+    """Run compilation in a thread and yield its events as they come.
+
+    The parser waits while queue_size events are pending, and stops once
+    the generator is closed. An exception of the parser is raised here.
+    It runs without flow analysis, as told in the module docstring.
+
+    Args:
+        cio: A Chario instance of source program.
+        scn: A Scanner instance reading from cio.
+        max_errors: An int of error count to abandon compilation at.
+        queue_size: An int of most events pending.
+
+    Yields:
+        ParseEvent tuples in source order.
+    """
+    events: queue.Queue = queue.Queue(queue_size)
+    stop: threading.Event = threading.Event()
+    done: object = object()
+
+    def put(event: ParseEvent) -> None:
+        if stop.is_set():
+            raise _Stopped()
+        events.put(event)
+
+    def run() -> None:
+        try:
+            parser7.Parser(cio, scn, max_errors, EventBuilder(put), keep_graphs=False,
+                           flow_analysis=False).compilation()
+        except _Stopped:
+            pass
+        except Exception as err:
+            events.put(err)
+        finally:
+            events.put(done)
+
+    thread: threading.Thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    finished: bool = False
+    try:
+        while not finished:
+            item = events.get()
+            finished = item is done
+            if isinstance(item, Exception):
+                raise item
+            if not finished:
+                yield item
+    finally:
+        stop.set()
+        while not finished:  # Unblock parser until it gives up
+            finished = events.get() is done
+        thread.join()
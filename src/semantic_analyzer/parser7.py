@@ -6,12 +6,27 @@ Typical usage example:
 """
 
 
-from typing import Set
+from typing import Callable, Dict, List, Set, Tuple
+import itertools
+import operator
+import time
 import chario
 import scanner
 import token
-from symbol_entry import SymbolEntry as SymEnt
+from chario import ErrorLimitError
+from symbol_entry import (
+    R_CONST, R_NONE, R_PARAM, R_PROC, R_TYPE, R_VAR, Signature, SymbolEntry as SymEnt, SymbolGroup, Value,
+    format_value)
 from symbol_table import SymbolTable as SymTab
+from tree_builder import TreeBuilder
+from type_descriptor import (
+    ARRAY, BOOL_TYPE, CHAR_TYPE, INT_TYPE, NO_TYPE, SubrangeDescriptor, TypeDescriptor, TypeTable, value_type)
+from lazy_body import BodySkipper, LazyBody, TokenReplay, outer_names
+from xref import CALL, END, READ, WRITE, XrefIndex
+from snapshot import SnapshotStore
+from analysis_stats import AnalysisStats
+from cfg import ASSIGN, KILL, PRINT, ControlFlowGraph
+from constprop import ConstantPropagator
 
 
 ADD_OP_SET: Set[str] = {"plus", "minus"}
@@ -19,8 +34,197 @@ MUL_OP_SET: Set[str] = {"mul", "div", "mod"}
 REL_OP_SET: Set[str] = {"eq", "ne", "lt", "le", "gt", "ge"}
 DEC_OP_SET: Set[str] = {"type", "proc", "id"}
 STM_OP_SET: Set[str] = {"loop", "while", "exit", "if", "null", "id", "print"}
-L_NAME_SET: Set[str] = {"param", "var"}
-R_NAME_SET: Set[str] = {"param", "var", "const"}
+L_NAME_ROLES: int = R_PARAM | R_VAR
+R_NAME_ROLES: int = R_PARAM | R_VAR | R_CONST
+
+# Call argument as (SymbolEntry of the name it consists of alone, None
+# otherwise; its TypeDescriptor; Token it starts with)
+Actual = Tuple[SymEnt, TypeDescriptor, token.Token]
+
+# Operator precedence levels, from loosest to tightest binding.
+LOGIC_PREC: int = 1
+REL_PREC: int = 2
+ADD_PREC: int = 3
+MUL_PREC: int = 4
+EXP_PREC: int = 5
+NOT_PREC: int = 6
+
+# BIN_OP_PREC maps binary operator token id to precedence level.
+BIN_OP_PREC: Dict[str, int] = {"and": LOGIC_PREC, "or": LOGIC_PREC, "exp": EXP_PREC}
+BIN_OP_PREC.update(dict.fromkeys(REL_OP_SET, REL_PREC))
+BIN_OP_PREC.update(dict.fromkeys(ADD_OP_SET, ADD_PREC))
+BIN_OP_PREC.update(dict.fromkeys(MUL_OP_SET, MUL_PREC))
+
+# OP_PREC additionally covers unary operators. Signs bind like adding
+# operators, so "-2 * 3" is "-(2 * 3)", while "not" applies to a primary.
+UNARY_OP_SET: Set[str] = {"neg", "pos", "not"}
+OP_PREC: Dict[str, int] = {"neg": ADD_PREC, "pos": ADD_PREC, "not": NOT_PREC}
+OP_PREC.update(BIN_OP_PREC)
+
+# FOLD_FUNCS maps arithmetic operator token id to folding function.
+# Division truncates toward zero and mod takes the sign of the divisor, as in Ada.
+FOLD_FUNCS: Dict[str, Callable[[int, int], int]] = {
+    "plus": operator.add, "minus": operator.sub, "mul": operator.mul,
+    "div": lambda a, b: -(-a // b) if (a < 0) != (b < 0) else a // b,
+    "mod": operator.mod, "exp": operator.pow}
+
+# REL_FUNCS maps relational operator token id to comparison function.
+REL_FUNCS: Dict[str, Callable[[object, object], bool]] = {
+    "eq": operator.eq, "ne": operator.ne, "lt": operator.lt,
+    "le": operator.le, "gt": operator.gt, "ge": operator.ge}
+
+# Synchronizing sets for panic-mode error recovery, taken from FOLLOW sets.
+DEC_SYNC_SET: Set[str] = {"semi", "type", "proc", "begin", "eof"}
+STM_SYNC_SET: Set[str] = (STM_OP_SET - {"id"}) | {"semi", "end", "elsif", "else", "eof"}
+SPEC_SYNC_SET: Set[str] = {"is", "type", "proc", "begin", "eof"}
+CON_SYNC_SET: Set[str] = {"then", "loop", "semi", "end", "eof"}
+
+# Defaults bounding the cost of constant folding: signed bit length of
+# constants, and seconds spent on folds once the length exceeds FOLD_TIMED_BITS.
+# MAX_CONST_BITS_LIMIT is the largest bit length accepted, single folds of
+# longer constants taking seconds.
+MAX_CONST_BITS: int = 64
+MAX_CONST_BITS_LIMIT: int = 1 << 20
+FOLD_BUDGET: float = 1.0
+FOLD_TIMED_BITS: int = 4096
+
+
+class ParseError(Exception):
+    """Syntax error which has been reported and awaits recovery."""
+
+
+class ConstantOverflowError(Exception):
+    """Folded constant does not fit into the allowed bit length."""
+
+
+def check_range(val: int, max_bits: int, negated: bool = False) -> int:
+    """Return val if it fits into max_bits signed bits, else raise ConstantOverflowError.
+
+    A value to be negated next may be the magnitude of the lowest value,
+    which only fits once negated.
+    """
+    if max_bits and (val if val >= 0 or negated else -val - 1).bit_length() > max_bits - 1:
+        if not (negated and val == 1 << (max_bits - 1)):
+            raise ConstantOverflowError()
+    return val
+
+
+def fold_unary(op: str, val: Value, max_bits: int = None) -> Value:
+    """Fold unary operator over constant operand.
+
+    Args:
+        op: A string of unary operator, one of UNARY_OP_SET.
+        val: An int or bool of operand value, None if not constant.
+        max_bits: An int of signed bit length of ints, None for no limit.
+
+    Returns:
+        An int or bool of folded value, None if not constant.
+
+    Raises:
+        ConstantOverflowError: Result exceeds max_bits.
+    """
+    if op == "not":
+        return (not val) if type(val) is bool else None
+    if type(val) is not int:
+        return None
+    return check_range(-val, max_bits) if op == "neg" else val
+
+
+def fold_binary(op: str, val1: Value, val2: Value, max_bits: int = None, negated: bool = False) -> Value:
+    """Fold binary operator over constant operands.
+
+    Arithmetic operators take ints, logical operators take bools and
+    relational operators take two values of the same type. Products and
+    powers sure to exceed max_bits are rejected before being computed.
+
+    Args:
+        op: A string of binary operator token id.
+        val1: An int or bool of left operand value, None if not constant.
+        val2: An int or bool of right operand value, None if not constant.
+        max_bits: An int of signed bit length of ints, None for no limit.
+        negated: A bool indicating if the result is negated next, as in
+            check_range.
+
+    Returns:
+        An int or bool of folded value, None if not constant.
+
+    Raises:
+        ConstantOverflowError: Result exceeds max_bits.
+    """
+    if val1 is None or val2 is None or type(val1) is not type(val2):
+        return None
+    if op in REL_FUNCS:
+        return REL_FUNCS[op](val1, val2)
+    if type(val1) is bool:
+        if op == "and":
+            return val1 and val2
+        return (val1 or val2) if op == "or" else None
+    func: Callable[[int, int], int] = FOLD_FUNCS.get(op)
+    if not func or op in ("div", "mod") and val2 == 0 or op == "exp" and val2 < 0:
+        return None
+    if max_bits:  # Lower bounds of result bit length
+        bits1: int = abs(val1).bit_length()
+        if op == "mul" and val2 and bits1 + abs(val2).bit_length() - 1 > max_bits:
+            raise ConstantOverflowError()
+        if op == "exp" and bits1 > 1 and (bits1 - 1) * val2 + 1 > max_bits:
+            raise ConstantOverflowError()
+    return check_range(func(val1, val2), max_bits, negated)
+
+
+def _root_type(type_desc: TypeDescriptor) -> TypeDescriptor:
+    """Type a subrange is taken from, the type itself otherwise."""
+    return type_desc.super_type if isinstance(type_desc, SubrangeDescriptor) else type_desc
+
+
+class _ExprFrame(object):
+    """Operator and operand stacks of one expression level in __climb.
+
+    Attributes:
+        floor: An int of lowest precedence accepted in this frame.
+        start: A Token instance of indexed name, None unless indexed.
+        sym_ent: A SymbolEntry instance of indexed name.
+        args: A list of nodes of completed indexed component expressions.
+        ops: A list of strings of pending operators.
+        op_toks: A list of Token instances of pending operators.
+        vals: A list of operand values, None where not constant.
+        nodes: A list of nodes of operands.
+        logic: A string of logical operator used in this frame.
+        has_rel: A bool indicating if current relation has an operator.
+        target: A SymbolEntry instance of name the expression consists of
+            alone, None otherwise.
+        target_type: A TypeDescriptor of that name, of elements if indexed.
+        mark: An int of length of expression code when indexed name was
+            found, its arguments being dropped from code after it.
+    """
+
+    __slots__ = ("floor", "start", "sym_ent", "args", "ops", "op_toks", "vals", "nodes",
+                 "logic", "has_rel", "target", "target_type", "mark")
+
+    def __init__(self, floor: int, start: token.Token = None, sym_ent: SymEnt = None, mark: int = 0) -> None:
+        """Init with precedence floor and optional indexed name."""
+        self.floor: int = floor
+        self.start: token.Token = start
+        self.sym_ent: SymEnt = sym_ent
+        self.mark: int = mark
+        self.args: List = list()
+        self.ops: List[str] = list()
+        self.op_toks: List[token.Token] = list()
+        self.vals: List[Value] = list()
+        self.nodes: List = list()
+        self.logic: str = None
+        self.has_rel: bool = False
+        self.target: SymEnt = None
+        self.target_type: TypeDescriptor = NO_TYPE
+
+    def reset(self) -> None:
+        """Clear state for next expression of indexed component."""
+        self.ops.clear()
+        self.op_toks.clear()
+        self.vals.clear()
+        self.nodes.clear()
+        self.logic = None
+        self.has_rel = False
+        self.target = None
 
 
 class Parser(object):
@@ -28,31 +232,154 @@ class Parser(object):
 
     Capable of detecting syntax, lexical or static semantic errors.
     Capable of simple integer arithmetic.
+    Recovers from syntax errors in panic mode, so that every independent
+    error is reported in a single run.
 
     Attributes:
         chario: A Chario object to read source program and deliver errors.
         scanner: A Scanner object to receive source program tokens.
         token: A Token object to be evaluated.
+        last_token: A Token object consumed last.
+        max_errors: An int of error count to abandon compilation at.
+        builder: A TreeBuilder object receiving recognized constructs.
+        tree: Root node built by builder after compilation.
+        max_const_bits: An int of signed bit length of constants.
+        fold_budget: A float of seconds allowed for folding large constants.
+        fold_time: A float of seconds spent folding large constants.
+        types: A TypeTable instance interning structural types.
+        expr_name: A SymbolEntry instance of name the last expression
+            consisted of alone, None otherwise; an entry outside of symbol
+            table if the name is undeclared.
+        expr_type: A TypeDescriptor of the last expression, NO_TYPE if not known.
+        expr_code: A list of postfix code of the last expression, as in
+            ControlFlowGraph instructions.
+        flow: A ControlFlowGraph instance of procedure body being parsed.
+        graphs: A dict mapping SymbolEntry of each procedure analyzed to
+            its closed ControlFlowGraph, in order of completion, if
+            keep_graphs.
+        keep_graphs: A bool indicating if graphs are kept once solved.
+        flow_analysis: A bool indicating if constants are propagated over
+            control-flow graphs, else variables are never constant.
+        propagator: A ConstantPropagator instance solving flow.
+        writes: A dict mapping SymbolEntry of procedure analyzed or
+            deferred to a set of SymbolEntry of variables and parameters
+            declared outside of it which it may change, None if not known.
+        tables: A dict mapping rule name to its dispatch table, which maps
+            first token id to the bound method parsing the production.
+        dec_table: Dispatch table of basic_declaration.
+        stm_table: Dispatch table of statement.
+        type_table: Dispatch table of type_definition.
+        index_table: Dispatch table of index.
+        lazy: A bool indicating if nested procedure bodies are deferred.
+        lazy_bodies: A list of LazyBody instances deferred so far.
+        xref: An XrefIndex instance recording definitions and uses, None
+            if not wanted.
+        snapshots: A SnapshotStore instance to restore and save leading
+            declarations of outermost procedure, None if not wanted.
     """
 
-    def __init__(self, new_cio: chario.Chario, new_scn: scanner.Scanner):
-        """Init with Chario and Scanner instances.
+    def __init__(self, new_cio: chario.Chario, new_scn: scanner.Scanner, max_errors: int = None,
+                 builder: TreeBuilder = None, max_const_bits: int = MAX_CONST_BITS,
+                 fold_budget: float = FOLD_BUDGET, lazy: bool = False, xref: XrefIndex = None,
+                 snapshots: SnapshotStore = None, stats: AnalysisStats = None, keep_graphs: bool = False,
+                 flow_analysis: bool = True):
+        """Init with Chario and Scanner instances, optional error limit and builder.
 
+        Constant folding is bounded by max_const_bits and fold_budget. In
+        lazy mode nested procedure bodies are analyzed only by expand.
+        Definitions and uses of identifiers are recorded into xref if given.
+        Leading declarations of outermost procedure are shared through
+        snapshots if given, unless verbose, with xref, or building a tree.
+        Scanner and symbol table are measured by stats if given, from the
+        first token on. Control-flow graphs are kept in graphs only if
+        keep_graphs, and dropped once solved otherwise. Without
+        flow_analysis no graphs are built, only named constants are folded,
+        and every print is done where it stands, reached or not, so that
+        prints of variables are errors.
         Additionally init symbol table and add default symbols.
         """
         self.chario: chario.Chario = new_cio
         self.scanner: scanner.Scanner = new_scn
-        self.token: token.Token = self.scanner.next_token()
+        self.max_errors: int = max_errors
+        self.max_const_bits: int = max_const_bits
+        self.fold_budget: float = fold_budget
+        self.fold_time: float = 0.0
+        self.lazy: bool = lazy
+        self.lazy_bodies: List[LazyBody] = list()
+        self.xref: XrefIndex = xref
+        self.snapshots: SnapshotStore = snapshots
+        self.builder: TreeBuilder = builder if builder else TreeBuilder()
+        self.tree = None
+        self.last_token: token.Token = None
         self.table = SymTab(self.chario)
+        if stats:
+            stats.attach(self.scanner, self.table)
+        self.token: token.Token = self.scanner.next_token()
+        self.chario.max_errors = max_errors  # Set after first token, so that init never raises
+        self.err_token: token.Token = None
+        self.types: TypeTable = TypeTable()
+        self.expr_name: SymEnt = None
+        self.expr_type: TypeDescriptor = NO_TYPE
+        self.expr_code: List = list()
+        self.flow: ControlFlowGraph = None
+        self.graphs: Dict[SymEnt, ControlFlowGraph] = dict()
+        self.keep_graphs: bool = keep_graphs
+        self.flow_analysis: bool = flow_analysis
+        self.propagator: ConstantPropagator = None
+        self.writes: Dict[SymEnt, Set[SymEnt]] = dict()
+        self.__proc_writes: Set[SymEnt] = None
+        self.__prints: List[Tuple[int, List, Value, Tuple[str, int, int]]] = list()
         self.table.enter_scope()
-        self.__enter_symbol("type", "boolean")
-        self.__enter_symbol("type", "char")
-        self.__enter_symbol("type", "integer")
-        self.__enter_symbol("const", "true").set_value("true")
-        self.__enter_symbol("const", "false").set_value("false")
+        self.__enter_symbol(R_TYPE, "boolean").set_type(BOOL_TYPE)
+        self.__enter_symbol(R_TYPE, "char").set_type(CHAR_TYPE)
+        self.__enter_symbol(R_TYPE, "integer").set_type(INT_TYPE)
+        for name, val in (("true", True), ("false", False)):
+            sym_ent: SymEnt = self.__enter_symbol(R_CONST, name)
+            sym_ent.set_value(val)
+            sym_ent.set_type(BOOL_TYPE)
+        self.dec_table: Dict[str, Callable] = {
+            "type": self.__type_declaration,
+            "proc": self.__subprogram_body,
+            "id": self.__obj_num_declaration}
+        self.stm_table: Dict[str, Callable] = {
+            "id": self.__assign_call_statement,
+            "exit": self.__exit_statement,
+            "if": self.__if_statement,
+            "null": self.__null_statement,
+            "while": self.__loop_statement,
+            "loop": self.__loop_statement,
+            "print": self.__print_statement}
+        self.type_table: Dict[str, Callable] = {
+            "l_par": self.__enum_type_definition,
+            "array": self.__array_type_definition,
+            "range": self.__range,
+            "id": self.__type_name}
+        self.index_table: Dict[str, Callable] = {
+            "range": self.__range,
+            "id": self.__type_name}
+        self.tables: Dict[str, Dict[str, Callable]] = {
+            "basic_declaration": self.dec_table,
+            "statement": self.stm_table,
+            "type_definition": self.type_table,
+            "index": self.index_table}
+
+    def register(self, rule: str, tok_id: str, handler: Callable) -> None:
+        """Register production of rule starting with given token.
+
+        The handler is called with the starting token current and returns
+        a builder node, or for type_definition and index a pair of type
+        descriptor and node; it may raise ParseError after reporting an error.
+
+        Args:
+            rule: A string of rule name, one of tables keys.
+            tok_id: A string of first token id of the production.
+            handler: A callable parsing the production.
+        """
+        self.tables[rule][tok_id] = handler
 
     def __next_token(self) -> None:
         """Update token attribute with next token from scanner."""
+        self.last_token = self.token
         self.token = self.scanner.next_token()
 
     def __accept_token(self, expected: str, err_msg: str) -> None:
@@ -70,55 +397,100 @@ class Parser(object):
     def __raise_error(self, err_msg: str, with_token: bool = True) -> None:
         """Raise exception with custom error message.
 
+        Errors cascading from the token of the previous error are not printed.
+
         Args:
             err_msg: Error message to be printed.
         """
-        if with_token:
-            self.chario.put_error("{} | Token > {}".format(err_msg, self.token))
-        else:
-            self.chario.put_error(err_msg)
-        raise Exception(err_msg)
+        if self.token is not self.err_token:
+            self.err_token = self.token
+            if with_token:
+                self.chario.put_error("{} | Token > {}".format(err_msg, self.token))
+            else:
+                self.chario.put_error(err_msg)
+        raise ParseError(err_msg)
+
+    def __synchronize(self, sync_set: Set[str]) -> None:
+        """Skip tokens until one in synchronizing set is found.
+
+        Args:
+            sync_set: A set of strings of token ids to stop at.
+        """
+        while self.token.tok_id not in sync_set:
+            self.__next_token()
+
+    def __recover(self, sync_set: Set[str]) -> None:
+        """Resume parsing after syntax error, consuming synchronizing ';'.
+
+        Args:
+            sync_set: A set of strings of token ids to stop at.
+        """
+        self.__synchronize(sync_set)
+        if self.token.tok_id == "semi":
+            self.__next_token()
+
+    def __expect(self, expected: str, err_msg: str, sync_set: Set[str]) -> None:
+        """Accept expected token, skipping ahead to it if it is misplaced.
 
-    def __accept_role(self, sym_ent: SymEnt, expected: Set[str], err_msg: str):
+        Args:
+            expected: A string representing expected token id.
+            err_msg: Error message to be printed
+                if the two tokens do not match.
+            sync_set: A set of strings of token ids to give up skipping at.
+        """
+        try:
+            self.__accept_token(expected, err_msg)
+        except ParseError:
+            self.__synchronize(sync_set | {expected})
+            if self.token.tok_id == expected:
+                self.__next_token()
+
+    def __accept_role(self, sym_ent: SymEnt, expected: int, err_msg: str):
         """Test if the given symbol matches expected role.
 
         Args:
-            expected: A set of string representing expected symbol role(s).
+            expected: An int of mask of expected symbol role flags.
             err_msg: Error message to be printed
                 if the symbol role do not match expected.
         """
-        if sym_ent.role and (sym_ent.role not in expected):
+        if sym_ent and sym_ent.role and not (sym_ent.role & expected):
             self.chario.put_error(err_msg)
 
-    def __enter_symbol(self, role: str = None, name: str = None) -> SymEnt:
+    def __enter_symbol(self, role: int = R_NONE, name: str = None) -> SymEnt:
         """Enter new symbol into current symbol table.
 
         If symbol name is not provided, grab from current token.
+        A redeclared identifier gets an entry outside of symbol table.
 
         Args:
             key: A string of identifier name.
-            role: A string of identifier role.
+            role: An int of identifier role flag.
 
         Returns:
             A SymbolEntry instance corresponding to newly added identifier.
         """
         sym_ent: SymEnt = None
-        if name:
-            sym_ent = self.table.enter_symbol(name, role)
-        elif self.token.tok_id == "id":
-            sym_ent = self.table.enter_symbol(self.token.lit, role)
+        tok: token.Token = None
+        if not name:
+            if self.token.tok_id != "id":
+                self.__raise_error("Identifier expected")
+            tok = self.token
+            name = tok.lit
             self.__next_token()
-        else:
-            self.__raise_error("Identifier expected")
+        sym_ent = self.table.enter_symbol(name, role) or SymEnt(name, role)
+        if self.xref is not None and tok:
+            self.xref.define(sym_ent, tok)
         return sym_ent
 
-    def __find_symbol(self, name: str = None) -> SymEnt:
+    def __find_symbol(self, name: str = None, kind: int = READ) -> SymEnt:
         """Find symbol in current symbol table.
 
-        If symbol name is not provided, grab from current token.
+        If symbol name is not provided, grab from current token, and record
+        its use into xref unless kind is None.
 
         Args:
             key: A string of identifier name.
+            kind: An int of use kind, READ, WRITE, CALL or END.
 
         Returns:
             A SymbolEntry instance corresponding to identifier to be found.
@@ -128,6 +500,8 @@ class Parser(object):
             sym_ent = self.table.find_symbol(name)
         elif self.token.tok_id == "id":
             sym_ent = self.table.find_symbol(self.token.lit)
+            if self.xref is not None and sym_ent and kind is not None:
+                self.xref.use(sym_ent, self.token, kind)
             self.__next_token()
         else:
             self.__raise_error("Identifier expected")
@@ -135,323 +509,883 @@ class Parser(object):
 
     # Starting from below are methods implementing TinyAda EBNF.
     def compilation(self) -> None:
-        """Run compilation."""
+        """Run compilation.
+
+        Tokens after the outermost procedure body are reported and skipped
+        up to the next procedure body, which is analyzed as well, so that
+        errors after it are still found. Procedure bodies following one
+        another are reported only once.
+        """
         if self.chario.src:
-            self.__subprogram_body()
-            self.__accept_token("eof", "Unexpected file termination")
+            body = self.__subprogram_body()
+            self.snapshots = None  # Shared declarations lead the first body only
+            reported: bool = False
+            while self.token.tok_id != "eof":
+                if self.token.tok_id != "proc" or not reported:
+                    reported = True
+                    try:
+                        self.__accept_token("eof", "Unexpected file termination")
+                    except ParseError:
+                        self.__synchronize({"proc", "eof"})
+                if self.token.tok_id == "proc":
+                    self.__subprogram_body()
             self.table.exit_scope()
+            self.tree = self.builder.compilation(body)
             self.chario.report_errors()
 
-    def __subprogram_body(self) -> None:
-        self.__subprogram_spec()
-        self.__accept_token("is", "'is' expected")
-        self.__declarative_part()
-        self.__accept_token("begin", "'begin' expected")
-        self.__seq_of_statements()
-        self.__accept_token("end", "'end' expected")
-        self.table.exit_scope()
+    def __subprogram_body(self):
+        start: token.Token = self.token
+        level: int = self.table.level
+        sym_ent: SymEnt = None
+        params: List = list()
+        try:
+            sym_ent, params = self.__subprogram_spec()
+            self.__accept_token("is", "'is' expected")
+        except ParseError:
+            self.__synchronize(SPEC_SYNC_SET)
+            if self.token.tok_id == "is":
+                self.__next_token()
+            if self.table.level == level:
+                self.table.enter_scope()
+        else:
+            if self.lazy and level > 0:
+                return self.__defer_body(start, level, sym_ent, params)
+        return self.__subprogram_rest(start, level, sym_ent, params)
+
+    def __subprogram_rest(self, start: token.Token, level: int, sym_ent: SymEnt, params: List):
+        decls: List = self.__declarative_part()
+        self.__expect("begin", "'begin' expected", STM_SYNC_SET - {"semi"})
+        saved_flow = self.flow, self.propagator, self.__proc_writes, self.__prints
+        if self.flow_analysis:
+            self.flow = ControlFlowGraph()
+            self.propagator = ConstantPropagator(self.flow, self.__quiet_fold)
+            self.__proc_writes = set()
+            self.__prints = list()
+        try:
+            stmts: List = self.__seq_of_statements()
+            self.__expect("end", "'end' expected", {"eof"})
+            if self.flow:
+                self.__finish_flow(level, sym_ent)
+        finally:
+            self.flow, self.propagator, self.__proc_writes, self.__prints = saved_flow
+            self.expr_code = list()
+        while self.table.level > level:
+            self.table.exit_scope()
         if self.token.tok_id == "id":
-            self.__accept_role(self.__find_symbol(), {"proc"}, "Procedure name expected")
-        self.__accept_token("semi", "';' expected")
+            self.__accept_role(self.__find_symbol(kind=END), R_PROC, "Procedure name expected")
+        self.__expect("semi", "';' expected", DEC_SYNC_SET)
+        return self.builder.subprogram_body(start, self.last_token, sym_ent, params, decls, stmts)
 
-    def __declarative_part(self) -> None:
-        while self.token.tok_id in DEC_OP_SET:
-            self.__basic_declaration()
+    def __finish_flow(self, level: int, sym_ent: SymEnt) -> None:
+        """Solve flow of procedure body and keep its results.
 
-    def __basic_declaration(self) -> None:
-        if self.token.tok_id == "type":
-            self.__type_declaration()
-        elif self.token.tok_id == "proc":
-            self.__subprogram_body()
-        elif self.token.tok_id == "id":
-            self.__obj_num_declaration()
-        else:
+        The graph is closed, and kept in graphs without its expression
+        code if keep_graphs. Variables and parameters of the procedure get
+        the values they surely hold at its end, as shown by the verbose
+        symbol table, and those declared outside it which it changes are
+        kept in writes.
+
+        Args:
+            level: An int of scope level of the enclosing procedure.
+            sym_ent: A SymbolEntry instance of the procedure, None if unknown.
+        """
+        self.flow.close()
+        self.__flush_prints()
+        self.propagator.solve(final=True)
+        scope: Dict[str, SymEnt] = self.table.stack[level + 1] if len(self.table.stack) > level + 1 else {}
+        code: List = list()
+        end: int = len(self.flow.instrs)
+        for entry in scope.values():
+            if entry.role & L_NAME_ROLES:
+                code[:] = [entry]
+                entry.set_value(self.propagator.value_at(end, code))
+        if sym_ent:
+            writes: Set[SymEnt] = self.__proc_writes
+            if writes is not None:
+                writes = {entry for entry in writes if scope.get(entry.name) is not entry}
+            self.writes[sym_ent] = writes
+            if self.keep_graphs:
+                self.flow.drop_code()
+                self.graphs[sym_ent] = self.flow
+
+    def __defer_body(self, start: token.Token, level: int, sym_ent: SymEnt, params: List):
+        """Skip nested procedure body after its specification and record it.
+
+        Args:
+            start: A Token instance of the procedure keyword.
+            level: An int of scope level of the enclosing procedure.
+            sym_ent: A SymbolEntry instance of the procedure.
+            params: A list of nodes of parameter specifications.
+
+        Returns:
+            A subprogram body node with declarations and statements of None.
+        """
+        tokens: List[token.Token] = list()
+        skipper: BodySkipper = BodySkipper()
+        tok: token.Token = self.token
+        while tok.tok_id != "eof":
+            tokens.append(tok)
+            if skipper.feed(tok):
+                break
+            tok = self.scanner.next_token()
+        if tokens:
+            self.last_token = tokens[-1]
+            self.token = self.scanner.next_token() if tok.tok_id != "eof" else tok
+        scopes: List[Tuple[Dict[str, SymEnt], int]] = [
+            (table, len(table)) for table in self.table.stack[:level + 1]]
+        body: LazyBody = LazyBody(start, sym_ent, params, tokens, scopes, self.table.stack[level + 1])
+        if sym_ent:
+            self.writes[sym_ent] = self.__mentioned_writes(tokens, sym_ent)
+        while self.table.level > level:
+            self.table.exit_scope()
+        self.lazy_bodies.append(body)
+        return self.builder.subprogram_body(start, self.last_token, sym_ent, params, None, None)
+
+    def __mentioned_writes(self, tokens: List[token.Token], sym_ent: SymEnt) -> Set[SymEnt]:
+        """Variables a deferred body may change, judged by the names in it.
+
+        These are the variables and parameters visible from outside it
+        which it mentions without declaring its own first, and those the
+        visible procedures it mentions may change, until the body is
+        expanded.
+
+        Args:
+            tokens: A list of Token instances of the body.
+            sym_ent: A SymbolEntry instance of the procedure.
+
+        Returns:
+            A set of SymbolEntry instances, None if not known.
+        """
+        writes: Set[SymEnt] = set()
+        for name in outer_names(tokens):
+            entries: List[SymEnt] = self.table.names.get(name)
+            entry: SymEnt = entries[-1] if entries else None
+            if entry is None or entry is sym_ent or self.table.stack[-1].get(name) is entry:
+                continue
+            if entry.role & L_NAME_ROLES:
+                writes.add(entry)
+            elif entry.role == R_PROC:
+                callee: Set[SymEnt] = self.writes.get(entry)
+                if callee is None:
+                    return None
+                writes.update(callee)
+        return writes
+
+    def expand(self, body: LazyBody):
+        """Analyze deferred procedure body in the scopes visible at its place.
+
+        Nested bodies found inside are deferred in turn. Expanding a body
+        again returns the node built the first time, unless expanded has
+        been reset, e.g. after its tokens were replaced.
+
+        Args:
+            body: A LazyBody instance from lazy_bodies.
+
+        Returns:
+            Node built by builder for the complete subprogram body.
+        """
+        if body.expanded:
+            return body.node
+        body.expanded = True
+        saved_parser = self.scanner, self.token, self.last_token, self.err_token
+        saved_table = self.table.save()
+        saved_chario = self.chario.line, self.chario.line_count, self.chario.column
+        self.table.rebuild([dict(itertools.islice(table.items(), count)) for table, count in body.scopes]
+                           + [dict(body.param_scope)])
+        self.scanner = TokenReplay(body.tokens, self.chario)
+        self.token = self.scanner.next_token()
+        try:
+            body.node = self.__subprogram_rest(body.start, self.table.level - 1, body.sym_ent, body.params)
+        finally:
+            self.scanner, self.token, self.last_token, self.err_token = saved_parser
+            self.table.load(saved_table)
+            self.chario.line, self.chario.line_count, self.chario.column = saved_chario
+        return body.node
+
+    def __declarative_part(self) -> List:
+        decls: List = list()
+        shared: bool = (
+            self.snapshots is not None and self.table.level == 1 and self.xref is None
+            and type(self.builder) is TreeBuilder and not self.chario.is_verbose)
+        first: int = self.table.scope_size()
+        if shared:
+            self.__restore_declarations()
+        while self.token.tok_id in self.dec_table:
+            if shared and self.token.tok_id == "proc":
+                self.__save_declarations(first)
+                shared = False
+            decl = self.__basic_declaration()
+            if decl is not None:
+                decls.append(decl)
+        if shared:
+            self.__save_declarations(first)
+        return decls
+
+    def __restore_declarations(self) -> None:
+        """Enter leading declarations from snapshot and skip their source."""
+        snapshot = self.snapshots.find(self.chario.src, (self.max_const_bits, self.fold_budget))
+        if snapshot is None or (snapshot.line, snapshot.column) <= (self.token.line, self.token.column):
+            return
+        self.table.enter_entries(snapshot.entries)
+        self.types.table.update(snapshot.types)
+        self.scanner.seek(snapshot.line, snapshot.column)
+        self.scanner.tok_count = snapshot.tok_index
+        self.token = self.scanner.next_token()
+
+    def __save_declarations(self, first: int) -> None:
+        """Keep leading declarations ending at current token, if free of errors."""
+        if self.chario.err_count or self.table.scope_size() == first:
+            return
+        entries: List[SymEnt] = list(itertools.islice(self.table.stack[-1].values(), first, None))
+        self.snapshots.add(self.chario.src, self.token.line, self.token.column,
+                           (self.max_const_bits, self.fold_budget), self.token.index, entries, self.types.table)
+
+    def __basic_declaration(self):
+        level: int = self.table.level
+        try:
+            func: Callable = self.dec_table.get(self.token.tok_id)
+            if func:
+                return func()
             self.__raise_error("Error for [basic_declaration]")
+        except ParseError:
+            while self.table.level > level:
+                self.table.exit_scope()
+            self.__recover(DEC_SYNC_SET)
+        return None
 
-    def __obj_num_declaration(self) -> None:
-        sym_ent: SymEnt = self.__identifier_list()
+    def __obj_num_declaration(self):
+        start: token.Token = self.token
+        group: SymbolGroup = self.__identifier_list()
         self.__accept_token("colon", "':' expected")
         if self.token.tok_id == "const":  # numberDeclaration
-            sym_ent.set_role("const")
+            group.set_role(R_CONST)
             self.__next_token()
             self.__accept_token("assign", "':=' expected")
-            exp_val: str = self.__expression()
-            if exp_val:
-                sym_ent.set_value(exp_val)
+            exp_val, exp_node = self.__expression()
+            if exp_val is not None:
+                group.set_value(exp_val)
+            group.set_type(value_type(exp_val))
+            self.__accept_token("semi", "';' expected")
+            return self.builder.number_decl(start, self.last_token, group, exp_node)
         else:  # objectDeclaration
-            sym_ent.set_role("var")
-            self.__type_definition()
-        self.__accept_token("semi", "';' expected")
+            group.set_role(R_VAR)
+            type_desc, type_node = self.__type_definition()
+            group.set_type(type_desc)
+            self.__accept_token("semi", "';' expected")
+            return self.builder.object_decl(start, self.last_token, group, type_node)
 
-    def __identifier_list(self) -> SymEnt:
-        sym_ent: SymEnt = self.__enter_symbol()
+    def __identifier_list(self) -> SymbolGroup:
+        group: SymbolGroup = SymbolGroup([self.__enter_symbol()])
         while self.token.tok_id == "comma":
             self.__next_token()
-            sym_ent.append(self.__enter_symbol())
-        return sym_ent
+            group.append(self.__enter_symbol())
+        return group
 
-    def __type_declaration(self) -> None:
+    def __type_declaration(self):
+        start: token.Token = self.token
         self.__accept_token("type", "'type' expected")
-        self.__enter_symbol("type")
+        sym_ent: SymEnt = self.__enter_symbol(R_TYPE)
         self.__accept_token("is", "'is' expected")
-        self.__type_definition()
+        type_desc, type_node = self.__type_definition()
+        sym_ent.set_type(self.types.named(type_desc))
         self.__accept_token("semi", "';' expected")
+        return self.builder.type_decl(start, self.last_token, sym_ent, type_node)
 
-    def __type_definition(self) -> None:
-        if self.token.tok_id == "l_par":
-            self.__enum_type_definition()
-        elif self.token.tok_id == "array":
-            self.__array_type_definition()
-        elif self.token.tok_id == "range":
-            self.__range()
-        elif self.token.tok_id == "id":
-            self.__accept_role(self.__find_symbol(), {"type"}, "Type name expected")
-        else:
-            self.__raise_error("Error for [type_definition]")
+    def __type_definition(self) -> Tuple[TypeDescriptor, object]:
+        func: Callable = self.type_table.get(self.token.tok_id)
+        if func:
+            return func()
+        self.__raise_error("Error for [type_definition]")
+
+    def __type_name(self) -> Tuple[TypeDescriptor, object]:
+        start: token.Token = self.token
+        sym_ent: SymEnt = self.__find_symbol()
+        self.__accept_role(sym_ent, R_TYPE, "Type name expected")
+        type_desc: TypeDescriptor = sym_ent.type if sym_ent and sym_ent.role == R_TYPE else NO_TYPE
+        return type_desc, self.builder.type_name(start, sym_ent)
 
-    def __range(self) -> None:
+    def __range(self) -> Tuple[TypeDescriptor, object]:
+        start: token.Token = self.token
         self.__accept_token("range", "'range' expected")
-        self.__simple_expression()
+        low_val, low = self.__simple_expression()
         self.__accept_token("to", "'..' expected")
-        self.__simple_expression()
+        high_val, high = self.__simple_expression()
+        super_type: TypeDescriptor = value_type(low_val)
+        if super_type is not value_type(high_val):
+            super_type = NO_TYPE
+        type_desc: TypeDescriptor = NO_TYPE
+        if super_type is not NO_TYPE:
+            type_desc = self.types.subrange(int(low_val), int(high_val), super_type)
+        return type_desc, self.builder.range_def(start, self.last_token, low, high)
 
-    def __index(self) -> None:
-        if self.token.tok_id == "range":
-            self.__range()
-        elif self.token.tok_id == "id":
-            self.__accept_role(self.__find_symbol(), {"type"}, "Type name expected")
-        else:
-            self.__raise_error("Error for [index]")
+    def __index(self) -> Tuple[TypeDescriptor, object]:
+        func: Callable = self.index_table.get(self.token.tok_id)
+        if func:
+            return func()
+        self.__raise_error("Error for [index]")
 
-    def __enum_type_definition(self) -> None:
+    def __enum_type_definition(self) -> Tuple[TypeDescriptor, object]:
+        start: token.Token = self.token
         self.__accept_token("l_par", "'(' expected")
-        self.__identifier_list().set_role("const")
+        group: SymbolGroup = self.__identifier_list()
+        group.set_role(R_CONST)
+        type_desc: TypeDescriptor = self.types.enum(tuple(group))
+        group.set_type(type_desc)
         self.__accept_token("r_par", "')' expected")
+        return type_desc, self.builder.enum_def(start, self.last_token, group)
 
-    def __array_type_definition(self) -> None:
+    def __array_type_definition(self) -> Tuple[TypeDescriptor, object]:
+        start: token.Token = self.token
         self.__accept_token("array", "'array' expected")
         self.__accept_token("l_par", "'(' expected")
-        self.__index()
+        indexes: List[Tuple[TypeDescriptor, object]] = [self.__index()]
         while self.token.tok_id == "comma":
             self.__next_token()
-            self.__index()
+            indexes.append(self.__index())
         self.__accept_token("r_par", "')' expected")
         self.__accept_token("of", "'of' expected")
-        self.__accept_role(self.__find_symbol(), {"type"}, "Type name expected")
+        elem_desc, elem_type = self.__type_name()
+        type_desc: TypeDescriptor = self.types.array(tuple(desc for desc, _ in indexes), elem_desc)
+        return type_desc, self.builder.array_def(
+            start, self.last_token, [node for _, node in indexes], elem_type)
 
-    def __subprogram_spec(self) -> None:
+    def __subprogram_spec(self) -> Tuple[SymEnt, List]:
+        start: token.Token = self.token
         self.__accept_token("proc", "'procedure' expected")
-        self.__enter_symbol("proc")
+        sym_ent: SymEnt = self.__enter_symbol(R_PROC)
         self.table.enter_scope()
+        self.builder.enter_subprogram(start, sym_ent)
+        params: List = list()
+        signature: List[Tuple[str, TypeDescriptor]] = list()
         if self.token.tok_id == "l_par":
-            self.__formal_part()
+            params = self.__formal_part(signature)
+        sym_ent.set_signature(tuple(signature))
+        return sym_ent, params
 
-    def __formal_part(self) -> None:
+    def __formal_part(self, signature: List[Tuple[str, TypeDescriptor]]) -> List:
         self.__accept_token("l_par", "'(' expected")
-        self.__parameter_specification()
+        params: List = [self.__parameter_specification(signature)]
         while self.token.tok_id == "semi":
             self.__next_token()
-            self.__parameter_specification()
+            params.append(self.__parameter_specification(signature))
         self.__accept_token("r_par", "')' expected")
+        return params
 
-    def __parameter_specification(self) -> None:
-        self.__identifier_list().set_role("param")
+    def __parameter_specification(self, signature: List[Tuple[str, TypeDescriptor]]):
+        start: token.Token = self.token
+        group: SymbolGroup = self.__identifier_list()
+        group.set_role(R_PARAM)
         self.__accept_token("colon", "':' expected")
-        self.__mode()
-        self.__accept_role(self.__find_symbol(), {"type"}, "Type name expected")
+        mode: str = self.__mode()
+        type_desc, type_node = self.__type_name()
+        group.set_type(type_desc)
+        signature.extend([(mode, type_desc)] * len(group))
+        return self.builder.param_spec(start, self.last_token, group, mode, type_node)
 
-    def __mode(self) -> None:
+    def __mode(self) -> str:
+        mode: str = "in"
         if self.token.tok_id == "in":
             self.__next_token()
-        if self.token.tok_id == "out":
+            if self.token.tok_id == "out":
+                mode = "in out"
+                self.__next_token()
+        elif self.token.tok_id == "out":
+            mode = "out"
             self.__next_token()
+        return mode
+
+    def __condition(self):
+        try:
+            return self.__expression()[1]
+        except ParseError:
+            self.__synchronize(CON_SYNC_SET)
+            self.expr_code = [(None,)]
+        return None
+
+    def __expression(self) -> Tuple[Value, object]:
+        return self.__climb(LOGIC_PREC)
 
-    def __condition(self) -> None:
-        self.__expression()
+    def __simple_expression(self) -> Tuple[Value, object]:
+        return self.__climb(ADD_PREC)
 
-    def __expression(self) -> str:
-        val: str = self.__relation()
-        no_logic_op: bool = True
-        if self.token.tok_id == "and":
-            no_logic_op = False
-            while self.token.tok_id == "and":
+    def __climb(self, floor: int) -> Tuple[Value, object]:
+        """Parse expression by iterative precedence climbing.
+
+        Covers expression, relation, simple expression, term, factor and
+        primary rules at once. Parenthesized expressions and indexed
+        components open a new frame instead of recursing, so neither deep
+        nesting nor long operator chains grow the Python stack.
+
+        Args:
+            floor: An int of lowest operator precedence belonging to the
+                expression, ADD_PREC to parse a simple expression.
+
+        Returns:
+            An int or bool of folded value, None if not constant.
+            A node built for the expression by builder.
+        """
+        frames: List[_ExprFrame] = list()
+        frame: _ExprFrame = _ExprFrame(floor)
+        code: List = list()
+        self.expr_code = code
+        sign_ok: bool = True
+        not_ok: bool = True
+        while True:
+            tok_id: str = self.token.tok_id
+            if tok_id in ADD_OP_SET and sign_ok:
+                frame.ops.append("neg" if tok_id == "minus" else "pos")
+                frame.op_toks.append(self.token)
                 self.__next_token()
-                self.__relation()
-        elif self.token.tok_id == "or":
-            no_logic_op = False
-            while self.token.tok_id == "or":
+                sign_ok = False
+                continue
+            if tok_id == "not" and not_ok:
+                frame.ops.append("not")
+                frame.op_toks.append(self.token)
                 self.__next_token()
-                self.__relation()
-        return val if (val and val.isdigit() and no_logic_op) else None
-
-    def __relation(self) -> str:
-        val: str = self.__simple_expression()
-        no_rel_op: bool = True
-        if self.token.tok_id in REL_OP_SET:
-            no_rel_op = False
-            self.__next_token()
-            self.__simple_expression()
-        return val if (val and val.isdigit() and no_rel_op) else None
-
-    def __simple_expression(self) -> str:
-        cur_add_op: str = None
-        if self.token.tok_id in ADD_OP_SET:
-            cur_add_op = self.token.tok_id
-            self.__next_token()
-        val1: str = self.__term()
-        if cur_add_op and val1.isdigit():
-            if cur_add_op == "minus":
-                val1 = str(0 - int(val1))
-        while self.token.tok_id in ADD_OP_SET:
-            cur_add_op = self.token.tok_id
-            self.__next_token()
-            val2: str = self.__term()
-            if val1.isdigit() and val2.isdigit():
-                if cur_add_op == "plus":
-                    val1 = str(int(val1) + int(val2))
+                sign_ok = not_ok = False
+                continue
+            start: token.Token = self.token
+            val: Value = None
+            name_ent: SymEnt = None
+            name_type: TypeDescriptor = NO_TYPE
+            if tok_id == "int":
+                val = self.__literal_value(start.lit, bool(frame.ops) and frame.ops[-1] == "neg")
+                node = self.builder.int_lit(start, start.lit)
+                code.append((val,))
+                self.__next_token()
+            elif tok_id == "l_par":
+                self.__next_token()
+                frames.append(frame)
+                frame = _ExprFrame(LOGIC_PREC)
+                sign_ok = not_ok = True
+                continue
+            elif tok_id == "id":
+                sym_ent: SymEnt = self.__find_symbol()
+                if self.token.tok_id == "l_par":
+                    self.__next_token()
+                    frames.append(frame)
+                    frame = _ExprFrame(LOGIC_PREC, start, sym_ent, len(code))
+                    sign_ok = not_ok = True
+                    continue
+                self.__accept_role(sym_ent, R_NAME_ROLES, "Variable, parameter or constant name expected")
+                val = sym_ent.val if sym_ent and sym_ent.role & R_CONST else None
+                code.append(sym_ent if sym_ent and sym_ent.role & L_NAME_ROLES else (val,))
+                node = self.builder.name(start, start, sym_ent, None)
+                name_ent = sym_ent if sym_ent else SymEnt(start.lit)
+                name_type = name_ent.type
+            else:
+                self.__raise_error("Error for [primary]")
+            while True:  # Primary complete, look for operator or close frame
+                if not frame.vals and not frame.ops:
+                    frame.target, frame.target_type = name_ent, name_type
+                frame.vals.append(val)
+                frame.nodes.append(node)
+                can_exp: bool = True
+                if frame.ops and frame.ops[-1] in ("exp", "not"):
+                    self.__reduce(frame, EXP_PREC)
+                    can_exp = False
+                tok_id = self.token.tok_id
+                prec: int = BIN_OP_PREC.get(tok_id, 0)
+                allowed: bool = (
+                    prec == EXP_PREC and can_exp
+                    or prec in (ADD_PREC, MUL_PREC)
+                    or prec == REL_PREC and not frame.has_rel
+                    or prec == LOGIC_PREC and frame.logic in (None, tok_id))
+                if allowed and prec >= frame.floor:
+                    self.__reduce(frame, prec)
+                    frame.target = None
+                    frame.ops.append(tok_id)
+                    frame.op_toks.append(self.token)
+                    self.__next_token()
+                    if prec == LOGIC_PREC:
+                        frame.logic = tok_id
+                        frame.has_rel = False
+                    elif prec == REL_PREC:
+                        frame.has_rel = True
+                    sign_ok = prec <= REL_PREC
+                    not_ok = prec < EXP_PREC
+                    break
+                self.__reduce(frame, LOGIC_PREC)
+                val = frame.vals.pop()
+                node = frame.nodes.pop()
+                if not frames:
+                    self.expr_name = frame.target
+                    self.expr_type = frame.target_type if frame.target else value_type(val)
+                    return val, node
+                name_ent = None
+                if not frame.start:
+                    self.__accept_token("r_par", "')' expected")
+                elif self.token.tok_id == "comma":
+                    self.__next_token()
+                    frame.reset()
+                    frame.args.append(node)
+                    sign_ok = not_ok = True
+                    break
                 else:
-                    val1 = str(int(val1) - int(val2))
-        return val1 if (val1 and val1.isdigit()) else None
+                    self.__accept_token("r_par", "')' expected")
+                    frame.args.append(node)
+                    sym_ent = frame.sym_ent
+                    self.__accept_role(sym_ent, R_NAME_ROLES, "Variable, parameter or constant name expected")
+                    val = sym_ent.val if sym_ent and sym_ent.role & R_CONST else None
+                    del code[frame.mark:]
+                    code.append((val,))
+                    node = self.builder.name(frame.start, self.last_token, sym_ent, frame.args)
+                    name_ent = sym_ent if sym_ent else SymEnt(frame.start.lit)
+                    name_type = name_ent.type.base_type if name_ent.type.form == ARRAY else NO_TYPE
+                frame = frames.pop()
 
-    def __term(self) -> str:
-        val1: str = self.__factor()
-        while self.token.tok_id in MUL_OP_SET:
-            cur_mul_op: str = self.token.tok_id
-            self.__next_token()
-            val2: str = self.__factor()
-            if val1.isdigit() and val2.isdigit():
-                if cur_mul_op == "mul":
-                    val1 = str(int(val1) * int(val2))
-                elif cur_mul_op == "div":
-                    val1 = str(int(val1) // int(val2))
-                else:
-                    val1 = str(int(val1) % int(val2))
-        return val1 if (val1 and val1.isdigit()) else None
+    def __reduce(self, frame: "_ExprFrame", prec: int) -> None:
+        """Fold operators of frame binding at least as tight as prec.
 
-    def __factor(self) -> str:
-        if self.token.tok_id == "not":
-            self.__next_token()
-            self.__primary()
+        Operators are appended to expr_code as they are folded.
+
+        Args:
+            frame: An _ExprFrame instance with operator and value stacks.
+            prec: An int of precedence of the incoming operator.
+        """
+        ops: List[str] = frame.ops
+        vals: List[Value] = frame.vals
+        nodes: List = frame.nodes
+        while ops and OP_PREC[ops[-1]] >= prec:
+            op: str = ops.pop()
+            op_tok: token.Token = frame.op_toks.pop()
+            self.expr_code.append(op)
+            val2: Value = vals.pop()
+            node2 = nodes.pop()
+            negated: bool = bool(ops) and ops[-1] == "neg"
+            if op in UNARY_OP_SET:
+                vals.append(self.__fold(op, None, val2))
+                nodes.append(self.builder.unary(op_tok, op, node2))
+            else:
+                vals.append(self.__fold(op, vals.pop(), val2, negated))
+                nodes.append(self.builder.binary(op, nodes.pop(), node2))
+
+    def __fold(self, op: str, val1: Value, val2: Value, negated: bool = False) -> Value:
+        """Fold operator within bit length and time budget.
+
+        Folds are timed if max_const_bits is over FOLD_TIMED_BITS, as single
+        operations can then take noticeable time. Once their total exceeds
+        fold_budget, integer folds are no longer attempted.
+
+        Args:
+            op: A string of operator token id.
+            val1: Left operand value, None for unary operator.
+            val2: Right or only operand value.
+            negated: A bool indicating if the result is negated next.
+
+        Returns:
+            An int or bool of folded value, None if not constant or too large.
+        """
+        timed: bool = self.max_const_bits > FOLD_TIMED_BITS and type(val2) is int
+        if timed and self.fold_time > self.fold_budget:
             return None
-        else:
-            val1: str = self.__primary()
-            if self.token.tok_id == "exp":
-                self.__next_token()
-                val2: str = self.__primary()
-                if val1.isdigit() and val2.isdigit():
-                    val1 = str(int(val1) ** int(val2))
-            return val1 if (val1 and val1.isdigit()) else None
-
-    def __primary(self) -> str:
-        val: str = None
-        if self.token.tok_id == "int":
-            val = self.token.lit
-            self.__next_token()
-        elif self.token.tok_id == "l_par":
-            self.__next_token()
-            self.__expression()
-            self.__accept_token("r_par", "')' expected")
-        elif self.token.tok_id == "id":
-            sym_ent: SymEnt = self.__name()
-            self.__accept_role(sym_ent, R_NAME_SET, "Variable, parameter or constant name expected")
-            val = sym_ent.val
-        else:
-            self.__raise_error("Error for [primary]")
-        return val
+        start: float = time.perf_counter() if timed else 0.0
+        try:
+            if op in UNARY_OP_SET:
+                return fold_unary(op, val2, self.max_const_bits)
+            return fold_binary(op, val1, val2, self.max_const_bits, negated)
+        except ConstantOverflowError:
+            self.chario.put_error("Constant too large")
+            return None
+        finally:
+            if timed:
+                self.fold_time += time.perf_counter() - start
+                if self.fold_time > self.fold_budget:
+                    self.chario.put_error("Constant folding time budget exceeded")
 
-    def __name(self) -> SymEnt:
-        sym_ent: SymEnt = self.__find_symbol()
+    def __quiet_fold(self, op: str, val1: Value, val2: Value) -> Value:
+        """Fold operator for flow analysis, None where __fold would report.
+
+        Folds are repeated as values flow around loops, so overflows make
+        the value unknown instead of being reported each time.
+        """
+        if self.max_const_bits > FOLD_TIMED_BITS and self.fold_time > self.fold_budget:
+            return None
+        try:
+            if op in UNARY_OP_SET:
+                return fold_unary(op, val2, self.max_const_bits)
+            return fold_binary(op, val1, val2, self.max_const_bits)
+        except ConstantOverflowError:
+            return None
+
+    def __literal_value(self, lit: str, negated: bool = False) -> int:
+        """Convert integer literal into int, None if too large, unless negated next as in check_range."""
+        try:  # Reject literals whose digits alone exceed the bit length
+            if (len(lit.lstrip("0")) - 1) * 3.32 > self.max_const_bits:
+                raise ConstantOverflowError()
+            return check_range(int(lit), self.max_const_bits, negated)
+        except (ConstantOverflowError, ValueError):
+            self.chario.put_error("Constant too large")
+            return None
+
+    def __name(self, actuals: List[Actual] = None) -> Tuple[SymEnt, List]:
+        sym_ent: SymEnt = self.__find_symbol(kind=None)
+        args: List = None
         if self.token.tok_id == "l_par":
-            self.__indexed_component()
-        return sym_ent
+            args = self.__indexed_component(actuals)
+        return sym_ent, args
 
-    def __indexed_component(self) -> None:
+    def __indexed_component(self, actuals: List[Actual] = None) -> List:
+        """Parse parenthesized expressions, recording each in actuals if given.
+
+        Args:
+            actuals: A list receiving Actual tuples of expr_name, expr_type
+                and first token of each expression, for checking them as
+                call arguments.
+        """
         self.__accept_token("l_par", "'(' expected")
-        self.__expression()
+        start: token.Token = self.token
+        args: List = [self.__expression()[1]]
+        if actuals is not None:
+            actuals.append((self.expr_name, self.expr_type, start))
         while self.token.tok_id == "comma":
             self.__next_token()
-            self.__expression()
+            start = self.token
+            args.append(self.__expression()[1])
+            if actuals is not None:
+                actuals.append((self.expr_name, self.expr_type, start))
         self.__accept_token("r_par", "')' expected")
+        return args
 
-    def __seq_of_statements(self) -> None:
-        self.__statement()
-        while self.token.tok_id in STM_OP_SET:
-            self.__statement()
+    def __seq_of_statements(self) -> List:
+        stmts: List = list()
+        while True:
+            stmt = self.__statement()
+            if stmt is not None:
+                stmts.append(stmt)
+            if self.token.tok_id not in self.stm_table:
+                return stmts
 
-    def __statement(self) -> None:
-        if self.token.tok_id == "id":
-            self.__assign_call_statement()
-        elif self.token.tok_id == "exit":
-            self.__exit_statement()
-        elif self.token.tok_id == "if":
-            self.__if_statement()
-        elif self.token.tok_id == "null":
-            self.__null_statement()
-        elif self.token.tok_id in ("while", "loop"):
-            self.__loop_statement()
-        elif self.token.tok_id == "print":
-            self.__print_statement()
-        else:
+    def __statement(self):
+        try:
+            func: Callable = self.stm_table.get(self.token.tok_id)
+            if func:
+                if self.flow:
+                    self.flow.line = self.token.line
+                return func()
             self.__raise_error("Error for [statement]")
+        except ParseError:
+            self.__recover(STM_SYNC_SET)
+        return None
 
-    def __null_statement(self) -> None:
+    def __null_statement(self):
+        start: token.Token = self.token
         self.__accept_token("null", "'null' expected")
         self.__accept_token("semi", "';' expected")
+        return self.builder.null_stmt(start, self.last_token)
 
-    def __loop_statement(self) -> None:
+    def __loop_statement(self):
+        start: token.Token = self.token
+        cond = None
+        code: List = None
         if self.token.tok_id == "while":
             self.__accept_token("while", "'while' expected")
-            self.__condition()
+            cond = self.__condition()
+            code = self.expr_code
         self.__accept_token("loop", "'loop' expected")
-        self.__seq_of_statements()
+        flow: ControlFlowGraph = self.flow
+        loop = flow.open_loop(code) if flow else None
+        stmts: List = self.__seq_of_statements()
+        if flow:
+            flow.close_loop(loop)
+            if not flow.loops:
+                self.__flush_prints()
         self.__accept_token("end", "'end' expected")
         self.__accept_token("loop", "'loop' expected")
         self.__accept_token("semi", "';' expected")
+        return self.builder.loop_stmt(start, self.last_token, cond, stmts)
 
-    def __if_statement(self) -> None:
+    def __if_statement(self):
+        start: token.Token = self.token
         self.__accept_token("if", "'if' expected")
-        self.__condition()
+        flow: ControlFlowGraph = self.flow
+        if_ctx = flow.open_if() if flow else None
+        cond = self.__condition()
+        if flow:
+            flow.if_branch(if_ctx, self.expr_code)
         self.__accept_token("then", "'then' expected")
-        self.__seq_of_statements()
+        branches: List = [(cond, self.__seq_of_statements())]
         while self.token.tok_id == "elsif":
+            if flow:
+                flow.line = self.token.line
             self.__accept_token("elsif", "'elsif' expected")
-            self.__condition()
+            if flow:
+                flow.else_branch(if_ctx)
+            cond = self.__condition()
+            if flow:
+                flow.if_branch(if_ctx, self.expr_code)
             self.__accept_token("then", "'then' expected")
-            self.__seq_of_statements()
+            branches.append((cond, self.__seq_of_statements()))
+        else_stmts: List = None
         if self.token.tok_id == "else":
             self.__accept_token("else", "'else' expected")
-            self.__seq_of_statements()
+            if flow:
+                flow.else_branch(if_ctx)
+            else_stmts = self.__seq_of_statements()
+        if flow:
+            flow.close_if(if_ctx)
         self.__accept_token("end", "'end' expected")
         self.__accept_token("if", "'if' expected")
         self.__accept_token("semi", "';' expected")
+        return self.builder.if_stmt(start, self.last_token, branches, else_stmts)
 
-    def __exit_statement(self) -> None:
+    def __exit_statement(self):
+        start: token.Token = self.token
+        cond = None
+        code: List = None
         self.__accept_token("exit", "'exit' expected")
         if self.token.tok_id == "when":
             self.__accept_token("when", "'when' expected")
-            self.__condition()
+            cond = self.__condition()
+            code = self.expr_code
+        if self.flow:
+            self.flow.exit_loop(code)
         self.__accept_token("semi", "';' expected")
+        return self.builder.exit_stmt(start, self.last_token, cond)
 
-    def __assign_call_statement(self) -> None:
-        sym_ent: SymEnt = self.__name()
+    def __assign_call_statement(self):
+        start: token.Token = self.token
+        actuals: List[Actual] = list()
+        sym_ent, args = self.__name(actuals)
+        if self.xref is not None and sym_ent:
+            self.xref.use(sym_ent, start, WRITE if self.token.tok_id == "assign" else CALL)
         if self.token.tok_id == "assign":
-            self.__accept_role(sym_ent, L_NAME_SET, "Variable or parameter name expected")
+            self.__accept_role(sym_ent, L_NAME_ROLES, "Variable or parameter name expected")
+            target = self.builder.name(start, self.last_token, sym_ent, args)
             self.__next_token()
-            exp_val: str = self.__expression()
-            if exp_val:
-                sym_ent.set_value(exp_val)
+            exp_val, exp_node = self.__expression()
+            if sym_ent and sym_ent.role & L_NAME_ROLES:
+                if self.flow:
+                    self.flow.add((ASSIGN, sym_ent, self.expr_code) if args is None else (KILL, (sym_ent,)))
+                if self.__proc_writes is not None:
+                    self.__proc_writes.add(sym_ent)
+            self.__accept_token("semi", "';' expected")
+            return self.builder.assign_stmt(start, self.last_token, target, exp_node)
         elif self.token.tok_id == "l_par":
-            self.__accept_role(sym_ent, {"proc"}, "Procedure name expected")
-            self.__indexed_component()
+            self.__accept_role(sym_ent, R_PROC, "Procedure name expected")
+            actuals = list()
+            args = self.__indexed_component(actuals)
+        if sym_ent and sym_ent.role == R_PROC:
+            self.__check_call(sym_ent.signature, actuals)
+            if self.xref is not None:
+                self.__xref_args(sym_ent.signature, actuals)
+        if self.flow:
+            self.__flow_call(sym_ent, actuals)
         self.__accept_token("semi", "';' expected")
+        return self.builder.call_stmt(start, self.last_token, sym_ent, args)
+
+    def __check_call(self, signature: Signature, actuals: List[Actual]) -> None:
+        """Check call arguments against procedure signature.
+
+        Arguments of out and in out parameters must be variable or parameter
+        names, and types are compared where both are known.
+
+        Args:
+            signature: A tuple of (mode, TypeDescriptor) pairs of parameters,
+                None if not known.
+            actuals: A list of Actual tuples of arguments.
+        """
+        if signature is None:
+            return
+        if len(actuals) != len(signature):
+            self.chario.put_error("Wrong number of arguments")
+            return
+        for (mode, formal_type), (name_ent, actual_type, _) in zip(signature, actuals):
+            if mode != "in" and not (name_ent and (name_ent.role & L_NAME_ROLES or not name_ent.role)):
+                self.chario.put_error("Variable or parameter name expected")
+            elif formal_type is not NO_TYPE and actual_type is not NO_TYPE \
+                    and _root_type(formal_type) is not _root_type(actual_type):
+                self.chario.put_error("Argument type mismatch")
+
+    def __xref_args(self, signature: Signature, actuals: List[Actual]) -> None:
+        """Record names given for out and in out parameters as written.
+
+        The names have been recorded as read while parsing the arguments,
+        before the parameter modes were known, so that a name given for an
+        out parameter turns written, and one for in out is both.
 
-    def __print_statement(self) -> None:
+        Args:
+            signature: A tuple of (mode, TypeDescriptor) pairs of parameters,
+                None if not known.
+            actuals: A list of Actual tuples of arguments.
+        """
+        if signature is None or len(actuals) != len(signature):
+            return
+        for (mode, _), (name_ent, _, start) in zip(signature, actuals):
+            if name_ent and mode == "out":
+                self.xref.retag(name_ent, start, WRITE)
+            elif name_ent and mode != "in":
+                self.xref.use(name_ent, start, WRITE)
+
+    def __flow_call(self, sym_ent: SymEnt, actuals: List[Actual]) -> None:
+        """Record variables a call may change into flow.
+
+        These are the names given for out and in out parameters, every
+        name given if the signature does not match, and those the called
+        procedure may change. Calls to procedures not analyzed yet, such
+        as recursive or deferred ones, may change any variable.
+
+        Args:
+            sym_ent: A SymbolEntry instance of procedure called, None if unknown.
+            actuals: A list of Actual tuples of arguments.
+        """
+        callee: Set[SymEnt] = self.writes.get(sym_ent) if sym_ent else None
+        kills: Tuple[SymEnt, ...] = None
+        if callee is not None:
+            signature: Signature = sym_ent.signature
+            if signature is not None and len(signature) == len(actuals):
+                names = [name for (mode, _), (name, _, _) in zip(signature, actuals) if mode != "in" and name]
+            else:
+                names = [name for name, _, _ in actuals if name]
+            kills = tuple(names) + tuple(callee)
+        self.flow.add((KILL, kills))
+        if kills is None:
+            self.__proc_writes = None
+        elif self.__proc_writes is not None:
+            self.__proc_writes.update(kills)
+
+    def __print_statement(self):
+        start: token.Token = self.token
         self.__accept_token("print", "'print' expected")
         self.__accept_token("l_par", "'(' expected")
-        exp_val: str = self.__expression()
-        if exp_val:
-            print(exp_val)
+        exp_val, exp_node = self.__expression()
+        if not self.flow:
+            if type(exp_val) is int:
+                print(format_value(exp_val))
+            else:
+                self.chario.put_error("Illegal [print] operand")
         else:
-            self.__raise_error("Illegal [print] operand", False)
+            index: int = self.flow.add((PRINT, self.expr_code))
+            pos: Tuple[str, int, int] = self.chario.line, self.chario.line_count, self.chario.column
+            self.__prints.append((index, self.expr_code, exp_val, pos))
+            if not self.flow.loops:
+                self.__flush_prints()
         self.__accept_token("r_par", "')' expected")
         self.__accept_token("semi", "';' expected")
+        return self.builder.print_stmt(start, self.last_token, exp_node)
+
+    def __flush_prints(self) -> None:
+        """Print values of print statements pending.
+
+        Values not folded while parsing are taken from flow. Inside loops
+        prints wait for the outermost loop to be closed, so that every
+        path around it is known, and errors are reported at their place.
+        Prints no path reaches, as behind a constant false condition, are
+        dropped with neither output nor error.
+        """
+        if not self.__prints:
+            return
+        self.propagator.solve()
+        saved_chario = self.chario.line, self.chario.line_count, self.chario.column
+        for index, code, val, pos in self.__prints:
+            if not self.propagator.reached(index):
+                continue
+            if val is None and any(not isinstance(item, (str, tuple)) for item in code):
+                val = self.propagator.value_at(index, code)
+            if type(val) is int:
+                print(format_value(val))
+            else:
+                self.chario.line, self.chario.line_count, self.chario.column = pos
+                self.chario.put_error("Illegal [print] operand")
+        self.chario.line, self.chario.line_count, self.chario.column = saved_chario
+        self.__prints.clear()
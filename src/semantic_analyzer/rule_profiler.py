@@ -0,0 +1,162 @@
+"""RuleProfiler class counting and timing grammar rules of a Parser.
+
+Rules are the private methods of Parser, named without their mangling
+prefix, such as "expression" or "statement", plus compilation and expand.
+Attaching a profiler shadows them by timing wrappers in the instance
+dictionary and in the dispatch tables, so that a parser without one runs
+the plain methods with no checks at all.
+
+Time is measured by perf_counter_ns. Cumulative time of a rule counts only
+its outermost activation, and self time excludes rules called from it.
+Self times are also kept per call path, which write_collapsed saves in the
+collapsed stack format read by flamegraph tools.
+
+Typical usage example:
+    new_parser = Parser(cio_instance, scn_instance)
+    profiler = RuleProfiler(new_parser)
+    new_parser.compilation()
+    print(profiler.report())
+    profiler.write_collapsed("parse.folded")
+"""
+
+
+from typing import Callable, Dict, List, Tuple
+import time
+import parser7
+
+
+# Prefix of mangled private method names of Parser
+PRIVATE_PREFIX: str = "_Parser__"
+
+# Public methods profiled as rules besides the private ones
+PUBLIC_RULES: Tuple[str, ...] = ("compilation", "expand")
+
+
+class RuleStat(object):
+    """Counters of one rule.
+
+    Attributes:
+        calls: An int of entries into the rule.
+        cum_ns: An int of nanoseconds spent in outermost activations.
+        self_ns: An int of nanoseconds spent in the rule itself.
+    """
+
+    def __init__(self) -> None:
+        """Init with zero counters."""
+        self.calls: int = 0
+        self.cum_ns: int = 0
+        self.self_ns: int = 0
+
+
+class RuleProfiler(object):
+    """Counts entries and measures time of each rule of a parser.
+
+    Attributes:
+        parser: A Parser instance being profiled.
+        stats: A dict mapping rule name to its RuleStat.
+        stacks: A dict mapping tuple of rule names, outermost first, to
+            nanoseconds of self time spent with that call path.
+    """
+
+    def __init__(self, parser: parser7.Parser, attach: bool = True) -> None:
+        """Init with parser and attach to it unless told otherwise."""
+        self.parser: parser7.Parser = parser
+        self.stats: Dict[str, RuleStat] = dict()
+        self.stacks: Dict[Tuple[str, ...], int] = dict()
+        self.__path: List[str] = list()
+        self.__child_ns: List[int] = list()
+        if attach:
+            self.attach()
+
+    @staticmethod
+    def rule_names() -> List[Tuple[str, str]]:
+        """List (attribute name, rule name) pairs of profiled Parser methods."""
+        names: List[Tuple[str, str]] = [(name, name) for name in PUBLIC_RULES]
+        for attr in vars(parser7.Parser):
+            if attr.startswith(PRIVATE_PREFIX) and callable(getattr(parser7.Parser, attr)):
+                names.append((attr, attr[len(PRIVATE_PREFIX):]))
+        return names
+
+    def attach(self) -> None:
+        """Shadow rule methods and dispatch table entries by wrappers."""
+        by_func: Dict[Callable, Callable] = dict()
+        for attr, rule in self.rule_names():
+            method: Callable = getattr(self.parser, attr)
+            wrapper: Callable = self.__wrap(rule, method)
+            setattr(self.parser, attr, wrapper)
+            by_func[method.__func__] = wrapper
+        for table in self.parser.tables.values():
+            for tok_id, handler in table.items():
+                if getattr(handler, "__self__", None) is self.parser and handler.__func__ in by_func:
+                    table[tok_id] = by_func[handler.__func__]
+
+    def detach(self) -> None:
+        """Restore plain rule methods and dispatch table entries."""
+        for attr, _ in self.rule_names():
+            self.parser.__dict__.pop(attr, None)
+        for table in self.parser.tables.values():
+            for tok_id, handler in table.items():
+                table[tok_id] = getattr(handler, "__profiled__", handler)
+
+    def __wrap(self, rule: str, method: Callable) -> Callable:
+        """Wrap bound method into one counting and timing the rule."""
+        stat: RuleStat = self.stats.setdefault(rule, RuleStat())
+        path: List[str] = self.__path
+        child_ns: List[int] = self.__child_ns
+        stacks: Dict[Tuple[str, ...], int] = self.stacks
+        clock: Callable[[], int] = time.perf_counter_ns
+
+        def wrapper(*args, **kwargs):
+            stat.calls += 1
+            path.append(rule)
+            child_ns.append(0)
+            start: int = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed: int = clock() - start
+                self_ns: int = elapsed - child_ns.pop()
+                key: Tuple[str, ...] = tuple(path)
+                path.pop()
+                stat.self_ns += self_ns
+                if rule not in path:
+                    stat.cum_ns += elapsed
+                stacks[key] = stacks.get(key, 0) + self_ns
+                if child_ns:
+                    child_ns[-1] += elapsed
+
+        wrapper.__name__ = rule
+        wrapper.__profiled__ = method
+        return wrapper
+
+    def report(self, limit: int = None) -> str:
+        """Convert counters of called rules into table sorted by self time.
+
+        Args:
+            limit: An int of most rules to list, all by default.
+
+        Returns:
+            A multi-line string with a row per rule.
+        """
+        stats: List[Tuple[str, RuleStat]] = sorted(
+            ((rule, stat) for rule, stat in self.stats.items() if stat.calls),
+            key=lambda item: item[1].self_ns, reverse=True)
+        total_ns: int = sum(stat.self_ns for _, stat in stats) or 1
+        lines: List[str] = ["{:<28}{:>10}{:>12}{:>12}{:>8}".format("rule", "calls", "cum ms", "self ms", "self %")]
+        for rule, stat in stats[:limit]:
+            lines.append("{:<28}{:>10}{:>12.3f}{:>12.3f}{:>8.1f}".format(
+                rule, stat.calls, stat.cum_ns / 1e6, stat.self_ns / 1e6, 100 * stat.self_ns / total_ns))
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        """Convert call paths into collapsed stack lines of self nanoseconds."""
+        return "".join("{} {}\n".format(";".join(key), ns) for key, ns in sorted(self.stacks.items()))
+
+    def write_collapsed(self, out_file: str) -> None:
+        """Save call paths in collapsed stack format for flamegraph tools.
+
+        Args:
+            out_file: A string of filepath to write.
+        """
+        with open(out_file, "w") as out:
+            out.write(self.collapsed())
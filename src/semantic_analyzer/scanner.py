@@ -18,6 +18,7 @@ class Scanner(object):
         chario: A chario object to receive text stream from.
         buffer: A list of strings for temporary character storage.
         char: A string of single character received from chario.
+        tok_count: An int of number of tokens recognized.
     """
 
     def __init__(self, cio: chario.Chario) -> None:
@@ -25,6 +26,7 @@ class Scanner(object):
         self.chario: chario.Chario = cio
         self.buffer: List[str] = list()
         self.char: str = self.chario.get_char()
+        self.tok_count: int = 0
 
     def __get_char(self) -> None:
         """Update self char attribute with next character from chario."""
@@ -85,15 +87,32 @@ class Scanner(object):
         """Read stream and recognize single operator token."""
         return token.lit_to_tok(self.buffer[0])
 
+    def seek(self, line: int, column: int) -> None:
+        """Continue reading at source position, skipping text before it.
+
+        Args:
+            line: An int of line number of a token start.
+            column: An int of column of that token start.
+        """
+        self.chario.line = self.chario.src[line - 1]
+        self.chario.line_count = line
+        self.chario.column = column
+        self.char = self.chario.line[column - 1].lower()
+
     def next_token(self) -> token.Token:
         """Recognize token from text stream provided by chario object.
 
         Return:
-            A Token class instance containinig recognized token.
+            A Token class instance containinig recognized token
+            with its source position.
         """
         self.__skip_whitespaces()
+        line: int = self.chario.line_count
+        column: int = self.chario.column
         if self.char == chr(3):
-            return token.Token("eof", "eof")
+            eof_tok: token.Token = token.Token("eof", "eof")
+            eof_tok.line, eof_tok.column, eof_tok.index = line, column, self.tok_count
+            return eof_tok
         self.__reset_buffer()
         new_tok: token.Token = None
         if self.char.isdigit():
@@ -108,4 +127,8 @@ class Scanner(object):
                     self.chario.put_error("An unknown symbol")
             else:
                 self.__get_char()
-        return new_tok if new_tok else self.next_token()
+        if not new_tok:
+            return self.next_token()
+        new_tok.line, new_tok.column, new_tok.index = line, column, self.tok_count
+        self.tok_count += 1
+        return new_tok
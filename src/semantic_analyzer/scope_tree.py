@@ -0,0 +1,185 @@
+"""ScopeTree class retaining exited scopes for position queries.
+
+Attaching a ScopeTree to a parser shadows enter_scope and exit_scope of
+its symbol table, so that each scope is kept once exited. Its span runs
+from the token before it was entered, such as the procedure name, to the
+token consumed last when it was exited, the "end" of the body, or to the
+end of a scope exited before if later. Its symbol dict is no longer
+changed by then, and is kept behind a read-only view.
+
+Queries sort the scopes by start once, so that finding the innermost
+scope at a position is a bisection followed by a walk up the enclosing
+scopes that end before it. Each symbol counts as visible from the name
+in its declaration on, and the symbols of a snapshot from the point
+they were restored.
+
+Meant for a parser not in lazy mode; a deferred body is kept with its
+parameters only.
+
+Typical usage example:
+    new_parser = Parser(cio_instance, scn_instance)
+    tree = ScopeTree()
+    tree.attach(new_parser)
+    new_parser.compilation()
+    for name, sym_ent in tree.visible_at(812, 14).items():
+        print(name, sym_ent.role_name)
+"""
+
+
+from bisect import bisect_right
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Tuple
+import parser7
+from symbol_entry import R_NONE, SymbolEntry as SymEnt
+
+
+# Source position as (line, column)
+Position = Tuple[int, int]
+
+
+class ScopeNode(object):
+    """Exited scope with its source span.
+
+    Attributes:
+        level: An int of scope level.
+        start: A Position where the scope starts.
+        end: A Position where the scope ends.
+        symbols: A read-only mapping of name to SymbolEntry declared in it.
+        parent: A ScopeNode of enclosing scope, None at outermost.
+        children: A list of ScopeNode instances of scopes nested in it.
+    """
+
+    __slots__ = ("level", "start", "end", "symbols", "parent", "children")
+
+    def __init__(self, level: int, start: Position, end: Position, symbols: Mapping[str, SymEnt]) -> None:
+        """Init with level, span and symbols, not yet linked."""
+        self.level: int = level
+        self.start: Position = start
+        self.end: Position = end
+        self.symbols: Mapping[str, SymEnt] = symbols
+        self.parent: ScopeNode = None
+        self.children: List[ScopeNode] = list()
+
+    def __contains__(self, pos: Position) -> bool:
+        """Test if position is within span."""
+        return self.start <= pos <= self.end
+
+
+class ScopeTree(object):
+    """Scopes of a program, nested as in source, indexed by start.
+
+    Attributes:
+        nodes: A list of ScopeNode instances in order of start, once
+            indexed, else in order of exit.
+        starts: A list of Position of nodes, for bisection.
+        declared: A dict mapping SymbolEntry to Position of its name in
+            declaration, predefined ones missing.
+    """
+
+    def __init__(self) -> None:
+        """Init with no scopes."""
+        self.nodes: List[ScopeNode] = list()
+        self.starts: List[Position] = list()
+        self.declared: Dict[SymEnt, Position] = dict()
+        self.__opens: Dict[int, Position] = dict()
+        self.__last_end: Position = (0, 0)
+
+    def attach(self, parser: parser7.Parser) -> None:
+        """Record scopes of parser as they are entered and exited.
+
+        Scopes already open, such as that of predefined names, start at
+        the beginning of the source, and so do symbols already declared.
+        """
+        table = parser.table
+        for level in range(table.level + 1):
+            self.__opens[level] = (0, 0)
+        enter_scope: Callable[[], None] = table.enter_scope
+        exit_scope: Callable[[], None] = table.exit_scope
+        enter_symbol: Callable[[str, int], SymEnt] = table.enter_symbol
+        enter_entries: Callable[[List[SymEnt]], None] = table.enter_entries
+
+        def position() -> Position:
+            tok = parser.last_token
+            return (tok.line, tok.column) if tok else (0, 0)
+
+        def enter_wrapper() -> None:
+            enter_scope()
+            self.__opens[table.level] = position()
+
+        def exit_wrapper() -> None:
+            start: Position = self.__opens.pop(table.level, None)
+            if start is not None:
+                end: Position = max(position() if parser.last_token else start, self.__last_end)
+                self.__last_end = end
+                self.nodes.append(ScopeNode(table.level, start, end, MappingProxyType(table.stack[-1])))
+                self.starts.clear()
+            exit_scope()
+
+        def enter_symbol_wrapper(key: str, role: int = R_NONE) -> SymEnt:
+            sym_ent: SymEnt = enter_symbol(key, role)
+            if sym_ent:  # Name just consumed
+                self.declared[sym_ent] = position()
+            return sym_ent
+
+        def enter_entries_wrapper(entries: List[SymEnt]) -> None:
+            enter_entries(entries)
+            self.declared.update(dict.fromkeys(entries, position()))
+
+        table.enter_scope = enter_wrapper
+        table.exit_scope = exit_wrapper
+        table.enter_symbol = enter_symbol_wrapper
+        table.enter_entries = enter_entries_wrapper
+
+    def __index(self) -> None:
+        """Sort nodes by start and link them to enclosing ones."""
+        self.nodes.sort(key=lambda node: (node.start, node.level))
+        self.starts = [node.start for node in self.nodes]
+        open_nodes: List[ScopeNode] = list()
+        for node in self.nodes:
+            node.children = list()
+            while open_nodes and node.start > open_nodes[-1].end:
+                open_nodes.pop()
+            node.parent = open_nodes[-1] if open_nodes else None
+            if node.parent:
+                node.parent.children.append(node)
+            open_nodes.append(node)
+
+    def scope_at(self, line: int, column: int) -> ScopeNode:
+        """Innermost scope whose span holds position, None if none does."""
+        if not self.starts:
+            self.__index()
+        pos: Position = (line, column)
+        i: int = bisect_right(self.starts, pos) - 1
+        node: ScopeNode = self.nodes[i] if i >= 0 else None
+        while node and pos not in node:
+            node = node.parent
+        return node
+
+    def visible_at(self, line: int, column: int) -> Dict[str, SymEnt]:
+        """Symbols declared before position, inner declarations hiding outer ones.
+
+        Args:
+            line: An int of line number.
+            column: An int of column number, as in tokens.
+
+        Returns:
+            A dict mapping name to SymbolEntry.
+        """
+        chain: List[ScopeNode] = list()
+        node: ScopeNode = self.scope_at(line, column)
+        while node:
+            chain.append(node)
+            node = node.parent
+        pos: Position = (line, column)
+        declared: Dict[SymEnt, Position] = self.declared
+        visible: Dict[str, SymEnt] = dict()
+        for node in reversed(chain):
+            visible.update((name, sym_ent) for name, sym_ent in node.symbols.items()
+                           if declared.get(sym_ent, (0, 0)) <= pos)
+        return visible
+
+    def roots(self) -> List[ScopeNode]:
+        """Outermost scopes in source order."""
+        if not self.starts:
+            self.__index()
+        return [node for node in self.nodes if node.parent is None]
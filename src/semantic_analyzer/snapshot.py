@@ -0,0 +1,280 @@
+"""SnapshotStore class keeping declarations shared by source programs.
+
+A parser given a store saves the symbols entered by the leading type,
+object and number declarations of the outermost procedure, which stop at
+its first nested procedure or at "begin", together with the types they
+interned. The snapshot is keyed by the position where the declarations
+end, a digest of the source text before it, and the folding limits the
+constants were computed under. A later program starting with the same
+text, analyzed under the same limits, gets the symbols restored, and
+parsing continues after them.
+
+Finding a snapshot digests the source once, up to the farthest position
+kept, checking the digest at each position on the way. A store keeps
+the snapshots used most recently, up to a limit.
+
+Only declarations analyzed without errors are saved, as errors would
+have to be reported again. Restored symbols and types are fresh copies,
+apart from the predefined types, which keep their identity.
+
+Stores are JSON, holding symbols and types as plain records that refer
+to each other by index, so that reading a store never runs code from
+it. A file that is not such a store is taken as empty, and replaced
+when saved.
+
+Typical usage example:
+    store = SnapshotStore("decls.snapshot")
+    new_parser = Parser(cio_instance, scn_instance, snapshots=store)
+    new_parser.compilation()
+    store.save()
+"""
+
+
+from typing import Callable, Dict, List, Set, Tuple, Union
+import hashlib
+import json
+import os
+from symbol_entry import SymbolEntry as SymEnt
+from type_descriptor import (
+    ARRAY, BOOL_TYPE, CHAR_TYPE, INT_TYPE, NO_TYPE, SUBRANGE, ArrayDescriptor, EnumDescriptor,
+    SubrangeDescriptor, TypeDescriptor)
+
+
+# PREDEFINED_TYPES maps persistent id to predefined type descriptor.
+PREDEFINED_TYPES: Dict[str, TypeDescriptor] = {
+    "no_type": NO_TYPE, "bool_type": BOOL_TYPE, "char_type": CHAR_TYPE, "int_type": INT_TYPE}
+
+# Snapshot key as (line, column, digest) of end of declarations, and
+# (max_const_bits, fold_budget) of folding limits
+Key = Tuple[int, int, str, int, float]
+
+# Folding limits as (max_const_bits, fold_budget)
+Limits = Tuple[int, float]
+
+# Default number of snapshots kept by a store
+MAX_SNAPSHOTS: int = 64
+
+# Reference to type in stored data: persistent id if predefined, else
+# index into type records
+TypeRef = Union[str, int]
+
+
+def _table_key(desc: TypeDescriptor) -> Tuple:
+    """Structure key of interned type, as made by TypeTable."""
+    if desc.form == SUBRANGE:
+        return SUBRANGE, desc.lower, desc.upper, desc.super_type
+    return ARRAY, desc.index_types, desc.base_type
+
+
+def _encode(entries: List[SymEnt], types: Dict[Tuple, TypeDescriptor]) -> Dict[str, object]:
+    """Convert symbols and interned types into plain data for JSON.
+
+    Literals of enumerations are appended to the symbols unless among
+    them, and only the first count symbols are entered when restored.
+    """
+    type_refs: Dict[int, TypeRef] = {id(desc): pid for pid, desc in PREDEFINED_TYPES.items()}
+    entry_refs: Dict[int, int] = {id(sym_ent): i for i, sym_ent in enumerate(entries)}
+    all_entries: List[SymEnt] = list(entries)
+    type_records: List[list] = list()
+
+    def entry_ref(sym_ent: SymEnt) -> int:
+        ref: int = entry_refs.get(id(sym_ent))
+        if ref is None:
+            ref = entry_refs[id(sym_ent)] = len(all_entries)
+            all_entries.append(sym_ent)
+        return ref
+
+    def type_ref(desc: TypeDescriptor) -> TypeRef:
+        ref: TypeRef = type_refs.get(id(desc))
+        if ref is None:  # Numbered first, so that a cycle ends here
+            ref = type_refs[id(desc)] = len(type_records)
+            type_records.append(None)
+            if isinstance(desc, SubrangeDescriptor):
+                record: list = ["subrange", desc.lower, desc.upper, type_ref(desc.super_type)]
+            elif isinstance(desc, ArrayDescriptor):
+                record = ["array", [type_ref(t) for t in desc.index_types], type_ref(desc.base_type)]
+            elif isinstance(desc, EnumDescriptor):
+                record = ["enum", [entry_ref(s) for s in desc.identifiers]]
+            else:
+                record = ["none"]
+            type_records[ref] = record
+        return ref
+
+    entry_records: List[list] = list()
+    table: List[TypeRef] = [type_ref(desc) for desc in types.values()]
+    for sym_ent in all_entries:  # Grows by literals met on the way
+        signature: list = None
+        if sym_ent.signature is not None:
+            signature = [[mode, type_ref(desc)] for mode, desc in sym_ent.signature]
+        entry_records.append([sym_ent.name, sym_ent.role, sym_ent.val, type_ref(sym_ent.type), signature])
+    return {"count": len(entries), "entries": entry_records, "types": type_records, "table": table}
+
+
+def _decode(data: Dict[str, object]) -> Tuple[List[SymEnt], Dict[Tuple, TypeDescriptor]]:
+    """Make fresh symbols and interned types from data of _encode."""
+    entries: List[SymEnt] = [SymEnt(name, role, val) for name, role, val, _, _ in data["entries"]]
+    new_desc: Dict[str, Callable[[], TypeDescriptor]] = {
+        "subrange": lambda: SubrangeDescriptor(None, None), "array": lambda: ArrayDescriptor((), NO_TYPE),
+        "enum": EnumDescriptor, "none": TypeDescriptor}
+    descs: List[TypeDescriptor] = [new_desc[record[0]]() for record in data["types"]]
+
+    def desc_of(ref: TypeRef) -> TypeDescriptor:
+        return PREDEFINED_TYPES[ref] if isinstance(ref, str) else descs[ref]
+
+    for desc, record in zip(descs, data["types"]):  # Filled in once all exist
+        if record[0] == "subrange":
+            desc.lower, desc.upper, desc.super_type = record[1], record[2], desc_of(record[3])
+        elif record[0] == "array":
+            desc.index_types, desc.base_type = tuple(desc_of(ref) for ref in record[1]), desc_of(record[2])
+        elif record[0] == "enum":
+            desc.identifiers = tuple(entries[i] for i in record[1])
+    for sym_ent, (_, _, _, ref, signature) in zip(entries, data["entries"]):
+        sym_ent.set_type(desc_of(ref))
+        if signature is not None:
+            sym_ent.set_signature(tuple((mode, desc_of(ref)) for mode, ref in signature))
+    types: Dict[Tuple, TypeDescriptor] = {_table_key(desc_of(ref)): desc_of(ref) for ref in data["table"]}
+    return entries[:data["count"]], types
+
+
+def prefix_digest(src: List[str], line: int, column: int) -> str:
+    """Digest of source text before position, None if beyond source.
+
+    Args:
+        src: A list of strings of source lines, with newlines.
+        line: An int of line number of position.
+        column: An int of column of position, as in tokens.
+    """
+    if not src or line > len(src):
+        return None
+    digest = hashlib.sha1()
+    for text in src[:line - 1]:
+        digest.update(text.encode())
+    digest.update(src[line - 1][:column - 1].encode())
+    return digest.hexdigest()
+
+
+class Snapshot(object):
+    """Declarations restored from a store.
+
+    Attributes:
+        line: An int of line of the token following the declarations.
+        column: An int of column of that token.
+        tok_index: An int of index of that token in token stream.
+        entries: A list of SymbolEntry instances in declaration order.
+        types: A dict of structure key to TypeDescriptor, as in TypeTable.
+    """
+
+    def __init__(self, key: Key, tok_index: int, entries: List[SymEnt],
+                 types: Dict[Tuple, TypeDescriptor]) -> None:
+        """Init with key, token index, symbols and interned types."""
+        self.line, self.column = key[0], key[1]
+        self.tok_index: int = tok_index
+        self.entries: List[SymEnt] = entries
+        self.types: Dict[Tuple, TypeDescriptor] = types
+
+
+class SnapshotStore(object):
+    """Snapshots of declarations kept in a file.
+
+    Attributes:
+        path: A string of filepath of store, None to keep it in memory.
+        snapshots: A dict mapping Key to (token index, data of symbols and
+            types) pair, least recently used first.
+        max_snapshots: An int of snapshots kept at most.
+        changed: A bool indicating if snapshots were added or used since
+            loaded.
+    """
+
+    def __init__(self, path: str = None, max_snapshots: int = MAX_SNAPSHOTS) -> None:
+        """Init with filepath and limit, loading snapshots saved there."""
+        self.path: str = path
+        self.snapshots: Dict[Key, Tuple[int, Dict[str, object]]] = dict()
+        self.max_snapshots: int = max_snapshots
+        self.changed: bool = False
+        if path and os.path.isfile(path):
+            try:
+                with open(path) as store_file:
+                    stored: list = json.load(store_file)
+                self.snapshots = {tuple(key): (tok_index, data) for key, tok_index, data in stored}
+            except (ValueError, TypeError):
+                self.snapshots = dict()
+
+    def __len__(self) -> int:
+        """Number of snapshots."""
+        return len(self.snapshots)
+
+    def find(self, src: List[str], limits: Limits) -> Snapshot:
+        """Snapshot of the longest declarations the source starts with.
+
+        Args:
+            src: A list of strings of source lines, with newlines.
+            limits: A Limits tuple the source is analyzed under.
+
+        Returns:
+            A Snapshot instance, None if no snapshot matches.
+        """
+        positions: Dict[Tuple[int, int], Set[str]] = dict()
+        for line, column, digest, *key_limits in self.snapshots:
+            if tuple(key_limits) == limits and line <= len(src):
+                positions.setdefault((line, column), set()).add(digest)
+        found: Key = None
+        digest = hashlib.sha1()
+        done: int = 0  # Lines digested so far
+        for line, column in sorted(positions):
+            for text in src[done:line - 1]:
+                digest.update(text.encode())
+            done = line - 1
+            partial = digest.copy()
+            partial.update(src[line - 1][:column - 1].encode())
+            hexdigest: str = partial.hexdigest()
+            if hexdigest in positions[(line, column)]:
+                found = (line, column, hexdigest) + limits
+        if found is None:
+            return None
+        if found != list(self.snapshots)[-1]:  # Make it the most recently used
+            self.snapshots[found] = self.snapshots.pop(found)
+            self.changed = True
+        tok_index, data = self.snapshots[found]
+        try:
+            entries, types = _decode(data)
+        except (LookupError, TypeError, ValueError):  # Not written by _encode
+            del self.snapshots[found]
+            return None
+        return Snapshot(found, tok_index, entries, types)
+
+    def add(self, src: List[str], line: int, column: int, limits: Limits, tok_index: int,
+            entries: List[SymEnt], types: Dict[Tuple, TypeDescriptor]) -> None:
+        """Keep declarations ending before position, unless already kept.
+
+        The least recently used snapshots are dropped beyond max_snapshots.
+
+        Args:
+            src: A list of strings of source lines, with newlines.
+            line: An int of line of the token following the declarations.
+            column: An int of column of that token.
+            limits: A Limits tuple the declarations were analyzed under.
+            tok_index: An int of index of that token in token stream.
+            entries: A list of SymbolEntry instances in declaration order.
+            types: A dict of structure key to TypeDescriptor, as in TypeTable.
+        """
+        digest: str = prefix_digest(src, line, column)
+        key: Key = (line, column, digest) + limits
+        if digest is None or key in self.snapshots:
+            return
+        self.snapshots[key] = (tok_index, _encode(entries, types))
+        for old_key in list(self.snapshots)[:max(len(self.snapshots) - self.max_snapshots, 0)]:
+            del self.snapshots[old_key]
+        self.changed = True
+
+    def save(self) -> None:
+        """Write snapshots to file, if any were added or used.
+
+        The file is replaced at once, so that a store being read never
+        appears half written.
+        """
+        if self.path and self.changed:
+            temp_path: str = self.path + ".tmp"
+            with open(temp_path, "w") as store_file:
+                json.dump([[key, tok_index, data] for key, (tok_index, data) in self.snapshots.items()], store_file)
+            os.replace(temp_path, self.path)
+            self.changed = False
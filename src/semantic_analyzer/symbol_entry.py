@@ -2,36 +2,78 @@
 
 Typical usage example:
     new_se = SymbolEntry("column_index")
-    new_se = SymbolEntry("column_index", "const")
-    new_se = SymbolEntry("i", "var", "1")
-    se_instance.append(new_se)
-    se_instance.set_role("param")
-    se_instance.set_value("1")
+    new_se = SymbolEntry("column_index", R_CONST)
+    new_se = SymbolEntry("i", R_VAR, 1)
+    se_instance.set_role(R_PARAM)
+    se_instance.set_value(1)
+    if se_instance.role & (R_VAR | R_PARAM):
+        print(se_instance.role_name)
+    new_group = SymbolGroup([se_instance])
+    new_group.append(new_se)
+    new_group.set_role(R_VAR)
 """
 
-from typing import Set
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from type_descriptor import NO_TYPE, TypeDescriptor
+
+
+# Value of constant expression: int, bool, or None if not known
+Value = Optional[Union[int, bool]]
+
+# Procedure signature: (mode, type) of each parameter in declaration order
+Signature = Tuple[Tuple[str, TypeDescriptor], ...]
+
+
+def format_value(val: Value) -> str:
+    """Convert value into TinyAda text, None if not known."""
+    if type(val) is bool:
+        return "true" if val else "false"
+    return None if val is None else str(val)
+
+
+# Role bit flags, so that a set of expected roles is a single int mask.
+# R_NONE is the role of an identifier not yet known to be anything.
+R_NONE: int = 0
+R_CONST: int = 1
+R_VAR: int = 2
+R_TYPE: int = 4
+R_PROC: int = 8
+R_PARAM: int = 16
+
+# ROLE_NAMES maps role flag to its name in source terms, ROLE_TITLES to display name.
+ROLE_NAMES: Dict[int, str] = {
+    R_NONE: None, R_CONST: "const", R_VAR: "var", R_TYPE: "type", R_PROC: "proc", R_PARAM: "param"}
+ROLE_TITLES: Dict[int, str] = {
+    R_NONE: "None", R_CONST: "Constant", R_VAR: "Variable", R_TYPE: "Type",
+    R_PROC: "Procedure", R_PARAM: "Parameter"}
 
 
 class SymbolEntry(object):
     """Record information about identifier.
 
     Attributes:
-        valid_roles: A set of strings containing valid roles.
         name: A string of name.
-        role: A string of role.
-        val: A string of value.
-        next: A SymbolEntry instance appended.
+        role: An int of role flag, R_NONE if not known.
+        val: An int or bool of value, None if not known.
+        type: A TypeDescriptor of type, of object or of type name.
+        signature: A tuple of (mode, TypeDescriptor) pairs of parameters of
+            procedure, None if not a procedure or not known.
     """
 
-    # A set of strings containg valid symbol entry roles
-    valid_roles: Set[str] = {"const", "var", "type", "proc", "param"}
+    __slots__ = ("name", "role", "val", "type", "signature")
 
-    def __init__(self, id: str, role: str = None, val: str = None) -> None:
+    def __init__(self, id: str, role: int = R_NONE, val: Value = None) -> None:
         """Init with identifier name, optional role, and optional value."""
         self.name: str = id
-        self.role: str = role if (role and role in self.valid_roles) else None
-        self.val: str = val if val else None
-        self.next: SymbolEntry = None
+        self.role: int = role
+        self.val: Value = val
+        self.type: TypeDescriptor = NO_TYPE
+        self.signature: Signature = None
+
+    @property
+    def role_name(self) -> str:
+        """Name of role, such as "const", None if not known."""
+        return ROLE_NAMES[self.role]
 
     def __str__(self) -> str:
         """Convert contents into string.
@@ -39,47 +81,91 @@ class SymbolEntry(object):
         Returns:
             A string representing self contents.
         """
-        if self.role == "const":
-            role = "Constant"
-        elif self.role == "var":
-            role = "Variable"
-        elif self.role == "type":
-            role = "Type"
-        elif self.role == "proc":
-            role = "Procedure"
-        elif self.role == "param":
-            role = "Parameter"
-        else:
-            role = "None"
-        return "Name:{:<16} | Role:{:<5} | Value: {}".format(self.name, role, self.val)
-
-    def append(self, se) -> None:
+        return "Name:{:<16} | Role:{:<5} | Value: {}".format(self.name, ROLE_TITLES[self.role], format_value(self.val))
+
+    def set_role(self, role: int) -> None:
+        """Set a role.
+
+        Args:
+            role: An int of role flag.
+        """
+        self.role = role
+
+    def set_value(self, val: Value) -> None:
+        """Set a value.
+
+        Args:
+            val: An int or bool of identifier value, None if not known.
+        """
+        self.val = val
+
+    def set_type(self, type_desc: TypeDescriptor) -> None:
+        """Set a type.
+
+        Args:
+            type_desc: A TypeDescriptor of identifier type.
+        """
+        self.type = type_desc
+
+    def set_signature(self, signature: Signature) -> None:
+        """Set a procedure signature.
+
+        Args:
+            signature: A tuple of (mode, TypeDescriptor) pairs of parameters.
+        """
+        self.signature = signature
+
+
+class SymbolGroup(object):
+    """Identifiers declared together by an identifier list.
+
+    Attributes:
+        entries: A list of SymbolEntry instances in declaration order.
+    """
+
+    def __init__(self, entries: List[SymbolEntry] = None) -> None:
+        """Init with optional list of entries."""
+        self.entries: List[SymbolEntry] = entries if entries is not None else list()
+
+    def __iter__(self) -> Iterator[SymbolEntry]:
+        """Iterate over entries in declaration order."""
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        """Number of entries."""
+        return len(self.entries)
+
+    def append(self, se: SymbolEntry) -> None:
         """Append SymbolEntry instance.
 
         Args:
-            se: A SymbolEntry instance to be appended to self.
+            se: A SymbolEntry instance to be appended to group.
         """
-        if not self.next:
-            self.next = se
-        else:
-            self.next.append(se)
+        self.entries.append(se)
 
-    def set_role(self, role: str) -> None:
-        """Set a role.
+    def set_role(self, role: int) -> None:
+        """Set a role of every entry.
 
         Args:
-            role: A string of identifier role.
+            role: An int of role flag.
         """
-        self.role = role if (role and role in self.valid_roles) else None
-        if self.next:
-            self.next.set_role(role)
+        for se in self.entries:
+            se.set_role(role)
 
-    def set_value(self, val: str) -> None:
-        """Set a value.
+    def set_value(self, val: Value) -> None:
+        """Set a value of every entry.
+
+        Args:
+            val: An int or bool of identifier value, None if not known.
+        """
+        for se in self.entries:
+            se.set_value(val)
+
+    def set_type(self, type_desc: TypeDescriptor) -> None:
+        """Set a type of every entry.
 
         Args:
-            val: A string of identifier value.
+            type_desc: A TypeDescriptor of identifier type.
         """
-        self.val = val if val else None
-        if self.next:
-            self.next.set_value(val)
+        for se in self.entries:
+            se.set_type(type_desc)
@@ -4,23 +4,36 @@ Typical usage example:
     new_st = SymbolTable(new_cio)
     st_instance.enter_scope()
     st_instance.exit_scope()
-    se_instance.enter_symbol("column_index", "const")
+    se_instance.enter_symbol("column_index", R_CONST)
     se_instance.enter_symbol("x")
     se_instance.find_symbol("j")
 """
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 import chario
-from symbol_entry import SymbolEntry as SymEnt
+from symbol_entry import R_NONE, SymbolEntry as SymEnt
 
 
 class SymbolTable(object):
     """A stack of dictionaries containing identifier information.
 
+    Besides the scope stack, every visible name maps to the stack of its
+    entries from outermost to innermost declaration, so that a lookup is
+    a single probe however deep the nesting, and leaving a scope costs
+    only as much as the names it declared.
+
+    Each scope also keeps the names not found while it was innermost,
+    so that an undeclared name is reported once per scope, and the
+    number of its uses is noted when the scope is left.
+
     Attributes:
         stack: A list of dictionaries with string keys and SymbolEntry values.
         level: An integer representing current scope level.
         chario: A Chario instance for error submission.
+        names: A dictionary with string keys and lists of SymbolEntry values,
+            innermost declaration last.
+        misses: A list of dictionaries, one per scope, mapping undeclared
+            name to its number of uses in that scope.
     """
 
     def __init__(self, cio: chario.Chario) -> None:
@@ -28,6 +41,8 @@ class SymbolTable(object):
         self.stack: List[Dict[str, SymEnt]] = list()
         self.level: int = -1
         self.chario: chario.Chario = cio
+        self.names: Dict[str, List[SymEnt]] = dict()
+        self.misses: List[Dict[str, int]] = list()
 
     def enter_scope(self) -> None:
         """Increment level attribute and push new symbol table onto stack.
@@ -35,6 +50,7 @@ class SymbolTable(object):
         Print level number if given verbose option.
         """
         self.stack.append(dict())
+        self.misses.append(dict())
         self.level += 1
         if self.chario.is_verbose:
             print("*** Entered level {}".format(self.level))
@@ -42,14 +58,59 @@ class SymbolTable(object):
     def exit_scope(self) -> None:
         """Decrement level attribute and pop last symbol table in stack.
 
+        Note undeclared names used more than once in the scope.
         Print level number and symbol table if given verbose option.
         """
+        for key, count in self.misses.pop().items():
+            if count > 1:
+                self.chario.put_note("Undeclared identifier {} used {} times".format(key, count))
         table: Dict[str, SymEnt] = self.stack.pop()
+        names: Dict[str, List[SymEnt]] = self.names
+        for key in table:
+            entries: List[SymEnt] = names[key]
+            entries.pop()
+            if not entries:
+                del names[key]
         if self.chario.is_verbose:
             self.__print_table(table)
             print("*** Exited level {}".format(self.level))
         self.level -= 1
 
+    def scope_size(self) -> int:
+        """Number of symbols in current scope."""
+        return len(self.stack[-1])
+
+    def save(self) -> Tuple[List[Dict[str, SymEnt]], int, Dict[str, List[SymEnt]], List[Dict[str, int]]]:
+        """Take current scopes away, to be put back by load.
+
+        Returns:
+            A tuple of scope stack, level, name dictionary and misses.
+        """
+        state = self.stack, self.level, self.names, self.misses
+        self.stack, self.level, self.names, self.misses = list(), -1, dict(), list()
+        return state
+
+    def load(self, state: Tuple[List[Dict[str, SymEnt]], int, Dict[str, List[SymEnt]], List[Dict[str, int]]]) -> None:
+        """Put back scopes taken away by save."""
+        self.stack, self.level, self.names, self.misses = state
+
+    def rebuild(self, stack: List[Dict[str, SymEnt]]) -> None:
+        """Replace scopes by given symbol tables, outermost first, silently."""
+        self.stack = stack
+        self.level = len(stack) - 1
+        self.names = dict()
+        self.misses = [dict() for _ in stack]
+        for table in stack:
+            for key, s in table.items():
+                self.names.setdefault(key, list()).append(s)
+
+    def enter_entries(self, entries: List[SymEnt]) -> None:
+        """Enter existing symbols into current symbol table, silently."""
+        table: Dict[str, SymEnt] = self.stack[-1]
+        for s in entries:
+            table[s.name] = s
+            self.names.setdefault(s.name, list()).append(s)
+
     def __print_table(self, table: Dict[str, SymEnt]) -> None:
         """Convert single symbol table into string.
 
@@ -60,14 +121,14 @@ class SymbolTable(object):
         for s in table.values():
             print(s)
 
-    def enter_symbol(self, key: str, role: str = None) -> SymEnt:
+    def enter_symbol(self, key: str, role: int = R_NONE) -> SymEnt:
         """Enter new symbol into current symbol table.
 
         Add error to Chario instance if symbol had been previously declared.
 
         Args:
             key: A string of identifier name.
-            role: A string of identifier role.
+            role: An int of identifier role flag.
 
         Returns:
             A SymbolEntry instance corresponding to newly added identifier.
@@ -77,14 +138,21 @@ class SymbolTable(object):
             self.chario.put_error("Identifier already declared in this block.")
             return None
         else:
-            s: SymEnt = SymEnt(key, role) if role else SymEnt(key)
+            s: SymEnt = SymEnt(key, role)
             table[key] = s
+            self.misses[-1].pop(key, None)
+            entries: List[SymEnt] = self.names.get(key)
+            if entries is None:
+                self.names[key] = [s]
+            else:
+                entries.append(s)
             return s
 
     def find_symbol(self, key: str) -> SymEnt:
         """Find symbol in current symbol table.
 
-        Add error to Chario instance if symbol had been previously not declared.
+        Add error to Chario instance if symbol had been previously not
+        declared, unless already added for a use in the current scope.
 
         Args:
             key: A string of identifier name.
@@ -92,9 +160,12 @@ class SymbolTable(object):
         Returns:
             A SymbolEntry instance corresponding to identifier to be found.
         """
-        for i in range(len(self.stack) - 1, -1, -1):
-            table: Dict[str, SymEnt] = self.stack[i]
-            if key in table:
-                return table[key]
-        self.chario.put_error("Undeclared identifier")
+        entries: List[SymEnt] = self.names.get(key)
+        if entries:
+            return entries[-1]
+        misses: Dict[str, int] = self.misses[-1]
+        count: int = misses.get(key, 0)
+        if not count:
+            self.chario.put_error("Undeclared identifier")
+        misses[key] = count + 1
         return None
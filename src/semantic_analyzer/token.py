@@ -72,6 +72,9 @@ class Token(object):
         valid_tok_type: A set of strings containing valid token types.
         lit: A string of literal code.
         tok_id: A string of token id.
+        line: An int of source line number where token starts.
+        column: An int of source column number where token starts.
+        index: An int of position of token in token stream.
     """
 
     valid_tok_type: Set[str] = {"int", "id", "eol", "eof"}
@@ -84,6 +87,9 @@ class Token(object):
             self.tok_id: str = tok_type
         else:
             self.tok_id: str = LIT_DICT[lit] if lit in LIT_DICT else None
+        self.line: int = 0
+        self.column: int = 0
+        self.index: int = 0
 
     def __str__(self) -> str:
         """Convert contents into string."""
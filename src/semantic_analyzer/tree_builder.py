@@ -0,0 +1,120 @@
+"""TreeBuilder class receiving parse tree construction calls from parser.
+
+The parser reports every recognized construct to its builder, bottom up,
+within its single pass, and announces each procedure as soon as its name
+is declared. This base class builds nothing, so plain analysis pays only
+for the calls; subclasses return node handles of their own kind, which
+the parser passes back as children of enclosing constructs.
+
+Arguments named start and end are the first and last Token instances of
+the construct, group is the SymbolGroup of an identifier list, and
+nodes are whatever the builder returned for the children.
+
+Typical usage example:
+    new_parser = Parser(cio_instance, scn_instance, builder=AstBuilder())
+    new_parser.compilation()
+    root = new_parser.tree
+"""
+
+
+# Depth up to which tree dumps indent nodes; deeper ones show their depth
+MAX_DUMP_INDENT: int = 32
+
+
+def dump_indent(depth: int) -> str:
+    """Indentation of node at depth in tree dump, bounded in length."""
+    if depth <= MAX_DUMP_INDENT:
+        return "  " * depth
+    return "{}[{}] ".format("  " * MAX_DUMP_INDENT, depth)
+
+
+class TreeBuilder(object):
+    """Default builder producing no tree."""
+
+    def compilation(self, body):
+        """Build root from the outermost subprogram body."""
+        return None
+
+    def enter_subprogram(self, start, sym_ent):
+        """Note procedure whose name has just been declared."""
+        return None
+
+    def subprogram_body(self, start, end, sym_ent, params, decls, stmts):
+        """Build procedure with parameter, declaration and statement lists."""
+        return None
+
+    def param_spec(self, start, end, group, mode, type_node):
+        """Build parameter specification of identifier group and mode."""
+        return None
+
+    def object_decl(self, start, end, group, type_node):
+        """Build variable declaration."""
+        return None
+
+    def number_decl(self, start, end, group, value):
+        """Build named constant declaration."""
+        return None
+
+    def type_decl(self, start, end, sym_ent, type_node):
+        """Build type declaration."""
+        return None
+
+    def enum_def(self, start, end, group):
+        """Build enumeration type definition."""
+        return None
+
+    def array_def(self, start, end, indexes, elem_type):
+        """Build array type definition of index and element type nodes."""
+        return None
+
+    def range_def(self, start, end, low, high):
+        """Build range of two simple expressions."""
+        return None
+
+    def type_name(self, start, sym_ent):
+        """Build reference to named type."""
+        return None
+
+    def null_stmt(self, start, end):
+        """Build null statement."""
+        return None
+
+    def assign_stmt(self, start, end, target, value):
+        """Build assignment of value expression to target name."""
+        return None
+
+    def call_stmt(self, start, end, sym_ent, args):
+        """Build procedure call with optional argument list."""
+        return None
+
+    def if_stmt(self, start, end, branches, else_stmts):
+        """Build if statement of (condition, statements) pairs."""
+        return None
+
+    def loop_stmt(self, start, end, cond, stmts):
+        """Build loop statement with optional while condition."""
+        return None
+
+    def exit_stmt(self, start, end, cond):
+        """Build exit statement with optional when condition."""
+        return None
+
+    def print_stmt(self, start, end, value):
+        """Build print statement."""
+        return None
+
+    def int_lit(self, start, val):
+        """Build integer literal."""
+        return None
+
+    def name(self, start, end, sym_ent, args):
+        """Build name, indexed if argument list is given."""
+        return None
+
+    def unary(self, start, op, operand):
+        """Build unary operation of token id neg, pos or not."""
+        return None
+
+    def binary(self, op, left, right):
+        """Build binary operation of operator token id."""
+        return None
@@ -0,0 +1,191 @@
+"""TypeDescriptor classes and TypeTable interning structural types.
+
+Descriptors follow the reference TypeDescriptor, ArrayDescriptor,
+EnumDescriptor and SubrangeDescriptor. A TypeTable hands out one
+descriptor per distinct structure, so that identical anonymous types
+share one object and type equality is an identity test. Components are
+interned first, which lets a structure be keyed by its components'
+identities.
+
+Each enumeration definition declares its own literals, so no two of
+them are ever the same type. Likewise every type declaration makes a
+type of its own, so named types are copied out of the table, and only
+anonymous ones such as index ranges are shared.
+
+Typical usage example:
+    types = TypeTable()
+    digit = types.subrange(0, 9, INT_TYPE)
+    vector = types.array((digit,), INT_TYPE)
+    assert vector is types.array((types.subrange(0, 9, INT_TYPE),), INT_TYPE)
+"""
+
+
+from typing import Dict, Tuple
+
+
+# Type forms
+NONE: int = 0
+ARRAY: int = 1
+ENUM: int = 2
+SUBRANGE: int = 3
+
+FORM_NAMES: Tuple[str, ...] = ("NONE", "ARRAY", "ENUM", "SUBRANGE")
+
+
+class TypeDescriptor(object):
+    """Type of unknown form, base of descriptors.
+
+    Attributes:
+        form: An int of type form, NONE, ARRAY, ENUM or SUBRANGE.
+    """
+
+    __slots__ = ("form",)
+
+    def __init__(self, form: int = NONE) -> None:
+        """Init with type form."""
+        self.form: int = form
+
+    def __str__(self) -> str:
+        """Convert form into string."""
+        return FORM_NAMES[self.form]
+
+
+class SubrangeDescriptor(TypeDescriptor):
+    """Range of values of a scalar super type.
+
+    Attributes:
+        lower: An int of lower bound, None if not known.
+        upper: An int of upper bound, None if not known.
+        super_type: A TypeDescriptor the range is taken from; itself for
+            the predefined scalar types.
+    """
+
+    __slots__ = ("lower", "upper", "super_type")
+
+    def __init__(self, lower: int, upper: int, super_type: TypeDescriptor = None) -> None:
+        """Init with bounds and super type, itself if not given."""
+        super().__init__(SUBRANGE)
+        self.lower: int = lower
+        self.upper: int = upper
+        self.super_type: TypeDescriptor = super_type if super_type is not None else self
+
+    def __str__(self) -> str:
+        """Convert form and known bounds into string."""
+        if self.lower is None or self.upper is None:
+            return "SUBRANGE"
+        return "SUBRANGE {}..{}".format(self.lower, self.upper)
+
+
+class EnumDescriptor(TypeDescriptor):
+    """Enumeration of constant identifiers.
+
+    Attributes:
+        identifiers: A tuple of SymbolEntry instances of the literals.
+    """
+
+    __slots__ = ("identifiers",)
+
+    def __init__(self, identifiers: Tuple = ()) -> None:
+        """Init with literals."""
+        super().__init__(ENUM)
+        self.identifiers: Tuple = identifiers
+
+    def find_symbol(self, name: str):
+        """Literal of given name, None if not found."""
+        for sym_ent in self.identifiers:
+            if sym_ent.name == name:
+                return sym_ent
+        return None
+
+    def __str__(self) -> str:
+        """Convert form and literals into string."""
+        return "ENUM ({})".format(", ".join(sym_ent.name for sym_ent in self.identifiers))
+
+
+class ArrayDescriptor(TypeDescriptor):
+    """Array of a base type indexed by one or more index types.
+
+    Attributes:
+        index_types: A tuple of TypeDescriptor instances of indexes.
+        base_type: A TypeDescriptor of elements.
+    """
+
+    __slots__ = ("index_types", "base_type")
+
+    def __init__(self, index_types: Tuple[TypeDescriptor, ...], base_type: TypeDescriptor) -> None:
+        """Init with index and element types."""
+        super().__init__(ARRAY)
+        self.index_types: Tuple[TypeDescriptor, ...] = index_types
+        self.base_type: TypeDescriptor = base_type
+
+    def __str__(self) -> str:
+        """Convert form and component types into string."""
+        return "ARRAY ({}) OF {}".format(", ".join(str(t) for t in self.index_types), self.base_type)
+
+
+# Predefined types; BOOL_TYPE and INT_TYPE also type constant values
+NO_TYPE: TypeDescriptor = TypeDescriptor()
+BOOL_TYPE: SubrangeDescriptor = SubrangeDescriptor(0, 1)
+CHAR_TYPE: SubrangeDescriptor = SubrangeDescriptor(0, 127)
+INT_TYPE: SubrangeDescriptor = SubrangeDescriptor(None, None)
+
+
+def value_type(val) -> TypeDescriptor:
+    """Type of constant value, NO_TYPE if not known."""
+    if type(val) is bool:
+        return BOOL_TYPE
+    if type(val) is int:
+        return INT_TYPE
+    return NO_TYPE
+
+
+class TypeTable(object):
+    """Hash-cons table giving one descriptor per type structure.
+
+    Attributes:
+        table: A dict mapping structure key to its descriptor.
+    """
+
+    def __init__(self) -> None:
+        """Init with empty table."""
+        self.table: Dict[Tuple, TypeDescriptor] = dict()
+
+    def __len__(self) -> int:
+        """Number of distinct structural types made."""
+        return len(self.table)
+
+    def subrange(self, lower: int, upper: int, super_type: TypeDescriptor) -> TypeDescriptor:
+        """Interned range of super type, the super type itself if bounds equal its own."""
+        if isinstance(super_type, SubrangeDescriptor):
+            if (lower, upper) == (super_type.lower, super_type.upper):
+                return super_type
+            super_type = super_type.super_type
+        key: Tuple = (SUBRANGE, lower, upper, super_type)
+        desc: TypeDescriptor = self.table.get(key)
+        if desc is None:
+            desc = self.table[key] = SubrangeDescriptor(lower, upper, super_type)
+        return desc
+
+    def array(self, index_types: Tuple[TypeDescriptor, ...], base_type: TypeDescriptor) -> TypeDescriptor:
+        """Interned array of interned index and element types."""
+        key: Tuple = (ARRAY, index_types, base_type)
+        desc: TypeDescriptor = self.table.get(key)
+        if desc is None:
+            desc = self.table[key] = ArrayDescriptor(index_types, base_type)
+        return desc
+
+    def enum(self, identifiers: Tuple) -> TypeDescriptor:
+        """New enumeration of literals, distinct from any other."""
+        return EnumDescriptor(identifiers)
+
+    def named(self, type_desc: TypeDescriptor) -> TypeDescriptor:
+        """New descriptor of the structure of type_desc, for a type declaration.
+
+        A subrange keeps its super type, so that it still mixes with its
+        values. An enumeration, new already, is kept with its literals.
+        """
+        if isinstance(type_desc, ArrayDescriptor):
+            return ArrayDescriptor(type_desc.index_types, type_desc.base_type)
+        if isinstance(type_desc, SubrangeDescriptor):
+            return SubrangeDescriptor(type_desc.lower, type_desc.upper, type_desc.super_type)
+        return type_desc
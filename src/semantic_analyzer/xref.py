@@ -0,0 +1,171 @@
+"""XrefIndex class recording definitions and uses of identifiers.
+
+The parser fills the index in its single pass, when given one: the
+defining occurrence of each declared identifier, and every use resolved
+by the symbol table, tagged read, write, call, or end for the name
+closing a procedure body. Uses are kept per SymbolEntry, so that
+shadowed names of other scopes never mix, as flat int arrays of (line,
+column, kind) triples.
+
+Names given as arguments are tagged by parameter mode once the call is
+parsed: read for in, write for out, and both for in out, as two uses at
+one place. In lazy mode a body contributes once expanded.
+
+Typical usage example:
+    index = XrefIndex()
+    new_parser = Parser(cio_instance, scn_instance, xref=index)
+    new_parser.compilation()
+    for entry in index.find("i"):
+        print(entry.span, list(entry.uses_of(WRITE)))
+    index.write("xref.json")
+"""
+
+
+from array import array
+from typing import Dict, Iterator, List, Tuple
+import json
+import token
+from symbol_entry import SymbolEntry as SymEnt
+
+
+# Use kinds
+READ: int = 0
+WRITE: int = 1
+CALL: int = 2
+END: int = 3
+
+KIND_NAMES: Tuple[str, ...] = ("read", "write", "call", "end")
+
+# Use as (line, column, kind)
+Use = Tuple[int, int, int]
+
+
+class XrefEntry(object):
+    """Definition and uses of one identifier.
+
+    Attributes:
+        sym_ent: A SymbolEntry instance of the identifier.
+        line: An int of line of defining occurrence, 0 if predefined.
+        column: An int of column where defining occurrence starts.
+        end: An int of column just past defining occurrence.
+        uses: An int array of (line, column, kind) triples, a name used
+            with arguments coming after the uses within them.
+    """
+
+    __slots__ = ("sym_ent", "line", "column", "end", "uses")
+
+    def __init__(self, sym_ent: SymEnt) -> None:
+        """Init with identifier, not yet defined nor used."""
+        self.sym_ent: SymEnt = sym_ent
+        self.line: int = 0
+        self.column: int = 0
+        self.end: int = 0
+        self.uses: array = array("l")
+
+    @property
+    def span(self) -> Tuple[int, int, int]:
+        """Line, start and end column of defining occurrence."""
+        return self.line, self.column, self.end
+
+    def __len__(self) -> int:
+        """Number of uses."""
+        return len(self.uses) // 3
+
+    def __iter__(self) -> Iterator[Use]:
+        """Iterate over uses as (line, column, kind) tuples."""
+        uses: array = self.uses
+        for i in range(0, len(uses), 3):
+            yield uses[i], uses[i + 1], uses[i + 2]
+
+    def uses_of(self, kind: int) -> Iterator[Use]:
+        """Iterate over uses of given kind."""
+        return (use for use in self if use[2] == kind)
+
+    def as_dict(self) -> Dict[str, object]:
+        """Convert entry into dict of plain values, for JSON output."""
+        return {
+            "name": self.sym_ent.name,
+            "role": self.sym_ent.role_name,
+            "line": self.line,
+            "column": self.column,
+            "end": self.end,
+            "uses": [[line, column, KIND_NAMES[kind]] for line, column, kind in self]}
+
+
+class XrefIndex(object):
+    """Cross-reference index of a program, filled in by the parser.
+
+    Attributes:
+        entries: A dict mapping SymbolEntry to its XrefEntry, in order of
+            first definition or use.
+    """
+
+    def __init__(self) -> None:
+        """Init with empty index."""
+        self.entries: Dict[SymEnt, XrefEntry] = dict()
+
+    def __len__(self) -> int:
+        """Number of identifiers indexed."""
+        return len(self.entries)
+
+    def __entry(self, sym_ent: SymEnt) -> XrefEntry:
+        entry: XrefEntry = self.entries.get(sym_ent)
+        if entry is None:
+            entry = self.entries[sym_ent] = XrefEntry(sym_ent)
+        return entry
+
+    def define(self, sym_ent: SymEnt, tok: token.Token) -> None:
+        """Record defining occurrence of identifier.
+
+        Args:
+            sym_ent: A SymbolEntry instance of declared identifier.
+            tok: A Token instance of its name in declaration.
+        """
+        entry: XrefEntry = self.__entry(sym_ent)
+        entry.line, entry.column, entry.end = tok.line, tok.column, tok.column + len(tok.lit)
+
+    def use(self, sym_ent: SymEnt, tok: token.Token, kind: int) -> None:
+        """Record use of identifier.
+
+        Args:
+            sym_ent: A SymbolEntry instance the name resolved to.
+            tok: A Token instance of the name.
+            kind: An int of use kind, READ, WRITE, CALL or END.
+        """
+        self.__entry(sym_ent).uses.extend((tok.line, tok.column, kind))
+
+    def retag(self, sym_ent: SymEnt, tok: token.Token, kind: int) -> None:
+        """Change kind of the last use of identifier recorded at a token.
+
+        Args:
+            sym_ent: A SymbolEntry instance the name resolved to.
+            tok: A Token instance of the name.
+            kind: An int of new use kind.
+        """
+        entry: XrefEntry = self.entries.get(sym_ent)
+        uses: array = entry.uses if entry else array("l")
+        for i in range(len(uses) - 3, -1, -3):
+            if uses[i] == tok.line and uses[i + 1] == tok.column:
+                uses[i + 2] = kind
+                return
+
+    def entry(self, sym_ent: SymEnt) -> XrefEntry:
+        """Entry of identifier, None if neither defined nor used."""
+        return self.entries.get(sym_ent)
+
+    def find(self, name: str) -> List[XrefEntry]:
+        """Entries of every identifier of given name, in any scope."""
+        return [entry for sym_ent, entry in self.entries.items() if sym_ent.name == name]
+
+    def as_list(self) -> List[Dict[str, object]]:
+        """Convert index into list of entry dicts, for JSON output."""
+        return [entry.as_dict() for entry in self.entries.values()]
+
+    def write(self, out_file: str) -> None:
+        """Save index as JSON.
+
+        Args:
+            out_file: A string of filepath to write.
+        """
+        with open(out_file, "w") as out:
+            json.dump(self.as_list(), out, indent=1)
@@ -0,0 +1,113 @@
+"""Check analyzer output on sample programs against expected output.
+
+Each program in test/P2/input is analyzed by src/semantic_analyzer with
+the options listed for it in SAMPLE_ARGS, none by default, and its
+output is compared with the file of the same base name with extension
+".txt" in test/P2/expected. A program listed in SAMPLE_EDITS is analyzed by the
+incremental analyzer instead, which applies the edit and prints what it
+keeps, so that its results are checked against a fresh analysis too.
+
+Typical usage example:
+    python test/check_samples.py
+    python test/check_samples.py --update Scopes.ada
+"""
+
+
+from typing import Dict, List, Tuple
+import argparse
+import difflib
+import json
+import os
+import subprocess
+import sys
+
+
+TEST_DIR: str = os.path.dirname(os.path.abspath(__file__))
+INPUT_DIR: str = os.path.join(TEST_DIR, "P2", "input")
+EXPECTED_DIR: str = os.path.join(TEST_DIR, "P2", "expected")
+ANALYZER_DIR: str = os.path.join(os.path.dirname(TEST_DIR), "src", "semantic_analyzer")
+
+# SAMPLE_ARGS maps program name to command line options of analyzer.
+SAMPLE_ARGS: Dict[str, List[str]] = {
+    "errlimit.ada": ["--max-errors", "3"],
+    "noflow.ada": ["--no-flow"],
+}
+
+# SAMPLE_EDITS maps program name to edit as (first line, last line,
+# replacing lines), as taken by IncrementalAnalyzer.edit.
+SAMPLE_EDITS: Dict[str, Tuple[int, int, List[str]]] = {
+    "staletotal.ada": (8, 8, ["      Y := 1 + 2;\n"]),
+}
+
+# Script run in analyzer directory, applying edit given as JSON in argv[2]
+# to program in argv[1]
+EDIT_SCRIPT: str = """
+import json, sys
+from incremental import IncrementalAnalyzer
+first, last, new_lines = json.loads(sys.argv[2])
+with open(sys.argv[1]) as src_file:
+    analyzer = IncrementalAnalyzer(src_file.readlines())
+analyzer.edit(first, last, new_lines)
+fresh = IncrementalAnalyzer(analyzer.lines)
+for name, result in (("edited", analyzer), ("fresh", fresh)):
+    print("***", name)
+    print("\\n".join(result.root_output))
+    for unit in result.all_units():
+        print("\\n".join(unit.output))
+    for line, column, message in result.diagnostics():
+        print("{}:{}: {}".format(line, column, message))
+"""
+
+
+def run_sample(name: str) -> str:
+    """Output of analyzer on sample program."""
+    path: str = os.path.join(INPUT_DIR, name)
+    if name in SAMPLE_EDITS:
+        command: List[str] = [sys.executable, "-c", EDIT_SCRIPT, path, json.dumps(SAMPLE_EDITS[name])]
+    else:
+        command = [sys.executable, "5_P2_code.py"] + SAMPLE_ARGS.get(name, []) + [path]
+    return subprocess.run(command, cwd=ANALYZER_DIR, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          universal_newlines=True).stdout.replace(INPUT_DIR + os.sep, "")
+
+
+def receive_args():
+    """Receive command line arguments."""
+    arg_parser = argparse.ArgumentParser(
+        description="Compare analyzer output on sample programs with expected output.")
+    arg_parser.add_argument(
+        "--update", action="store_true",
+        help="write current output as expected output instead of comparing")
+    arg_parser.add_argument(
+        "names", nargs="*", help="sample program names (default: all)")
+    return arg_parser.parse_args()
+
+
+def main() -> None:
+    """Run samples and report those whose output differs."""
+    args = receive_args()
+    names: List[str] = args.names or sorted(os.listdir(INPUT_DIR))
+    failed: int = 0
+    for name in names:
+        output: str = run_sample(name)
+        expected_path: str = os.path.join(EXPECTED_DIR, os.path.splitext(name)[0] + ".txt")
+        if args.update:
+            os.makedirs(EXPECTED_DIR, exist_ok=True)
+            with open(expected_path, "w") as expected_file:
+                expected_file.write(output)
+            continue
+        expected: str = ""
+        if os.path.isfile(expected_path):
+            with open(expected_path) as expected_file:
+                expected = expected_file.read()
+        if output != expected:
+            failed += 1
+            print("FAIL", name)
+            sys.stdout.writelines(difflib.unified_diff(
+                expected.splitlines(True), output.splitlines(True), "expected", "output"))
+    if not args.update:
+        print("{} of {} samples passed".format(len(names) - failed, len(names)))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()